@@ -0,0 +1,129 @@
+"""Shortest path queries with a contraction hierarchy.
+
+Compares, for random pairs of intersections of each bundled map:
+- networkx.single_source_dijkstra on the map as a networkx graph,
+- the ShortestPathService A* search on the road graph,
+- a bidirectional upward search in the contraction hierarchy, paths unpacked,
+- and, for a source and 20 targets, the Dijkstra search stopping at the last target against a bucket query, the
+  searches from the targets being reused from one source to the next as they are for the deliveries of a tour.
+
+Also reports the time to build the hierarchy, and checks that every query finds a path of the same length.
+
+Run from the project root: python -m benchmarks.contraction_hierarchy_benchmark
+"""
+import time
+from random import Random
+
+import networkx as nx
+
+from benchmarks.utils import MAPS, load_map, measure
+from src.models.map import RoadGraph
+from src.services.routing.contraction_hierarchy_service import (
+    ContractionHierarchyService,
+)
+from src.services.routing.shortest_path_service import ShortestPathService
+
+PAIR_COUNT = 100
+TARGET_COUNT = 20
+
+
+def main() -> None:
+    hierarchy_service = ContractionHierarchyService.instance()
+    shortest_path_service = ShortestPathService.instance()
+
+    print(
+        f"{'map':>8} {'build':>10} {'networkx':>12} {'A*':>12} {'CH':>12} "
+        f"{'1-to-{0} Dijkstra'.format(TARGET_COUNT):>16} {'1-to-{0} CH'.format(TARGET_COUNT):>12}"
+    )
+
+    for name in MAPS:
+        map = load_map(name)
+        graph = RoadGraph.from_map(map)
+        nx_graph = nx.DiGraph()
+        nx_graph.add_nodes_from(range(graph.intersection_count))
+        for origin in range(graph.intersection_count):
+            for edge in range(graph.offsets[origin], graph.offsets[origin + 1]):
+                nx_graph.add_edge(
+                    origin, int(graph.targets[edge]), weight=graph.lengths[edge]
+                )
+
+        start = time.perf_counter()
+        hierarchy = hierarchy_service.build_hierarchy(graph)
+        build_time = time.perf_counter() - start
+
+        random = Random(0)
+        ids = graph.intersection_ids.tolist()
+        pairs = [tuple(random.sample(range(len(ids)), 2)) for _ in range(PAIR_COUNT)]
+        many = [random.sample(range(len(ids)), TARGET_COUNT + 1) for _ in range(10)]
+
+        reachable_pairs = []
+
+        for source, target in pairs:
+            length, path = hierarchy_service.compute_shortest_path(
+                hierarchy, source, target
+            )
+            expected = shortest_path_service.compute_shortest_path(
+                graph, ids[source], ids[target]
+            )[0].get(ids[target], float("inf"))
+            assert length == expected or abs(length - expected) <= 1e-6 * expected
+            assert abs(
+                sum(
+                    nx_graph[origin][destination]["weight"]
+                    for origin, destination in zip(path, path[1:])
+                )
+                - length
+            ) <= 1e-6 * max(1, length)
+
+            if path:
+                reachable_pairs.append((source, target))
+
+        networkx_time, _ = measure(
+            lambda: [
+                nx.single_source_dijkstra(nx_graph, source, target)
+                for source, target in reachable_pairs
+            ],
+            repeat=1,
+        )
+        a_star_time, _ = measure(
+            lambda: [
+                shortest_path_service.compute_shortest_path(
+                    graph, ids[source], ids[target]
+                )
+                for source, target in pairs
+            ],
+            repeat=3,
+        )
+        hierarchy_time, _ = measure(
+            lambda: [
+                hierarchy_service.compute_shortest_path(hierarchy, source, target)
+                for source, target in pairs
+            ],
+            repeat=3,
+        )
+        dijkstra_many_time, _ = measure(
+            lambda: [
+                shortest_path_service.compute_shortest_paths(
+                    graph, ids[nodes[0]], [ids[node] for node in nodes[1:]]
+                )
+                for nodes in many
+            ],
+            repeat=3,
+        )
+        hierarchy_many_time, _ = measure(
+            lambda: [
+                hierarchy_service.compute_shortest_paths(hierarchy, nodes[0], nodes[1:])
+                for nodes in many
+            ],
+            repeat=3,
+        )
+
+        print(
+            f"{name:>8} {build_time:>9.2f}s "
+            f"{networkx_time / len(reachable_pairs):>10.3f}ms {a_star_time / PAIR_COUNT:>10.3f}ms "
+            f"{hierarchy_time / PAIR_COUNT:>10.3f}ms "
+            f"{dijkstra_many_time / len(many):>14.3f}ms {hierarchy_many_time / len(many):>10.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Landmark lower bounds and ALT searches.
+
+For random pairs of intersections of each bundled map, reports:
+- the time to build the landmark index,
+- the time of a single shortest path search guided by the great-circle distance and by the landmarks (ALT),
+- the time of a lower bound from the landmarks, and how close it is to the length of the shortest path on average.
+
+Also checks that both searches find paths of the same length and that the bounds are never longer.
+
+Run from the project root: python -m benchmarks.landmark_benchmark
+"""
+import dataclasses
+import time
+from random import Random
+
+from benchmarks.utils import MAPS, load_map, measure
+from src.models.map import RoadGraph
+from src.services.routing.landmark_service import LandmarkService
+from src.services.routing.shortest_path_service import ShortestPathService
+
+PAIR_COUNT = 200
+
+
+def main() -> None:
+    landmark_service = LandmarkService.instance()
+    shortest_path_service = ShortestPathService.instance()
+
+    print(
+        f"{'map':>8} {'build':>10} {'great-circle':>14} {'ALT':>12} {'bound':>12} {'bound/length':>14}"
+    )
+
+    for name in MAPS:
+        graph = RoadGraph.from_map(load_map(name))
+
+        start = time.perf_counter()
+        landmark_graph = dataclasses.replace(
+            graph, landmarks=landmark_service.build_landmarks(graph)
+        )
+        build_time = time.perf_counter() - start
+
+        random = Random(0)
+        ids = graph.intersection_ids.tolist()
+        pairs = [tuple(random.sample(ids, 2)) for _ in range(PAIR_COUNT)]
+        ratios = []
+
+        for source, target in pairs:
+            lengths, _ = shortest_path_service.compute_shortest_path(
+                graph, source, target
+            )
+            landmark_lengths, _ = shortest_path_service.compute_shortest_path(
+                landmark_graph, source, target
+            )
+            bound = landmark_service.get_lower_bound(landmark_graph, source, target)
+
+            assert lengths.keys() == landmark_lengths.keys()
+            if target in lengths:
+                assert abs(lengths[target] - landmark_lengths[target]) <= 1e-6 * (
+                    lengths[target]
+                )
+                assert bound <= lengths[target] * (1 + 1e-9)
+                ratios.append(bound / lengths[target] if lengths[target] else 1)
+
+        great_circle_time, _ = measure(
+            lambda: [
+                shortest_path_service.compute_shortest_path(graph, source, target)
+                for source, target in pairs
+            ],
+            repeat=3,
+        )
+        landmark_time, _ = measure(
+            lambda: [
+                shortest_path_service.compute_shortest_path(
+                    landmark_graph, source, target
+                )
+                for source, target in pairs
+            ],
+            repeat=3,
+        )
+        bound_time, _ = measure(
+            lambda: [
+                landmark_service.get_lower_bound(landmark_graph, source, target)
+                for source, target in pairs
+            ],
+            repeat=3,
+        )
+
+        print(
+            f"{name:>8} {build_time:>9.2f}s {great_circle_time / PAIR_COUNT:>12.3f}ms "
+            f"{landmark_time / PAIR_COUNT:>10.3f}ms {bound_time * 1000 / PAIR_COUNT:>10.2f}us "
+            f"{sum(ratios) / len(ratios):>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
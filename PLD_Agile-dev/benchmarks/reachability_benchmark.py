@@ -0,0 +1,90 @@
+"""Reachability index of the strongly connected components.
+
+For each bundled map, reports:
+- the number of intersections, of components and of intersections in the largest one,
+- the time to build the reachability index,
+- the time of a shortest path search between random pairs of intersections with no path between them, without and
+  with the index, and the time of a reachability query.
+
+Also checks that the index gives the same answer as a complete search from a few intersections.
+
+Run from the project root: python -m benchmarks.reachability_benchmark
+"""
+import dataclasses
+import time
+from random import Random
+
+import numpy as np
+
+from benchmarks.utils import MAPS, load_map, measure
+from src.models.map import ReachabilityIndex, RoadGraph
+from src.services.routing.shortest_path_service import ShortestPathService
+
+PAIR_COUNT = 50
+
+
+def main() -> None:
+    shortest_path_service = ShortestPathService.instance()
+
+    print(
+        f"{'map':>8} {'nodes':>6} {'SCCs':>6} {'largest':>8} {'build':>10} "
+        f"{'search':>12} {'indexed':>12} {'query':>10}"
+    )
+
+    for name in MAPS:
+        graph = RoadGraph.from_map(load_map(name))
+
+        start = time.perf_counter()
+        reachability = ReachabilityIndex.from_segments(graph.offsets, graph.targets)
+        build_time = time.perf_counter() - start
+        indexed_graph = dataclasses.replace(graph, reachability=reachability)
+
+        random = Random(0)
+        for source in random.sample(range(graph.intersection_count), 5):
+            lengths, _ = shortest_path_service.compute_shortest_path_tree(graph, source)
+            for target in range(graph.intersection_count):
+                assert reachability.can_reach(source, target) == np.isfinite(
+                    lengths[target]
+                )
+
+        ids = graph.intersection_ids.tolist()
+        pairs = []
+        while len(pairs) < PAIR_COUNT:
+            source, target = random.sample(range(graph.intersection_count), 2)
+            if not reachability.can_reach(source, target):
+                pairs.append((ids[source], ids[target]))
+
+        search_time, _ = measure(
+            lambda: [
+                shortest_path_service.compute_shortest_path(graph, source, target)
+                for source, target in pairs
+            ],
+            repeat=3,
+        )
+        indexed_time, _ = measure(
+            lambda: [
+                shortest_path_service.compute_shortest_path(
+                    indexed_graph, source, target
+                )
+                for source, target in pairs
+            ],
+            repeat=3,
+        )
+        query_time, _ = measure(
+            lambda: [
+                reachability.can_reach(graph.indexes[source], graph.indexes[target])
+                for source, target in pairs
+            ],
+            repeat=3,
+        )
+
+        print(
+            f"{name:>8} {graph.intersection_count:>6} {reachability.component_count:>6} "
+            f"{np.bincount(reachability.components).max():>8} {build_time * 1000:>8.1f}ms "
+            f"{search_time / PAIR_COUNT:>10.3f}ms {indexed_time / PAIR_COUNT:>10.3f}ms "
+            f"{query_time * 1000 / PAIR_COUNT:>8.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Per-compute overhead of the tour computing process pool.
+
+Compares, for the distances between the deliveries of a tour on the large map, computed without cache:
+- a new process pool per computation, sending the map graph with every task (previous behaviour),
+- the long-lived TourComputingPoolService, where processes already have the map graph,
+- a single process, as a reference without any parallelism.
+
+Run from the project root: python -m benchmarks.tour_computing_pool_benchmark
+"""
+import concurrent.futures
+import multiprocessing
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.utils import create_delivery_requests, load_map, measure
+from src.models.map import RoadGraph
+from src.services.routing.distance_cache_service import DistanceCacheService
+from src.services.routing.road_graph_service import RoadGraphService
+from src.services.routing.shortest_path_service import ShortestPathService
+from src.services.tour.tour_computing_pool_service import TourComputingPoolService
+from src.services.tour.tour_computing_service import TourComputingService
+
+DELIVERY_COUNTS = [5, 10, 20]
+
+
+def compute_shortest_paths_with_graph(
+    graph: RoadGraph, source: int, targets: List[int]
+) -> Tuple[Dict[int, float], Dict[int, List[int]]]:
+    lengths, predecessors = ShortestPathService.instance().compute_shortest_paths(
+        graph, source, targets
+    )
+    return lengths, {
+        target: ShortestPathService.instance().build_path(predecessors, target)
+        for target in lengths
+    }
+
+
+def compute_with_new_pool(graph: RoadGraph, ids: List[int]) -> None:
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=multiprocessing.cpu_count()
+    ) as executor:
+        futures = [
+            executor.submit(compute_shortest_paths_with_graph, graph, source, ids)
+            for source in ids
+        ]
+        for future in futures:
+            future.result()
+
+
+def compute_without_cache(compute: Callable[[], None]) -> None:
+    DistanceCacheService.reset()
+    compute()
+
+
+def main() -> None:
+    map = load_map("large")
+    graph = RoadGraphService.instance().get_road_graph(map)
+    pool = TourComputingPoolService.instance()
+    pool.set_map(map)
+
+    print(f"{multiprocessing.cpu_count()} processes, large map")
+    print(f"{'deliveries':>10} {'new pool':>12} {'warm pool':>12} {'1 process':>12}")
+
+    for count in DELIVERY_COUNTS:
+        deliveries = create_delivery_requests(map, count)
+        ids = [delivery.location.segment.origin.id for delivery in deliveries]
+
+        new_pool, _ = measure(lambda: compute_with_new_pool(graph, ids))
+        warm_pool, _ = measure(
+            lambda: compute_without_cache(
+                lambda: TourComputingService.instance().compute_delivery_distances_parallel(
+                    map, deliveries
+                )
+            )
+        )
+        single_process, _ = measure(
+            lambda: compute_without_cache(
+                lambda: TourComputingService.instance().compute_delivery_distances(
+                    graph, deliveries
+                )
+            )
+        )
+
+        print(
+            f"{count:>10} {new_pool:>10.1f}ms {warm_pool:>10.1f}ms {single_process:>10.1f}ms"
+        )
+
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import time
+from random import Random
+from typing import Callable, List, Tuple
+
+from src.models.map import Map, Segment
+from src.models.tour import DeliveryLocation, DeliveryRequest
+from src.services.map.map_loader_service import MapLoaderService
+
+MAPS = ["small", "medium", "large"]
+"""Names of the bundled maps
+"""
+
+
+def load_map(name: str) -> Map:
+    """Load one of the bundled maps.
+
+    Args:
+        name (str): Name of the map (small, medium or large)
+
+    Returns:
+        Map: Loaded map
+    """
+    return MapLoaderService.instance().load_map_from_xml(f"src/assets/{name}Map.xml")
+
+
+def create_delivery_requests(
+    map: Map, count: int, time_windows: List[int] = [8, 9, 10, 11], seed: int = 0
+) -> List[DeliveryRequest]:
+    """Create random delivery requests on a map, starting with the warehouse.
+
+    Args:
+        map (Map): Map to create the deliveries on
+        count (int): Number of deliveries
+        time_windows (List[int]): Time windows spread evenly over the deliveries
+        seed (int): Seed of the random generator
+
+    Returns:
+        List[DeliveryRequest]: Warehouse followed by the delivery requests
+    """
+    random = Random(seed)
+    origins = random.sample(
+        sorted(id for id in map.segments if id != map.warehouse.id), count
+    )
+
+    return [
+        DeliveryRequest(
+            DeliveryLocation(Segment(-1, "", map.warehouse, map.warehouse, 0), 0), 8
+        )
+    ] + [
+        DeliveryRequest(
+            DeliveryLocation(next(iter(map.segments[origin].values())), 0),
+            time_windows[i * len(time_windows) // count],
+        )
+        for i, origin in enumerate(origins)
+    ]
+
+
+def measure(fn: Callable[[], None], repeat: int = 5) -> Tuple[float, float]:
+    """Measure the execution time of a function.
+
+    Args:
+        fn (Callable[[], None]): Function to measure
+        repeat (int): Number of executions
+
+    Returns:
+        Tuple[float, float]: Mean and minimum execution time in milliseconds
+    """
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+
+    return sum(times) / len(times), min(times)
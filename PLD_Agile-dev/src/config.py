@@ -1,3 +1,4 @@
+import os
 from datetime import datetime, timedelta
 
 
@@ -18,6 +19,60 @@ class Config:
     """Time in minutes it takes to deliver a package.
     """
 
+    TOUR_COMPUTING_TIME_BUDGET = 30
+    """Maximum time in seconds spent to optimize the tours. The best tours found so far are kept when it is reached.
+    """
+
     KMH_TO_MS = 3.6
     """Conversion factor from km/h to m/s.
     """
+
+    TOUR_RESULT_CACHE_SIZE = 256
+    """Maximum number of computed tours kept so that computing the same tour request again returns at once.
+    """
+
+    TOUR_RESULT_CACHE_MEMORY = 32 * 1024 * 1024
+    """Maximum estimated size in bytes of the computed tours kept in the cache.
+    """
+
+    DISTANCE_STORE_PATH = os.path.join(
+        os.path.expanduser("~"), ".pld_agile", "distances.sqlite3"
+    )
+    """Path of the database keeping the shortest paths computed on the maps between sessions. None disables it.
+    """
+
+    DISTANCE_STORE_SIZE = 1_000_000
+    """Maximum number of shortest paths kept in the database.
+    """
+
+    DISTANCE_STORE_MMAP_SIZE = 256 * 1024 * 1024
+    """Maximum size in bytes of the database mapped in memory.
+    """
+
+    DISTANCE_MATRIX_DIRECTORY = os.path.join(
+        os.path.expanduser("~"), ".pld_agile", "matrices"
+    )
+    """Directory of the precomputed shortest paths between all the intersections of the maps.
+    """
+
+    USE_CONTRACTION_HIERARCHY = False
+    """Whether the shortest paths are searched in a contraction hierarchy of the road graph. The hierarchy is built when
+    the map is loaded, which takes a few seconds on large maps, and makes every search much faster.
+    """
+
+    CONTRACTION_HIERARCHY_DIRECTORY = os.path.join(
+        os.path.expanduser("~"), ".pld_agile", "hierarchies"
+    )
+    """Directory of the contraction hierarchies built for the maps, so that they are only built once.
+    """
+
+    USE_LANDMARKS = False
+    """Whether a landmark index of the road graph is built when the map is loaded, to guide the searches of a single
+    shortest path and give lower bounds on the lengths of the shortest paths.
+    """
+
+    LANDMARK_DIRECTORY = os.path.join(
+        os.path.expanduser("~"), ".pld_agile", "landmarks"
+    )
+    """Directory of the landmark indexes built for the maps, so that they are only built once.
+    """
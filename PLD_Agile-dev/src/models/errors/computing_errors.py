@@ -2,3 +2,15 @@ class DeliveriesNotOnRouteError(Exception):
     """Error thrown when the deliveries are not on the route."""
 
     pass
+
+
+class TourComputingCancelledError(Exception):
+    """Error thrown when a tour computation is cancelled because a newer one replaced it."""
+
+    pass
+
+
+class TourInfeasibleError(Exception):
+    """Error thrown when no tour can make every delivery of a tour request in its time window."""
+
+    pass
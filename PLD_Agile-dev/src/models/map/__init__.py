@@ -1,7 +1,11 @@
+from src.models.map.contraction_hierarchy import ContractionHierarchy
 from src.models.map.errors import *
 from src.models.map.intersection import Intersection
+from src.models.map.landmark_index import LandmarkIndex
 from src.models.map.map import Map
 from src.models.map.map_size import MapSize
 from src.models.map.marker import Marker
 from src.models.map.position import Position
+from src.models.map.reachability_index import ReachabilityIndex
+from src.models.map.road_graph import RoadGraph
 from src.models.map.segment import Segment
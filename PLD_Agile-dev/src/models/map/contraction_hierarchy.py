@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ContractionHierarchy:
+    """Contraction hierarchy of a road graph, used to answer shortest path queries by searching only a small part of
+    the graph.
+
+    Intersections are contracted one after the other, in the order of their rank, and shortcuts are added between their
+    neighbours so that the distances between the remaining intersections do not change. A shortest path then always goes
+    up in rank and then down, so it is found by a search going up from the source and a search going up from the target
+    in the reversed graph.
+
+    Intersections are identified by their index in the road graph. Edges (segments and shortcuts) are stored in
+    compressed sparse row format: the upward edges leaving the intersection at index i are at
+    upward_offsets[i]:upward_offsets[i + 1], the downward edges entering it (from higher intersections) at
+    downward_offsets[i]:downward_offsets[i + 1]. The middle of a shortcut is the contracted intersection it skips, -1
+    for a segment of the graph.
+    """
+
+    ranks: np.ndarray
+    """Rank of each intersection, the order in which it was contracted.
+    """
+    upward_offsets: np.ndarray
+    """Offset of the first upward edge leaving each intersection, followed by the number of upward edges.
+    """
+    upward_targets: np.ndarray
+    """Index of the destination intersection of each upward edge, of higher rank than its origin.
+    """
+    upward_lengths: np.ndarray
+    """Length of each upward edge.
+    """
+    upward_middles: np.ndarray
+    """Middle intersection of each upward edge.
+    """
+    downward_offsets: np.ndarray
+    """Offset of the first downward edge entering each intersection, followed by the number of downward edges.
+    """
+    downward_sources: np.ndarray
+    """Index of the origin intersection of each downward edge, of higher rank than its destination.
+    """
+    downward_lengths: np.ndarray
+    """Length of each downward edge.
+    """
+    downward_middles: np.ndarray
+    """Middle intersection of each downward edge.
+    """
+
+    def reverse(self) -> "ContractionHierarchy":
+        """Creates the hierarchy of the reversed graph, in which the downward edges become upward edges.
+
+        Returns:
+            ContractionHierarchy: Reversed ContractionHierarchy instance
+        """
+        return ContractionHierarchy(
+            ranks=self.ranks,
+            upward_offsets=self.downward_offsets,
+            upward_targets=self.downward_sources,
+            upward_lengths=self.downward_lengths,
+            upward_middles=self.downward_middles,
+            downward_offsets=self.upward_offsets,
+            downward_sources=self.upward_targets,
+            downward_lengths=self.upward_lengths,
+            downward_middles=self.upward_middles,
+        )
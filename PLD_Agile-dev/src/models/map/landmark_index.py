@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class LandmarkIndex:
+    """Shortest path lengths between a few landmark intersections and every intersection of a road graph, used to get
+    lower bounds on the length of any shortest path.
+
+    By the triangle inequality, the length of the shortest path from s to t is at least
+    lengths_from[l, t] - lengths_from[l, s] and lengths_to[l, s] - lengths_to[l, t] for every landmark l. The bound is
+    tight when s is on the shortest path from l to t, or t on the shortest path from s to l, so landmarks on the edges
+    of the map give the best bounds.
+
+    Intersections are identified by their index in the road graph.
+    """
+
+    landmarks: np.ndarray
+    """Index of each landmark intersection.
+    """
+    lengths_from: np.ndarray
+    """Length of the shortest path from each landmark (row) to each intersection (column), infinite if there is none.
+    """
+    lengths_to: np.ndarray
+    """Length of the shortest path from each intersection (column) to each landmark (row), infinite if there is none.
+    """
+
+    def reverse(self) -> "LandmarkIndex":
+        """Creates the index of the reversed graph, in which the paths from the landmarks become paths to them.
+
+        Returns:
+            LandmarkIndex: Reversed LandmarkIndex instance
+        """
+        return LandmarkIndex(
+            landmarks=self.landmarks,
+            lengths_from=self.lengths_to,
+            lengths_to=self.lengths_from,
+        )
+
+    def get_lower_bounds(self, target_index: int) -> np.ndarray:
+        """Get a lower bound on the length of the shortest path from every intersection to a target.
+
+        Args:
+            target_index (int): Index of the target intersection
+
+        Returns:
+            np.ndarray: Lower bound for each intersection, infinite for the intersections known to have no path to the
+            target
+        """
+        # The difference of two infinite lengths gives no bound, and is ignored by fmax
+        with np.errstate(invalid="ignore"):
+            bounds = np.fmax(
+                self.lengths_from[:, target_index, None] - self.lengths_from,
+                self.lengths_to - self.lengths_to[:, target_index, None],
+            )
+
+        return np.fmax.reduce(bounds, axis=0, initial=0.0)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, Generator, List
+from typing import Dict, Generator, List, Optional
 
 from src.models.map.intersection import Intersection
 from src.models.map.map_size import MapSize
@@ -21,6 +21,9 @@ class Map:
     size: MapSize
     """Size of the map.
     """
+    content_hash: Optional[str] = None
+    """Hash of the content of the file the map was loaded from, None if it was not loaded from a file.
+    """
 
     def get_all_segments(self) -> Generator[Segment, any, None]:
         """Returns all segments in the map.
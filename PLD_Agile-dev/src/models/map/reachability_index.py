@@ -0,0 +1,180 @@
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ReachabilityIndex:
+    """Strongly connected components of a road graph and the components reachable from each of them, used to know in
+    constant time whether there is a path between two intersections.
+
+    Two intersections are in the same component when each one can be reached from the other. One-way streets and dead
+    ends split the graph into a large component and small ones around it, from which the large one cannot be reached or
+    which cannot be reached from it.
+
+    Components are numbered so that the components reachable from a component have a smaller number (a component is
+    numbered once every component it reaches is), and intersections are identified by their index in the road graph.
+    """
+
+    components: np.ndarray
+    """Component of each intersection.
+    """
+    reachable: np.ndarray
+    """Whether each component (column) can be reached from each component (row), with the columns packed in bits.
+    """
+
+    @staticmethod
+    def from_segments(offsets: np.ndarray, targets: np.ndarray) -> "ReachabilityIndex":
+        """Creates a ReachabilityIndex instance from the segments of a road graph.
+
+        Args:
+            offsets (np.ndarray): Offset of the first segment leaving each intersection of the road graph
+            targets (np.ndarray): Index of the destination intersection of each segment
+
+        Returns:
+            ReachabilityIndex: ReachabilityIndex instance
+        """
+        components = ReachabilityIndex.__find_components(
+            offsets.tolist(), targets.tolist()
+        )
+        component_count = max(components, default=-1) + 1
+
+        # Segments between two components, grouped by origin component
+        origins = np.repeat(components, np.diff(offsets))
+        destinations = np.array(components, dtype=np.int32)[targets]
+        is_between = origins != destinations
+        successors: List[set] = [set() for _ in range(component_count)]
+        for origin, destination in zip(
+            origins[is_between].tolist(), destinations[is_between].tolist()
+        ):
+            successors[origin].add(destination)
+
+        reachable = np.zeros((component_count, (component_count + 7) // 8), np.uint8)
+        for component in range(component_count):
+            row = reachable[component]
+            row[component >> 3] |= 0x80 >> (component & 7)
+
+            # The successors have smaller numbers, so their rows are complete
+            for successor in successors[component]:
+                row |= reachable[successor]
+
+        return ReachabilityIndex(
+            components=np.array(components, dtype=np.int32), reachable=reachable
+        )
+
+    def reverse(self) -> "ReachabilityIndex":
+        """Creates the index of the reversed graph, which has the same components, each one reaching the components it
+        was reached from.
+
+        Returns:
+            ReachabilityIndex: Reversed ReachabilityIndex instance
+        """
+        component_count = len(self.reachable)
+        reachable = np.unpackbits(self.reachable, axis=1, count=component_count).T
+
+        # Reversing the segments reverses the order of the components
+        order = np.arange(component_count - 1, -1, -1, dtype=np.int32)
+
+        return ReachabilityIndex(
+            components=order[self.components],
+            reachable=np.packbits(reachable[::-1, ::-1], axis=1),
+        )
+
+    @property
+    def component_count(self) -> int:
+        """Number of strongly connected components.
+
+        Returns:
+            int: Number of components
+        """
+        return len(self.reachable)
+
+    def can_reach(self, source_index: int, target_index: int) -> bool:
+        """Check whether there is a path from an intersection to another.
+
+        Args:
+            source_index (int): Index of the source intersection
+            target_index (int): Index of the target intersection
+
+        Returns:
+            bool: True if the target can be reached from the source
+        """
+        target_component = self.components[target_index]
+
+        return bool(
+            self.reachable[self.components[source_index], target_component >> 3]
+            & (0x80 >> (target_component & 7))
+        )
+
+    def get_component_indexes(self, index: int) -> np.ndarray:
+        """Get the intersections that can be reached from an intersection and from which it can be reached.
+
+        Args:
+            index (int): Index of the intersection
+
+        Returns:
+            np.ndarray: Indexes of the intersections of its component, including itself
+        """
+        return np.flatnonzero(self.components == self.components[index])
+
+    @staticmethod
+    def __find_components(offsets: List[int], targets: List[int]) -> List[int]:
+        """Find the strongly connected components of a graph with Tarjan's algorithm, without recursion so that long
+        streets do not exceed the recursion limit.
+
+        Args:
+            offsets (List[int]): Offset of the first segment leaving each intersection
+            targets (List[int]): Index of the destination intersection of each segment
+
+        Returns:
+            List[int]: Component of each intersection, numbered in the order they are completed
+        """
+        size = len(offsets) - 1
+        orders = [-1] * size
+        low_links = [0] * size
+        components = [-1] * size
+        stack: List[int] = []
+        order = 0
+        component_count = 0
+
+        for root in range(size):
+            if orders[root] >= 0:
+                continue
+
+            orders[root] = low_links[root] = order
+            order += 1
+            stack.append(root)
+            # Intersection and offset of its next segment to follow, for each intersection of the current path
+            path = [(root, offsets[root])]
+
+            while path:
+                node, edge = path[-1]
+
+                if edge < offsets[node + 1]:
+                    path[-1] = (node, edge + 1)
+                    neighbour = targets[edge]
+
+                    if orders[neighbour] < 0:
+                        orders[neighbour] = low_links[neighbour] = order
+                        order += 1
+                        stack.append(neighbour)
+                        path.append((neighbour, offsets[neighbour]))
+                    elif components[neighbour] < 0:
+                        low_links[node] = min(low_links[node], orders[neighbour])
+                    continue
+
+                path.pop()
+                if path:
+                    parent = path[-1][0]
+                    low_links[parent] = min(low_links[parent], low_links[node])
+
+                if low_links[node] == orders[node]:
+                    while True:
+                        member = stack.pop()
+                        components[member] = component_count
+                        if member == node:
+                            break
+                    component_count += 1
+
+        return components
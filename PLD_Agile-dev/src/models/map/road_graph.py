@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.models.map.contraction_hierarchy import ContractionHierarchy
+from src.models.map.landmark_index import LandmarkIndex
+from src.models.map.map import Map
+from src.models.map.reachability_index import ReachabilityIndex
+
+
+@dataclass(frozen=True)
+class RoadGraph:
+    """Compact and immutable representation of the roads of a map, used to compute shortest paths.
+
+    Intersections are identified by an index from 0 to the number of intersections. The segments leaving the intersection
+    at index i are stored in targets[offsets[i]:offsets[i + 1]] and lengths[offsets[i]:offsets[i + 1]] (compressed sparse
+    row format).
+    """
+
+    intersection_ids: np.ndarray
+    """ID of the intersection at each index.
+    """
+    offsets: np.ndarray
+    """Offset of the first segment leaving each intersection, followed by the total number of segments.
+    """
+    targets: np.ndarray
+    """Index of the destination intersection of each segment.
+    """
+    lengths: np.ndarray
+    """Length of each segment.
+    """
+    latitudes: np.ndarray
+    """Latitude of the intersection at each index.
+    """
+    longitudes: np.ndarray
+    """Longitude of the intersection at each index.
+    """
+    indexes: Dict[int, int]
+    """Index of each intersection identified by its ID.
+    """
+    hierarchy: Optional[ContractionHierarchy] = None
+    """Contraction hierarchy used to search the graph, None to search it with Dijkstra and A*.
+    """
+    landmarks: Optional[LandmarkIndex] = None
+    """Landmark index giving lower bounds on the lengths of the shortest paths, None to guide A* with the great-circle
+    distance only.
+    """
+    reachability: Optional[ReachabilityIndex] = None
+    """Strongly connected components of the graph, telling which intersections can be reached from each other without
+    searching, None to find it out by searching.
+    """
+
+    @staticmethod
+    def from_map(map: Map) -> "RoadGraph":
+        """Creates a RoadGraph instance from a map.
+
+        Args:
+            map (Map): Map to create the graph from
+
+        Returns:
+            RoadGraph: RoadGraph instance
+        """
+        intersection_ids = list(map.intersections.keys())
+        if map.warehouse.id not in map.intersections:
+            intersection_ids.append(map.warehouse.id)
+
+        indexes = {id: index for index, id in enumerate(intersection_ids)}
+        intersections = [
+            map.intersections.get(id, map.warehouse) for id in intersection_ids
+        ]
+
+        offsets = np.zeros(len(intersection_ids) + 1, dtype=np.int32)
+        targets = []
+        lengths = []
+
+        for id in intersection_ids:
+            for segment in map.segments.get(id, {}).values():
+                targets.append(indexes[segment.destination.id])
+                lengths.append(segment.length)
+            offsets[indexes[id] + 1] = len(targets)
+
+        return RoadGraph(
+            intersection_ids=np.array(intersection_ids, dtype=np.int64),
+            offsets=offsets,
+            targets=np.array(targets, dtype=np.int32),
+            lengths=np.array(lengths, dtype=np.float64),
+            latitudes=np.array(
+                [intersection.latitude for intersection in intersections],
+                dtype=np.float64,
+            ),
+            longitudes=np.array(
+                [intersection.longitude for intersection in intersections],
+                dtype=np.float64,
+            ),
+            indexes=indexes,
+        )
+
+    def reverse(self) -> "RoadGraph":
+        """Creates the graph with the same intersections and every segment in the opposite direction.
+
+        Returns:
+            RoadGraph: Reversed RoadGraph instance
+        """
+        origins = np.repeat(
+            np.arange(self.intersection_count, dtype=np.int32), np.diff(self.offsets)
+        )
+        order = np.argsort(self.targets, kind="stable")
+
+        offsets = np.zeros(self.intersection_count + 1, dtype=np.int32)
+        offsets[1:] = np.cumsum(
+            np.bincount(self.targets, minlength=self.intersection_count)
+        )
+
+        return RoadGraph(
+            intersection_ids=self.intersection_ids,
+            offsets=offsets,
+            targets=origins[order],
+            lengths=self.lengths[order],
+            latitudes=self.latitudes,
+            longitudes=self.longitudes,
+            indexes=self.indexes,
+            hierarchy=self.hierarchy.reverse() if self.hierarchy else None,
+            landmarks=self.landmarks.reverse() if self.landmarks else None,
+            reachability=self.reachability.reverse() if self.reachability else None,
+        )
+
+    @property
+    def intersection_count(self) -> int:
+        """Number of intersections of the graph.
+
+        Returns:
+            int: Number of intersections
+        """
+        return len(self.intersection_ids)
+
+    @property
+    def segment_count(self) -> int:
+        """Number of segments of the graph.
+
+        Returns:
+            int: Number of segments
+        """
+        return len(self.targets)
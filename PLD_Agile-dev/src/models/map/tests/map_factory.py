@@ -0,0 +1,70 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.models.map.intersection import Intersection
+from src.models.map.map import Map
+from src.models.map.map_size import MapSize
+from src.models.map.position import Position
+from src.models.map.road_graph import RoadGraph
+from src.models.map.segment import Segment
+
+
+def create_map(
+    segments: Iterable[Tuple[int, int, float]],
+    intersections: Optional[Dict[int, Intersection]] = None,
+    warehouse_id: Optional[int] = None,
+    content_hash: Optional[str] = None,
+    name: str = "",
+) -> Map:
+    """Create a map from the origin, destination and length of its segments.
+
+    Args:
+        segments (Iterable[Tuple[int, int, float]]): Origin ID, destination ID and length of each segment
+        intersections (Optional[Dict[int, Intersection]]): Intersections of the map. Defaults to an intersection at
+        (0, 0) for each ID of the segments.
+        warehouse_id (Optional[int]): ID of the warehouse intersection. Defaults to the origin of the first segment.
+        content_hash (Optional[str]): Content hash of the map. Defaults to a map not loaded from a file.
+        name (str): Name of the street of every segment. Defaults to no name.
+
+    Returns:
+        Map: Map with a segment of a different ID for each given segment
+    """
+    segments = list(segments)
+    if intersections is None:
+        intersections = {
+            id: Intersection(0, 0, id)
+            for origin, destination, _ in segments
+            for id in [origin, destination]
+        }
+
+    map_segments: Dict[int, Dict[int, Segment]] = {}
+    for id, (origin, destination, length) in enumerate(segments):
+        map_segments.setdefault(origin, {})[destination] = Segment(
+            id, name, intersections[origin], intersections[destination], length
+        )
+
+    return Map(
+        intersections=intersections,
+        segments=map_segments,
+        warehouse=intersections[
+            warehouse_id if warehouse_id is not None else segments[0][0]
+        ],
+        size=MapSize(Position(0, 0), Position(0, 0)),
+        content_hash=content_hash,
+    )
+
+
+def create_road_graph(
+    segments: Iterable[Tuple[int, int, float]],
+    intersections: Optional[Dict[int, Intersection]] = None,
+) -> RoadGraph:
+    """Create the road graph of a map from the origin, destination and length of its segments.
+
+    Args:
+        segments (Iterable[Tuple[int, int, float]]): Origin ID, destination ID and length of each segment
+        intersections (Optional[Dict[int, Intersection]]): Intersections of the map. Defaults to an intersection at
+        (0, 0) for each ID of the segments.
+
+    Returns:
+        RoadGraph: Road graph of the map
+    """
+    return RoadGraph.from_map(create_map(segments, intersections))
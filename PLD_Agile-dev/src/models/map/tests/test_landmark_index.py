@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+
+from src.models.map.landmark_index import LandmarkIndex
+
+INF = float("inf")
+
+
+class TestLandmarkIndex(unittest.TestCase):
+    """Tests class for LandmarkIndex."""
+
+    def setUp(self):
+        # Single landmark 0 on a path 0 -> 1 -> 2 with a way back from 1 only, and 3 not connected
+        self.landmarks = LandmarkIndex(
+            landmarks=np.array([0]),
+            lengths_from=np.array([[0.0, 1.0, 3.0, INF]]),
+            lengths_to=np.array([[0.0, 2.0, INF, INF]]),
+        )
+
+    def test_should_get_lower_bounds_to_target(self):
+        """Test if the lower bounds to a target follow from the triangle inequality."""
+        bounds = self.landmarks.get_lower_bounds(2)
+
+        assert bounds.tolist() == [3.0, 2.0, 0.0, 0.0]
+
+    def test_should_get_infinite_bounds_to_unreachable_target(self):
+        """Test if intersections that cannot reach a target get an infinite bound."""
+        bounds = self.landmarks.get_lower_bounds(1)
+
+        # 2 and 3 cannot reach the landmark, which 1 can reach, so they cannot reach 1
+        assert bounds.tolist() == [1.0, 0.0, INF, INF]
+
+    def test_should_reverse(self):
+        """Test if the paths from and to the landmarks of a reversed LandmarkIndex are swapped."""
+        landmarks = self.landmarks.reverse()
+
+        assert landmarks.lengths_from is self.landmarks.lengths_to
+        assert landmarks.lengths_to is self.landmarks.lengths_from
+        assert landmarks.landmarks is self.landmarks.landmarks
@@ -0,0 +1,89 @@
+import unittest
+
+from src.models.map.reachability_index import ReachabilityIndex
+from src.models.map.tests.map_factory import create_road_graph
+
+
+class TestReachabilityIndex(unittest.TestCase):
+    """Tests class for ReachabilityIndex."""
+
+    def setUp(self):
+        """Set up a loop of two-way streets with a one-way street out of it to a dead end, and a one-way street into it
+        from another."""
+        # 0, 1 and 2 reach each other, 3 and 4 are reached from the loop, 5 reaches it
+        self.graph = create_road_graph(
+            (origin, destination, 1.0)
+            for origin, destination in [
+                (0, 1),
+                (1, 2),
+                (2, 0),
+                (1, 0),
+                (2, 3),
+                (3, 4),
+                (5, 0),
+            ]
+        )
+        self.index = ReachabilityIndex.from_segments(
+            self.graph.offsets, self.graph.targets
+        )
+
+    def test_should_find_strongly_connected_components(self):
+        """Test if the intersections reaching each other are in the same component, and every other one is alone."""
+        components = self.index.components.tolist()
+
+        assert self.index.component_count == 4
+        assert components[0] == components[1] == components[2]
+        assert len(set(components[2:])) == 4
+
+    def test_should_number_reached_components_first(self):
+        """Test if the components reached from a component have a smaller number."""
+        components = self.index.components.tolist()
+
+        assert components[4] < components[3] < components[0] < components[5]
+
+    def test_should_know_reachable_intersections(self):
+        """Test if the intersections reached through other components are reachable, and the others are not."""
+        assert self.index.can_reach(0, 2)
+        assert self.index.can_reach(2, 1)
+        assert self.index.can_reach(5, 4)
+        assert self.index.can_reach(3, 3)
+        assert not self.index.can_reach(3, 0)
+        assert not self.index.can_reach(0, 5)
+        assert not self.index.can_reach(4, 3)
+
+    def test_should_get_component_indexes(self):
+        """Test if the indexes of the intersections of the component of an intersection are returned."""
+        assert self.index.get_component_indexes(1).tolist() == [0, 1, 2]
+        assert self.index.get_component_indexes(5).tolist() == [5]
+
+    def test_should_reverse(self):
+        """Test if the reversed index has the same components, each one reaching the components it was reached from."""
+        reversed_index = self.index.reverse()
+        expected = ReachabilityIndex.from_segments(
+            self.graph.reverse().offsets, self.graph.reverse().targets
+        )
+
+        for source in range(self.graph.intersection_count):
+            for target in range(self.graph.intersection_count):
+                assert reversed_index.can_reach(source, target) == (
+                    self.index.can_reach(target, source)
+                )
+                assert reversed_index.can_reach(source, target) == (
+                    expected.can_reach(source, target)
+                )
+
+    def test_should_follow_long_streets(self):
+        """Test if a street longer than the recursion limit is a single component."""
+        size = 5000
+        graph = create_road_graph(
+            [(id, id + 1, 1.0) for id in range(size - 1)]
+            + [(id + 1, id, 1.0) for id in range(size - 1)]
+        )
+        index = ReachabilityIndex.from_segments(graph.offsets, graph.targets)
+
+        assert index.component_count == 1
+        assert index.can_reach(size - 1, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
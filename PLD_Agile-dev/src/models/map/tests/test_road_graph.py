@@ -0,0 +1,110 @@
+import dataclasses
+import unittest
+
+import numpy as np
+
+from src.models.map.contraction_hierarchy import ContractionHierarchy
+from src.models.map.intersection import Intersection
+from src.models.map.map import Map
+from src.models.map.map_size import MapSize
+from src.models.map.position import Position
+from src.models.map.reachability_index import ReachabilityIndex
+from src.models.map.road_graph import RoadGraph
+from src.models.map.segment import Segment
+
+
+class TestRoadGraph(unittest.TestCase):
+    """Tests class for RoadGraph."""
+
+    def setUp(self):
+        intersections = {id: Intersection(0, 0, id) for id in [10, 20, 30]}
+        self.map = Map(
+            intersections=intersections,
+            segments={
+                10: {
+                    20: Segment(0, "A", intersections[10], intersections[20], 1.5),
+                    30: Segment(1, "B", intersections[10], intersections[30], 2.0),
+                },
+                30: {
+                    10: Segment(2, "C", intersections[30], intersections[10], 3.0),
+                },
+            },
+            warehouse=intersections[10],
+            size=MapSize(Position(0, 0), Position(0, 0)),
+        )
+
+    def test_should_create_from_map(self):
+        """Test if RoadGraph can be created from a map."""
+        graph = RoadGraph.from_map(self.map)
+
+        assert graph.intersection_count == 3
+        assert graph.segment_count == 3
+        assert graph.intersection_ids.tolist() == [10, 20, 30]
+        assert graph.indexes == {10: 0, 20: 1, 30: 2}
+
+    def test_should_store_segments_by_origin(self):
+        """Test if the segments leaving an intersection are stored together."""
+        graph = RoadGraph.from_map(self.map)
+
+        assert graph.offsets.tolist() == [0, 2, 2, 3]
+        assert graph.targets.tolist() == [1, 2, 0]
+        assert graph.lengths.tolist() == [1.5, 2.0, 3.0]
+
+    def test_should_reverse(self):
+        """Test if the segments of a reversed RoadGraph are in the opposite direction."""
+        graph = RoadGraph.from_map(self.map).reverse()
+
+        assert graph.intersection_ids.tolist() == [10, 20, 30]
+        assert graph.offsets.tolist() == [0, 1, 2, 3]
+        assert graph.targets.tolist() == [2, 0, 0]
+        assert graph.lengths.tolist() == [3.0, 1.5, 2.0]
+
+    def test_should_reverse_contraction_hierarchy(self):
+        """Test if the upward and downward edges of the hierarchy of a reversed RoadGraph are swapped."""
+        upward = [
+            np.array([0, 1, 1, 1]),
+            np.array([1]),
+            np.array([1.5]),
+            np.array([-1]),
+        ]
+        downward = [np.array([0, 0, 0, 0]), np.array([]), np.array([]), np.array([])]
+        hierarchy = ContractionHierarchy(np.array([0, 1, 2]), *upward, *downward)
+        graph = dataclasses.replace(
+            RoadGraph.from_map(self.map), hierarchy=hierarchy
+        ).reverse()
+
+        assert graph.hierarchy.downward_offsets is upward[0]
+        assert graph.hierarchy.downward_sources is upward[1]
+        assert graph.hierarchy.upward_offsets is downward[0]
+        assert graph.hierarchy.ranks is hierarchy.ranks
+
+    def test_should_reverse_reachability_index(self):
+        """Test if the intersections reached from an intersection of a reversed RoadGraph are the ones reaching it."""
+        graph = RoadGraph.from_map(self.map)
+        graph = dataclasses.replace(
+            graph,
+            reachability=ReachabilityIndex.from_segments(graph.offsets, graph.targets),
+        ).reverse()
+
+        assert graph.reachability.can_reach(1, 0)
+        assert not graph.reachability.can_reach(0, 1)
+        assert graph.reachability.can_reach(2, 0)
+
+    def test_should_store_coordinates(self):
+        """Test if the coordinates of the intersections are stored by index."""
+        self.map.intersections[20].latitude = 45.5
+        self.map.intersections[30].longitude = 4.5
+
+        graph = RoadGraph.from_map(self.map).reverse()
+
+        assert graph.latitudes.tolist() == [0, 45.5, 0]
+        assert graph.longitudes.tolist() == [0, 0, 4.5]
+
+    def test_should_include_warehouse(self):
+        """Test if the warehouse is included even if it is not an intersection of the map."""
+        self.map.warehouse = Intersection(0, 0, 40)
+
+        graph = RoadGraph.from_map(self.map)
+
+        assert graph.indexes[40] == 3
+        assert graph.offsets.tolist() == [0, 2, 2, 3, 3]
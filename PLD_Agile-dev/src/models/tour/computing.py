@@ -16,3 +16,7 @@ class TourComputingResult:
     deliveries: List[DeliveriesComputingResult]
     """List of delivery's intersection IDs with their time in minutes
     """
+    is_optimal: bool = True
+    """Whether the route is known to be the shortest one. False for a route found by a heuristic or by a search that
+    was stopped before its end
+    """
@@ -78,11 +78,17 @@ class ComputedTour(Tour):
     """List of segments of the route
     """
 
+    is_optimal: bool = True
+    """Whether the route is known to be the shortest one. False while the tour is still being optimized or when the
+    optimization was stopped by its time budget
+    """
+
     @staticmethod
     def create_from_request(
         tour_request: TourRequest,
         deliveries: Dict[DeliveryID, ComputedDelivery],
         route: List[Segment],
+        is_optimal: bool = True,
     ) -> "ComputedTour":
         """Creates an instance of ComputedTour from a TourRequest, a list of computed deliveries and a route.
 
@@ -90,6 +96,7 @@ class ComputedTour(Tour):
             tour_request (TourRequest): Tour request to create the computed tour from
             deliveries (Dict[DeliveryID, ComputedDelivery]): Map of computed deliveries of the tour identified by their ID
             route (List[Segment]): List of segments of the route
+            is_optimal (bool): Whether the route is known to be the shortest one
 
         Returns:
             ComputedTour: Created instance
@@ -101,6 +108,7 @@ class ComputedTour(Tour):
             delivery_man=tour_request.delivery_man,
             route=route,
             color=tour_request.color,
+            is_optimal=is_optimal,
         )
 
 
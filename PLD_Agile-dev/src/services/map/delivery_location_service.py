@@ -1,9 +1,10 @@
 import sys
-from typing import List, Optional
+from typing import List, Optional, Set
 
-from src.models.map import Intersection, Position, Segment
+from src.models.map import Intersection, Map, Position, Segment
 from src.models.tour import DeliveryLocation
 from src.services.map.map_service import MapService
+from src.services.routing.road_graph_service import RoadGraphService
 from src.services.singleton import Singleton
 
 
@@ -13,6 +14,9 @@ class DeliveryLocationService(Singleton):
     ) -> DeliveryLocation:
         """Find the delivery location from a given position.
 
+        The delivery location is always at an intersection that can be reached from the warehouse and from which the
+        warehouse can be reached, so that every delivery can be made.
+
         Args:
             position (Position): The position to find the delivery location from.
 
@@ -42,11 +46,16 @@ class DeliveryLocationService(Singleton):
             Intersection: Closest intersection to the position
         """
 
+        map = MapService.instance().get_map()
+        connected_ids = self.__get_warehouse_connected_ids(map)
+
         found: Optional[Intersection] = None
         found_distance: float = sys.maxsize
 
-        for intersection in MapService.instance().get_map().intersections.values():
-            if self.__is_invalid_intersection(intersection):
+        for intersection in map.intersections.values():
+            if intersection.id not in connected_ids or self.__is_invalid_intersection(
+                intersection
+            ):
                 continue
 
             distance = intersection.distance_to(position)
@@ -67,16 +76,28 @@ class DeliveryLocationService(Singleton):
         """
         return list(MapService.instance().get_map().segments[intersection.id].values())
 
-    def __is_invalid_intersection(self, intersection: Intersection) -> bool:
-        map = MapService().instance().get_map()
+    def __get_warehouse_connected_ids(self, map: Map) -> Set[int]:
+        """Returns the IDs of the intersections that can be reached from the warehouse and from which the warehouse can
+        be reached.
 
-        if intersection.id not in map.segments:
-            return True
+        Args:
+            map (Map): The map of the intersections.
 
-        segments = list(map.segments[intersection.id].values())
+        Returns:
+            Set[int]: IDs of the intersections in the same strongly connected component as the warehouse.
+        """
+        graph = RoadGraphService.instance().get_road_graph(map)
+
+        return set(
+            graph.intersection_ids[
+                graph.reachability.get_component_indexes(
+                    graph.indexes[map.warehouse.id]
+                )
+            ].tolist()
+        )
 
-        # Detect if the intersections is a the end of a one-way dead-end
-        if all(segment.destination.id not in map.segments for segment in segments):
-            return True
+    def __is_invalid_intersection(self, intersection: Intersection) -> bool:
+        map = MapService().instance().get_map()
 
-        return False
+        # Delivery locations are on a segment leaving the intersection
+        return intersection.id not in map.segments or not map.segments[intersection.id]
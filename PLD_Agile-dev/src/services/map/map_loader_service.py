@@ -1,3 +1,4 @@
+import hashlib
 import xml.etree.ElementTree as ET
 from typing import Dict, List
 from xml.etree.ElementTree import Element
@@ -9,6 +10,7 @@ from src.models.map.map_size import MapSize
 from src.models.map.position import Position
 from src.models.map.segment import Segment
 from src.services.map.map_service import MapService
+from src.services.routing.road_graph_service import RoadGraphService
 from src.services.singleton import Singleton
 
 
@@ -53,9 +55,16 @@ class MapLoaderService(Singleton):
         if not warehouse:
             raise MapLoadingError("No warehouse found in the XML file")
 
-        map = Map(intersections, segments, warehouse, map_size)
+        map = Map(
+            intersections,
+            segments,
+            warehouse,
+            map_size,
+            hashlib.sha256(ET.tostring(root_element)).hexdigest(),
+        )
 
         MapService.instance().set_map(map)
+        RoadGraphService.instance().get_road_graph(map)
 
         return map
 
@@ -7,6 +7,7 @@ from src.models.map.position import Position
 from src.models.map.segment import Segment
 from src.services.map.delivery_location_service import DeliveryLocationService
 from src.services.map.map_service import MapService
+from src.services.routing.road_graph_service import RoadGraphService
 
 
 class TestDeliveryLocationService:
@@ -21,6 +22,9 @@ class TestDeliveryLocationService:
             Intersection(1, 2, 1),
             Intersection(2, 2, 2),
             Intersection(3, 3, 3),
+            Intersection(4, 4, 4),
+            Intersection(5, 5, 5),
+            Intersection(6, 6, 6),
         ]
 
         segments = {
@@ -39,6 +43,13 @@ class TestDeliveryLocationService:
             },
             3: {
                 2: Segment(107, "C", intersections[3], intersections[2], length=1),
+                4: Segment(108, "D", intersections[3], intersections[4], length=1),
+            },
+            4: {
+                5: Segment(109, "D", intersections[4], intersections[5], length=1),
+            },
+            5: {
+                6: Segment(110, "D", intersections[5], intersections[6], length=1),
             },
         }
 
@@ -49,13 +60,14 @@ class TestDeliveryLocationService:
                 },
                 segments=segments,
                 warehouse=intersections[0],
-                size=MapSize(Position(0, 0), Position(3, 3)),
+                size=MapSize(Position(0, 0), Position(6, 6)),
             )
         )
 
         yield
 
         DeliveryLocationService.reset()
+        RoadGraphService.reset()
         MapService.reset()
 
         self.service = None
@@ -76,3 +88,11 @@ class TestDeliveryLocationService:
         )
 
         assert delivery_location.segment.origin.id == 0
+
+    def test_should_not_find_intersection_without_path_to_warehouse(self):
+        # 4 is on a one-way street from 3 to the dead end at 6
+        delivery_location = self.service.find_delivery_location_from_position(
+            Position(4, 4)
+        )
+
+        assert delivery_location.segment.origin.id == 3
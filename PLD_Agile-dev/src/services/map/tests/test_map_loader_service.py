@@ -87,6 +87,15 @@ class TestMapLoaderService:
 
         assert map.warehouse is not None
 
+    def test_should_create_map_from_xml_with_content_hash(self, root):
+        map = self.map_loader_service.create_map_from_xml(root)
+        same_map = self.map_loader_service.create_map_from_xml(root)
+        root.find("segment").attrib["length"] = "2.2"
+        other_map = self.map_loader_service.create_map_from_xml(root)
+
+        assert map.content_hash == same_map.content_hash
+        assert map.content_hash != other_map.content_hash
+
     def test_should_throw_if_create_map_from_xml_without_warehouse(self, root):
         root.remove(root.find("warehouse"))
 
@@ -0,0 +1,9 @@
+from src.services.routing.contraction_hierarchy_service import (
+    ContractionHierarchyService,
+)
+from src.services.routing.distance_cache_service import DistanceCacheService
+from src.services.routing.distance_matrix_service import DistanceMatrixService
+from src.services.routing.distance_store_service import DistanceStoreService
+from src.services.routing.landmark_service import LandmarkService
+from src.services.routing.road_graph_service import RoadGraphService
+from src.services.routing.shortest_path_service import ShortestPathService
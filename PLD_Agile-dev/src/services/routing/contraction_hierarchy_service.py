@@ -0,0 +1,528 @@
+import dataclasses
+import os
+from heapq import heapify, heappop, heappush
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import Config
+from src.models.map import ContractionHierarchy, Map, RoadGraph
+from src.services.singleton import Singleton
+
+HierarchyEdges = Tuple[List[int], List[int], List[float], List[int]]
+"""Offsets, neighbours, lengths and middles of the upward or downward edges of a hierarchy, as Python lists
+"""
+
+UpwardSearch = Dict[int, Tuple[float, int, int]]
+"""Distance, previous intersection and middle of the edge to it of every intersection reached by an upward search
+"""
+
+
+class ContractionHierarchyService(Singleton):
+    """Build contraction hierarchies of road graphs and answer shortest path queries with them.
+
+    A query searches upwards from the source in the hierarchy and upwards from the target in the reversed hierarchy,
+    which settles about a hundred intersections instead of thousands. Queries from a source to many targets use buckets:
+    the intersections reached from each target are marked with their distance to it, and a single search from the
+    source reads the marks. The searches from the targets are kept, since the same targets are queried from every
+    delivery of a tour. Paths are unpacked by replacing each shortcut by the two edges it skips.
+
+    Intersections are identified by their index in the road graph.
+    """
+
+    WITNESS_SEARCH_LIMIT = 64
+    """Maximum number of intersections settled by a search for a path avoiding an intersection being contracted. A
+    shortcut is added when no such path is found, so a low limit only adds useless shortcuts
+    """
+
+    BACKWARD_SEARCH_CACHE_SIZE = 1024
+    """Maximum number of searches from targets kept, since the distances between deliveries query the same targets
+    from every source
+    """
+
+    __edges_hierarchy: Optional[ContractionHierarchy]
+    __edges: Tuple[HierarchyEdges, HierarchyEdges, Dict[Tuple[int, int], int]]
+    __backward_searches: Dict[int, UpwardSearch]
+
+    def __init__(self) -> None:
+        self.__edges_hierarchy = None
+        self.__edges = (([], [], [], []), ([], [], [], []), {})
+        self.__backward_searches = {}
+
+    def get_hierarchy(self, map: Map, graph: RoadGraph) -> ContractionHierarchy:
+        """Get the contraction hierarchy of the graph of a map. The hierarchy of a map loaded from a file is read from
+        Config.CONTRACTION_HIERARCHY_DIRECTORY if it was already built, and written there otherwise.
+
+        Args:
+            map (Map): Map of the graph
+            graph (RoadGraph): Road graph of the map
+
+        Returns:
+            ContractionHierarchy: Hierarchy of the graph
+        """
+        if not map.content_hash:
+            return self.build_hierarchy(graph)
+
+        path = os.path.join(
+            Config.CONTRACTION_HIERARCHY_DIRECTORY, f"{map.content_hash}-hierarchy.npz"
+        )
+
+        if os.path.exists(path):
+            with np.load(path) as arrays:
+                return ContractionHierarchy(
+                    **{
+                        field.name: arrays[field.name]
+                        for field in dataclasses.fields(ContractionHierarchy)
+                    }
+                )
+
+        hierarchy = self.build_hierarchy(graph)
+
+        os.makedirs(Config.CONTRACTION_HIERARCHY_DIRECTORY, exist_ok=True)
+        # The file is renamed once complete, so that an interrupted write is never read
+        with open(f"{path}.tmp", "wb") as file:
+            np.savez(file, **dataclasses.asdict(hierarchy))
+        os.replace(f"{path}.tmp", path)
+
+        return hierarchy
+
+    def build_hierarchy(self, graph: RoadGraph) -> ContractionHierarchy:
+        """Build the contraction hierarchy of a graph.
+
+        The next intersection to contract is the one adding the fewest shortcuts compared to the edges it removes,
+        favouring intersections whose neighbours were not contracted yet so that the hierarchy stays balanced.
+        Priorities change as intersections are contracted, so the priority of an intersection is computed again when it
+        is picked, and it is put back if it is no longer the lowest.
+
+        Args:
+            graph (RoadGraph): Graph to build the hierarchy of
+
+        Returns:
+            ContractionHierarchy: Hierarchy of the graph
+        """
+        size = graph.intersection_count
+        outgoing: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(size)]
+        incoming: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(size)]
+
+        for origin in range(size):
+            for edge in range(graph.offsets[origin], graph.offsets[origin + 1]):
+                destination = int(graph.targets[edge])
+                length = float(graph.lengths[edge])
+
+                if (
+                    destination != origin
+                    and length
+                    < outgoing[origin].get(destination, (float("inf"), -1))[0]
+                ):
+                    outgoing[origin][destination] = (length, -1)
+                    incoming[destination][origin] = (length, -1)
+
+        ranks = [0] * size
+        contracted_neighbours = [0] * size
+        upward_edges: List[List[Tuple[int, float, int]]] = [[] for _ in range(size)]
+        downward_edges: List[List[Tuple[int, float, int]]] = [[] for _ in range(size)]
+
+        queue = [
+            (self.__get_priority(node, outgoing, incoming, contracted_neighbours), node)
+            for node in range(size)
+        ]
+        heapify(queue)
+        rank = 0
+
+        while queue:
+            _, node = heappop(queue)
+            shortcuts = self.__find_shortcuts(node, outgoing, incoming)
+            priority = (
+                len(shortcuts)
+                - len(outgoing[node])
+                - len(incoming[node])
+                + contracted_neighbours[node]
+            )
+
+            if queue and priority > queue[0][0]:
+                heappush(queue, (priority, node))
+                continue
+
+            ranks[node] = rank
+            rank += 1
+
+            for neighbour, (length, middle) in outgoing[node].items():
+                upward_edges[node].append((neighbour, length, middle))
+                del incoming[neighbour][node]
+                contracted_neighbours[neighbour] += 1
+
+            for neighbour, (length, middle) in incoming[node].items():
+                downward_edges[node].append((neighbour, length, middle))
+                del outgoing[neighbour][node]
+                contracted_neighbours[neighbour] += 1
+
+            outgoing[node] = {}
+            incoming[node] = {}
+
+            for origin, destination, length in shortcuts:
+                if length < outgoing[origin].get(destination, (float("inf"), -1))[0]:
+                    outgoing[origin][destination] = (length, node)
+                    incoming[destination][origin] = (length, node)
+
+        upward = self.__create_compressed_edges(upward_edges)
+        downward = self.__create_compressed_edges(downward_edges)
+
+        return ContractionHierarchy(
+            ranks=np.array(ranks, dtype=np.int32),
+            upward_offsets=upward[0],
+            upward_targets=upward[1],
+            upward_lengths=upward[2],
+            upward_middles=upward[3],
+            downward_offsets=downward[0],
+            downward_sources=downward[1],
+            downward_lengths=downward[2],
+            downward_middles=downward[3],
+        )
+
+    def compute_shortest_path(
+        self, hierarchy: ContractionHierarchy, source: int, target: int
+    ) -> Tuple[float, List[int]]:
+        """Compute the shortest path between two intersections with a bidirectional upward search.
+
+        Args:
+            hierarchy (ContractionHierarchy): Hierarchy of the graph
+            source (int): Index of the source intersection
+            target (int): Index of the target intersection
+
+        Returns:
+            Tuple[float, List[int]]: Length of the shortest path and indexes of its intersections, infinite and empty
+            if the target cannot be reached
+        """
+        upward, downward, _ = self.__get_edges(hierarchy)
+        forward_search = self.__search_upward(upward, source)
+        backward_search = self.__search_upward(downward, target)
+
+        length, meeting_node = min(
+            (
+                (forward_search[node][0] + backward_search[node][0], node)
+                for node in forward_search.keys() & backward_search.keys()
+            ),
+            default=(float("inf"), -1),
+        )
+
+        if meeting_node < 0:
+            return length, []
+
+        return length, self.__unpack_path(
+            hierarchy, forward_search, backward_search, meeting_node
+        )
+
+    def compute_shortest_paths(
+        self, hierarchy: ContractionHierarchy, source: int, targets: Iterable[int]
+    ) -> Dict[int, Tuple[float, List[int]]]:
+        """Compute the shortest paths from a source to many targets with bucket queries.
+
+        Args:
+            hierarchy (ContractionHierarchy): Hierarchy of the graph
+            source (int): Index of the source intersection
+            targets (Iterable[int]): Indexes of the target intersections
+
+        Returns:
+            Dict[int, Tuple[float, List[int]]]: Length and indexes of the intersections of the shortest path to each
+            reachable target
+        """
+        upward, downward, _ = self.__get_edges(hierarchy)
+        backward_searches: Dict[int, UpwardSearch] = {}
+        buckets: Dict[int, List[Tuple[int, float]]] = {}
+
+        for target in targets:
+            if target not in self.__backward_searches:
+                if len(self.__backward_searches) >= self.BACKWARD_SEARCH_CACHE_SIZE:
+                    self.__backward_searches.clear()
+                self.__backward_searches[target] = self.__search_upward(
+                    downward, target
+                )
+            backward_searches[target] = self.__backward_searches[target]
+
+            for node, (distance, _, _) in backward_searches[target].items():
+                buckets.setdefault(node, []).append((target, distance))
+
+        forward_search = self.__search_upward(upward, source)
+        meetings: Dict[int, Tuple[float, int]] = {}
+
+        for node, (distance, _, _) in forward_search.items():
+            for target, target_distance in buckets.get(node, []):
+                if (
+                    distance + target_distance
+                    < meetings.get(target, (float("inf"), -1))[0]
+                ):
+                    meetings[target] = (distance + target_distance, node)
+
+        return {
+            target: (
+                length,
+                self.__unpack_path(
+                    hierarchy, forward_search, backward_searches[target], meeting_node
+                ),
+            )
+            for target, (length, meeting_node) in meetings.items()
+        }
+
+    def __find_shortcuts(
+        self,
+        node: int,
+        outgoing: List[Dict[int, Tuple[float, int]]],
+        incoming: List[Dict[int, Tuple[float, int]]],
+    ) -> List[Tuple[int, int, float]]:
+        """Find the shortcuts needed to keep the distances between the neighbours of an intersection without it.
+
+        Args:
+            node (int): Index of the intersection to contract
+            outgoing (List[Dict[int, Tuple[float, int]]]): Length and middle of the edges leaving each intersection
+            incoming (List[Dict[int, Tuple[float, int]]]): Length and middle of the edges entering each intersection
+
+        Returns:
+            List[Tuple[int, int, float]]: Origin, destination and length of each shortcut
+        """
+        shortcuts = []
+
+        for origin, (origin_length, _) in incoming[node].items():
+            lengths = {
+                destination: origin_length + length
+                for destination, (length, _) in outgoing[node].items()
+                if destination != origin
+            }
+
+            if not lengths:
+                continue
+
+            witness_lengths = self.__search_witnesses(
+                origin, node, max(lengths.values()), outgoing
+            )
+            shortcuts.extend(
+                (origin, destination, length)
+                for destination, length in lengths.items()
+                if witness_lengths.get(destination, float("inf")) > length
+            )
+
+        return shortcuts
+
+    def __search_witnesses(
+        self,
+        source: int,
+        excluded_node: int,
+        max_length: float,
+        outgoing: List[Dict[int, Tuple[float, int]]],
+    ) -> Dict[int, float]:
+        """Search the paths from an intersection that avoid the intersection being contracted, with a limited Dijkstra
+        search.
+
+        Args:
+            source (int): Index of the source intersection
+            excluded_node (int): Index of the intersection being contracted
+            max_length (float): Length of the longest path to compare to, the search stops after it
+            outgoing (List[Dict[int, Tuple[float, int]]]): Length and middle of the edges leaving each intersection
+
+        Returns:
+            Dict[int, float]: Length of the paths found to the intersections reached by the search
+        """
+        distances: Dict[int, float] = {source: 0}
+        settled_count = 0
+        queue = [(0.0, source)]
+
+        while queue and settled_count < self.WITNESS_SEARCH_LIMIT:
+            distance, node = heappop(queue)
+
+            if distance > max_length:
+                break
+            if distance > distances[node]:
+                continue
+            settled_count += 1
+
+            for neighbour, (length, _) in outgoing[node].items():
+                neighbour_distance = distance + length
+
+                if neighbour != excluded_node and neighbour_distance < distances.get(
+                    neighbour, float("inf")
+                ):
+                    distances[neighbour] = neighbour_distance
+                    heappush(queue, (neighbour_distance, neighbour))
+
+        return distances
+
+    def __get_priority(
+        self,
+        node: int,
+        outgoing: List[Dict[int, Tuple[float, int]]],
+        incoming: List[Dict[int, Tuple[float, int]]],
+        contracted_neighbours: List[int],
+    ) -> int:
+        """Get the priority of an intersection to be contracted, the lowest first.
+
+        Args:
+            node (int): Index of the intersection
+            outgoing (List[Dict[int, Tuple[float, int]]]): Length and middle of the edges leaving each intersection
+            incoming (List[Dict[int, Tuple[float, int]]]): Length and middle of the edges entering each intersection
+            contracted_neighbours (List[int]): Number of contracted neighbours of each intersection
+
+        Returns:
+            int: Number of shortcuts added minus number of edges removed plus number of contracted neighbours
+        """
+        return (
+            len(self.__find_shortcuts(node, outgoing, incoming))
+            - len(outgoing[node])
+            - len(incoming[node])
+            + contracted_neighbours[node]
+        )
+
+    def __create_compressed_edges(
+        self, edges: List[List[Tuple[int, float, int]]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Store the edges of each intersection in compressed sparse row format.
+
+        Args:
+            edges (List[List[Tuple[int, float, int]]]): Neighbour, length and middle of the edges of each intersection
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Offsets, neighbours, lengths and middles
+        """
+        offsets = np.zeros(len(edges) + 1, dtype=np.int32)
+        offsets[1:] = np.cumsum([len(node_edges) for node_edges in edges])
+        flat_edges = [edge for node_edges in edges for edge in node_edges]
+
+        return (
+            offsets,
+            np.array([edge[0] for edge in flat_edges], dtype=np.int32),
+            np.array([edge[1] for edge in flat_edges], dtype=np.float64),
+            np.array([edge[2] for edge in flat_edges], dtype=np.int32),
+        )
+
+    def __search_upward(self, edges: HierarchyEdges, source: int) -> UpwardSearch:
+        """Search every intersection reachable from a source going only up in the hierarchy.
+
+        Args:
+            edges (HierarchyEdges): Upward edges, or downward edges to search from a target in the reversed hierarchy
+            source (int): Index of the intersection to start from
+
+        Returns:
+            UpwardSearch: Distance from the source of every intersection reached, with the edge it was reached by
+        """
+        offsets, neighbours, lengths, middles = edges
+        search: UpwardSearch = {source: (0.0, -1, -1)}
+        settled = set()
+        queue = [(0.0, source)]
+
+        while queue:
+            distance, node = heappop(queue)
+
+            if node in settled:
+                continue
+            settled.add(node)
+
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbour = neighbours[edge]
+                neighbour_distance = distance + lengths[edge]
+
+                if neighbour_distance < search.get(neighbour, (float("inf"),))[0]:
+                    search[neighbour] = (neighbour_distance, node, middles[edge])
+                    heappush(queue, (neighbour_distance, neighbour))
+
+        return search
+
+    def __unpack_path(
+        self,
+        hierarchy: ContractionHierarchy,
+        forward_search: UpwardSearch,
+        backward_search: UpwardSearch,
+        meeting_node: int,
+    ) -> List[int]:
+        """Build the path of intersections through the node where the upward searches from the source and from the
+        target met, replacing the shortcuts by the edges they skip.
+
+        Args:
+            hierarchy (ContractionHierarchy): Hierarchy of the graph
+            forward_search (UpwardSearch): Upward search from the source
+            backward_search (UpwardSearch): Upward search from the target in the reversed hierarchy
+            meeting_node (int): Index of an intersection reached by both searches on the shortest path
+
+        Returns:
+            List[int]: Indexes of the intersections of the path, from the source to the target
+        """
+        # Edges of the path in the hierarchy, from the source to the target
+        edges: List[Tuple[int, int, int]] = []
+
+        node = meeting_node
+        while forward_search[node][1] >= 0:
+            _, previous_node, middle = forward_search[node]
+            edges.append((previous_node, node, middle))
+            node = previous_node
+        edges.reverse()
+
+        node = meeting_node
+        while backward_search[node][1] >= 0:
+            _, next_node, middle = backward_search[node]
+            edges.append((node, next_node, middle))
+            node = next_node
+
+        _, _, shortcut_middles = self.__get_edges(hierarchy)
+        path = [edges[0][0]] if edges else [meeting_node]
+        # Shortcuts are replaced by their two edges until only segments remain
+        stack = edges[::-1]
+
+        while stack:
+            origin, destination, middle = stack.pop()
+
+            if middle < 0:
+                path.append(destination)
+                continue
+
+            stack.append(
+                (middle, destination, shortcut_middles.get((middle, destination), -1))
+            )
+            stack.append((origin, middle, shortcut_middles.get((origin, middle), -1)))
+
+        return path
+
+    def __get_edges(
+        self, hierarchy: ContractionHierarchy
+    ) -> Tuple[HierarchyEdges, HierarchyEdges, Dict[Tuple[int, int], int]]:
+        """Get the edges of a hierarchy as Python lists, which are faster to read one element at a time, and the middle
+        of each shortcut by its origin and destination, to unpack paths.
+
+        They are kept for the last hierarchy used, with the searches from targets done in it.
+
+        Args:
+            hierarchy (ContractionHierarchy): Hierarchy to get the edges of
+
+        Returns:
+            Tuple[HierarchyEdges, HierarchyEdges, Dict[Tuple[int, int], int]]: Upward and downward edges, and middles of
+            the shortcuts
+        """
+        if hierarchy is not self.__edges_hierarchy:
+            upward: HierarchyEdges = (
+                hierarchy.upward_offsets.tolist(),
+                hierarchy.upward_targets.tolist(),
+                hierarchy.upward_lengths.tolist(),
+                hierarchy.upward_middles.tolist(),
+            )
+            downward: HierarchyEdges = (
+                hierarchy.downward_offsets.tolist(),
+                hierarchy.downward_sources.tolist(),
+                hierarchy.downward_lengths.tolist(),
+                hierarchy.downward_middles.tolist(),
+            )
+            shortcut_middles: Dict[Tuple[int, int], int] = {}
+
+            for is_upward, (offsets, neighbours, _, middles) in (
+                (True, upward),
+                (False, downward),
+            ):
+                for node in range(len(offsets) - 1):
+                    for edge in range(offsets[node], offsets[node + 1]):
+                        if middles[edge] >= 0:
+                            shortcut_middles[
+                                (node, neighbours[edge])
+                                if is_upward
+                                else (neighbours[edge], node)
+                            ] = middles[edge]
+
+            self.__edges_hierarchy = hierarchy
+            self.__edges = (upward, downward, shortcut_middles)
+            self.__backward_searches = {}
+
+        return self.__edges
@@ -0,0 +1,351 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.models.map import Map, RoadGraph
+from src.services.map.map_service import MapService
+from src.services.routing.distance_matrix_service import DistanceMatrixService
+from src.services.routing.distance_store_service import DistanceStoreService
+from src.services.routing.road_graph_service import RoadGraphService
+from src.services.routing.shortest_path_service import ShortestPathService
+from src.services.singleton import Singleton
+
+
+class DistanceCacheService(Singleton):
+    """Keep the shortest paths between delivery locations of the current road graph.
+
+    Paths are computed lazily, only for the pairs of intersections that are not known yet, and are reused by every
+    computation on the same graph (other tours, edits, undo and redo). The cache is emptied when the map changes.
+
+    When the graph is the one of the map loaded from a file, the paths are also kept on disk by the
+    DistanceStoreService: paths missing from the cache are read from the store before being computed, so the paths of a
+    previous session are not computed again. If the shortest paths between all the intersections of the map were
+    precomputed by the DistanceMatrixService, they are read from its matrices and nothing is ever computed.
+    """
+
+    __map: Optional[Map]
+    __content_hash: Optional[str]
+    __graph: Optional[RoadGraph]
+    __reversed_graph: Optional[RoadGraph]
+    __lengths: Dict[int, Dict[int, float]]
+    __paths: Dict[int, Dict[int, List[int]]]
+
+    def __init__(self) -> None:
+        self.__map = None
+        self.__content_hash = None
+        self.__graph = None
+        self.__reversed_graph = None
+        self.__lengths = {}
+        self.__paths = {}
+
+        MapService.instance().map.subscribe(self.__on_map_change)
+
+    def compute_missing_shortest_paths(
+        self, graph: RoadGraph, targets_by_source: Dict[int, List[int]]
+    ) -> None:
+        """Compute the shortest paths that are not cached yet between many sources and targets.
+
+        Args:
+            graph (RoadGraph): Graph to search in
+            targets_by_source (Dict[int, List[int]]): IDs of the target intersections for each source intersection ID
+
+        Returns:
+            None
+        """
+        forward_searches, backward_searches = self.get_missing_searches(
+            graph, targets_by_source
+        )
+
+        for source, targets in forward_searches.items():
+            self.get_shortest_paths(graph, source, targets)
+
+        for target, sources in backward_searches.items():
+            self.compute_backward_shortest_paths(graph, target, sources)
+
+    def get_missing_searches(
+        self, graph: RoadGraph, targets_by_source: Dict[int, List[int]]
+    ) -> Tuple[Dict[int, List[int]], Dict[int, List[int]]]:
+        """Get the searches needed to compute the shortest paths that are not cached yet.
+
+        A source missing many targets is searched from (a new row). Sources missing a single target are grouped by
+        target and searched from the target in the reversed graph (a new column), so adding a delivery to a tour costs
+        two searches instead of one per delivery.
+
+        Args:
+            graph (RoadGraph): Graph to search in
+            targets_by_source (Dict[int, List[int]]): IDs of the target intersections for each source intersection ID
+
+        Returns:
+            Tuple[Dict[int, List[int]], Dict[int, List[int]]]: Missing targets of the sources to search from, and
+            sources missing each target to search from in the reversed graph
+        """
+        forward_searches: Dict[int, List[int]] = {}
+        backward_searches: Dict[int, List[int]] = {}
+
+        for source, targets in targets_by_source.items():
+            missing_targets = self.get_missing_targets(graph, source, targets)
+
+            if len(missing_targets) > 1:
+                forward_searches[source] = missing_targets
+            elif missing_targets:
+                backward_searches.setdefault(missing_targets[0], []).append(source)
+
+        return forward_searches, backward_searches
+
+    def compute_backward_shortest_paths(
+        self, graph: RoadGraph, target: int, sources: Iterable[int]
+    ) -> None:
+        """Compute the shortest paths from many sources to a target with a single search in the reversed graph.
+
+        Args:
+            graph (RoadGraph): Graph to search in
+            target (int): ID of the target intersection
+            sources (Iterable[int]): IDs of the source intersections
+
+        Returns:
+            None
+        """
+        sources = list(sources)
+        shortest_path_service = ShortestPathService.instance()
+        lengths, successors = shortest_path_service.compute_shortest_paths(
+            self.__get_reversed_graph(graph), target, sources
+        )
+
+        for source in sources:
+            path = (
+                shortest_path_service.build_path(successors, source)[::-1]
+                if source in lengths
+                else None
+            )
+            self.add_shortest_paths(
+                graph,
+                source,
+                [target],
+                {target: lengths[source]} if path else {},
+                {target: path} if path else {},
+            )
+
+    def get_shortest_paths(
+        self, graph: RoadGraph, source: int, targets: Iterable[int]
+    ) -> Tuple[Dict[int, float], Dict[int, List[int]]]:
+        """Get the shortest paths from a source to many targets, computing only the ones that are not cached yet.
+
+        Args:
+            graph (RoadGraph): Graph to search in
+            source (int): ID of the source intersection
+            targets (Iterable[int]): IDs of the target intersections
+
+        Returns:
+            Tuple[Dict[int, float], Dict[int, List[int]]]: Lengths and paths of the shortest paths to the reachable
+            targets
+        """
+        targets = list(targets)
+        missing_targets = self.get_missing_targets(graph, source, targets)
+
+        if missing_targets:
+            shortest_path_service = ShortestPathService.instance()
+            lengths, predecessors = shortest_path_service.compute_shortest_paths(
+                graph, source, missing_targets
+            )
+            paths = {
+                target: shortest_path_service.build_path(predecessors, target)
+                for target in lengths
+            }
+            self.add_shortest_paths(graph, source, missing_targets, lengths, paths)
+
+        return self.get_cached_shortest_paths(graph, source, targets)
+
+    def get_missing_targets(
+        self, graph: RoadGraph, source: int, targets: Iterable[int]
+    ) -> List[int]:
+        """Get the targets for which the shortest path from a source is not cached.
+
+        Args:
+            graph (RoadGraph): Graph to search in
+            source (int): ID of the source intersection
+            targets (Iterable[int]): IDs of the target intersections
+
+        Returns:
+            List[int]: IDs of the targets without a cached shortest path
+        """
+        known_lengths = self.__get_lengths(graph).get(source, {})
+        missing_targets = [target for target in targets if target not in known_lengths]
+
+        if missing_targets and self.__content_hash:
+            # Precomputed matrices answer every query, the store only the paths of previous sessions
+            lengths, paths = DistanceMatrixService.instance().get_shortest_paths(
+                self.__content_hash, graph, source, missing_targets
+            )
+            missing_targets = self.__add_read_shortest_paths(
+                source, missing_targets, lengths, paths
+            )
+
+        if missing_targets and self.__content_hash:
+            lengths, paths = DistanceStoreService.instance().get_shortest_paths(
+                self.__content_hash, source, missing_targets
+            )
+            missing_targets = self.__add_read_shortest_paths(
+                source, missing_targets, lengths, paths
+            )
+
+        return missing_targets
+
+    def get_cached_shortest_paths(
+        self, graph: RoadGraph, source: int, targets: Iterable[int]
+    ) -> Tuple[Dict[int, float], Dict[int, List[int]]]:
+        """Get the cached shortest paths from a source to reachable targets. Targets that are not cached are ignored.
+
+        Args:
+            graph (RoadGraph): Graph to search in
+            source (int): ID of the source intersection
+            targets (Iterable[int]): IDs of the target intersections
+
+        Returns:
+            Tuple[Dict[int, float], Dict[int, List[int]]]: Lengths and paths of the cached shortest paths
+        """
+        known_lengths = self.__get_lengths(graph).get(source, {})
+        known_paths = self.__paths.get(source, {})
+
+        lengths = {
+            target: known_lengths[target]
+            for target in targets
+            if known_lengths.get(target, float("inf")) != float("inf")
+        }
+
+        return lengths, {target: known_paths[target] for target in lengths}
+
+    def add_shortest_paths(
+        self,
+        graph: RoadGraph,
+        source: int,
+        targets: Iterable[int],
+        lengths: Dict[int, float],
+        paths: Dict[int, List[int]],
+    ) -> None:
+        """Add the result of a search from a source to the cache. Targets missing from the result are unreachable.
+
+        Args:
+            graph (RoadGraph): Graph the search was done in
+            source (int): ID of the source intersection
+            targets (Iterable[int]): IDs of the target intersections of the search
+            lengths (Dict[int, float]): Lengths of the shortest paths to the reachable targets
+            paths (Dict[int, List[int]]): Shortest paths to the reachable targets
+        """
+        targets = list(targets)
+        self.__get_lengths(graph)
+        self.__add_cached_shortest_paths(source, targets, lengths, paths)
+
+        if self.__content_hash:
+            DistanceStoreService.instance().add_shortest_paths(
+                self.__content_hash, source, targets, lengths, paths
+            )
+
+    def clear(self) -> None:
+        """Remove all the cached shortest paths.
+
+        Returns:
+            None
+        """
+        self.__content_hash = None
+        self.__graph = None
+        self.__reversed_graph = None
+        self.__lengths = {}
+        self.__paths = {}
+
+    def __add_cached_shortest_paths(
+        self,
+        source: int,
+        targets: Iterable[int],
+        lengths: Dict[int, float],
+        paths: Dict[int, List[int]],
+    ) -> None:
+        """Add shortest paths from a source to the cache of the current graph. Targets missing from the lengths are
+        unreachable.
+
+        Args:
+            source (int): ID of the source intersection
+            targets (Iterable[int]): IDs of the target intersections
+            lengths (Dict[int, float]): Lengths of the shortest paths to the reachable targets
+            paths (Dict[int, List[int]]): Shortest paths to the reachable targets
+
+        Returns:
+            None
+        """
+        known_lengths = self.__lengths.setdefault(source, {})
+        known_paths = self.__paths.setdefault(source, {})
+
+        for target in targets:
+            known_lengths[target] = lengths.get(target, float("inf"))
+
+            if target in paths:
+                known_paths[target] = paths[target]
+
+    def __add_read_shortest_paths(
+        self,
+        source: int,
+        targets: List[int],
+        lengths: Dict[int, float],
+        paths: Dict[int, List[int]],
+    ) -> List[int]:
+        """Add the shortest paths read from the disk to the cache.
+
+        Args:
+            source (int): ID of the source intersection
+            targets (List[int]): IDs of the target intersections that were read
+            lengths (Dict[int, float]): Lengths of the paths that were found, infinite for the unreachable targets
+            paths (Dict[int, List[int]]): Paths to the reachable targets that were found
+
+        Returns:
+            List[int]: IDs of the targets that were not found
+        """
+        self.__add_cached_shortest_paths(source, lengths, lengths, paths)
+
+        return [target for target in targets if target not in lengths]
+
+    def __get_reversed_graph(self, graph: RoadGraph) -> RoadGraph:
+        """Get the reversed graph of a graph, created once per graph.
+
+        Args:
+            graph (RoadGraph): Graph to reverse
+
+        Returns:
+            RoadGraph: Reversed graph
+        """
+        if self.__reversed_graph is None or graph is not self.__graph:
+            self.__get_lengths(graph)
+            self.__reversed_graph = graph.reverse()
+
+        return self.__reversed_graph
+
+    def __get_lengths(self, graph: RoadGraph) -> Dict[int, Dict[int, float]]:
+        """Get the cached lengths, emptying the cache first if it was filled for another graph.
+
+        Args:
+            graph (RoadGraph): Graph to search in
+
+        Returns:
+            Dict[int, Dict[int, float]]: Cached lengths indexed by source and target intersection IDs
+        """
+        if graph is not self.__graph:
+            self.clear()
+            self.__graph = graph
+
+            # Only the graph of the published map has a known content
+            if (
+                self.__map is not None
+                and self.__map.content_hash
+                and RoadGraphService.instance().get_road_graph(self.__map) is graph
+            ):
+                self.__content_hash = self.__map.content_hash
+
+        return self.__lengths
+
+    def __on_map_change(self, map: Optional[Map]) -> None:
+        """Empty the cache when a map is published.
+
+        Args:
+            map (Optional[Map]): New map
+
+        Returns:
+            None
+        """
+        self.clear()
+        self.__map = map
@@ -0,0 +1,221 @@
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import Config
+from src.models.map import Map, RoadGraph
+from src.services.routing.road_graph_service import RoadGraphService
+from src.services.routing.shortest_path_service import ShortestPathService
+from src.services.singleton import Singleton
+
+DistanceMatrices = Tuple[np.ndarray, np.ndarray]
+"""Length of the shortest path between every pair of intersections, and index of the intersection following the source
+on this path
+"""
+
+
+class DistanceMatrixService(Singleton):
+    """Precompute the shortest paths between every pair of intersections of a map, so that tours can be computed
+    without searching the road graph.
+
+    The matrices are indexed like the road graph of the map. Lengths are stored as float32 and next hops as int32, which
+    takes about 110 MB for the large map. They are written to .npy files in Config.DISTANCE_MATRIX_DIRECTORY, named after
+    the content hash of the map, and are memory-mapped when read: only the rows that are used are loaded from the disk.
+    A path is rebuilt by following the next hops, which costs the length of the path.
+    """
+
+    __content_hash: Optional[str]
+    __matrices: Optional[DistanceMatrices]
+
+    def __init__(self) -> None:
+        self.__content_hash = None
+        self.__matrices = None
+
+    def create_matrix_files(self, map: Map) -> Tuple[str, str]:
+        """Create the temporary files of the matrices of a map, to be filled with compute_rows. The matrices are only
+        read once the files are saved with save_matrix_files, so that an interrupted computation is never used.
+
+        Args:
+            map (Map): Map loaded from a file
+
+        Returns:
+            Tuple[str, str]: Paths of the temporary files of the lengths and of the next hops
+
+        Raises:
+            ValueError: If the map was not loaded from a file
+        """
+        if not map.content_hash:
+            raise ValueError(
+                "Only the matrices of a map loaded from a file can be kept"
+            )
+
+        size = RoadGraphService.instance().get_road_graph(map).intersection_count
+        lengths_path, next_hops_path = [
+            f"{path}.tmp" for path in self.__get_paths(map.content_hash)
+        ]
+
+        os.makedirs(Config.DISTANCE_MATRIX_DIRECTORY, exist_ok=True)
+        np.lib.format.open_memmap(
+            lengths_path, mode="w+", dtype=np.float32, shape=(size, size)
+        ).flush()
+        np.lib.format.open_memmap(
+            next_hops_path, mode="w+", dtype=np.int32, shape=(size, size)
+        ).flush()
+
+        return lengths_path, next_hops_path
+
+    def compute_rows(
+        self,
+        graph: RoadGraph,
+        lengths_path: str,
+        next_hops_path: str,
+        start: int,
+        stop: int,
+    ) -> None:
+        """Compute rows of the matrices of a graph into their files.
+
+        Args:
+            graph (RoadGraph): Graph to search in
+            lengths_path (str): Path of the file of the lengths
+            next_hops_path (str): Path of the file of the next hops
+            start (int): Index of the first row to compute
+            stop (int): Index after the last row to compute
+
+        Returns:
+            None
+        """
+        lengths = np.load(lengths_path, mmap_mode="r+")
+        next_hops = np.load(next_hops_path, mmap_mode="r+")
+        shortest_path_service = ShortestPathService.instance()
+
+        for source_index in range(start, stop):
+            (
+                lengths[source_index],
+                next_hops[source_index],
+            ) = shortest_path_service.compute_shortest_path_tree(graph, source_index)
+
+        lengths.flush()
+        next_hops.flush()
+
+    def save_matrix_files(
+        self, map: Map, lengths_path: str, next_hops_path: str
+    ) -> None:
+        """Save the temporary files of the matrices of a map once all their rows are computed.
+
+        Args:
+            map (Map): Map of the matrices
+            lengths_path (str): Path of the temporary file of the lengths
+            next_hops_path (str): Path of the temporary file of the next hops
+
+        Returns:
+            None
+        """
+        paths = self.__get_paths(map.content_hash)
+
+        os.replace(lengths_path, paths[0])
+        os.replace(next_hops_path, paths[1])
+
+        if self.__content_hash == map.content_hash:
+            self.__content_hash = None
+            self.__matrices = None
+
+    def has_matrices(self, map: Map) -> bool:
+        """Check whether the matrices of a map were precomputed.
+
+        Args:
+            map (Map): Map to check
+
+        Returns:
+            bool: True if the matrices of the map can be read
+        """
+        return self.__get_matrices(map.content_hash) is not None
+
+    def get_shortest_paths(
+        self, content_hash: str, graph: RoadGraph, source: int, targets: Iterable[int]
+    ) -> Tuple[Dict[int, float], Dict[int, List[int]]]:
+        """Get the shortest paths from a source to many targets from the precomputed matrices.
+
+        Args:
+            content_hash (str): Content hash of the map of the graph
+            graph (RoadGraph): Graph of the map
+            source (int): ID of the source intersection
+            targets (Iterable[int]): IDs of the target intersections
+
+        Returns:
+            Tuple[Dict[int, float], Dict[int, List[int]]]: Lengths of the shortest paths, infinite for the targets that
+            cannot be reached, and paths to the reachable targets. Empty if the matrices of the map were not
+            precomputed.
+        """
+        matrices = self.__get_matrices(content_hash)
+        lengths: Dict[int, float] = {}
+        paths: Dict[int, List[int]] = {}
+
+        if matrices is None or source not in graph.indexes:
+            return lengths, paths
+
+        length_matrix, next_hops = matrices
+        source_index = graph.indexes[source]
+        source_lengths = length_matrix[source_index]
+
+        for target in targets:
+            if target not in graph.indexes:
+                continue
+
+            target_index = graph.indexes[target]
+            length = float(source_lengths[target_index])
+            lengths[target] = length
+
+            if length == float("inf"):
+                continue
+
+            path = [source_index]
+            while path[-1] != target_index:
+                path.append(int(next_hops[path[-1], target_index]))
+
+            paths[target] = graph.intersection_ids[path].tolist()
+
+        return lengths, paths
+
+    def __get_matrices(self, content_hash: Optional[str]) -> Optional[DistanceMatrices]:
+        """Get the memory-mapped matrices of a map, opened once per map.
+
+        Args:
+            content_hash (Optional[str]): Content hash of the map
+
+        Returns:
+            Optional[DistanceMatrices]: Matrices of the map, None if they were not precomputed
+        """
+        if not content_hash:
+            return None
+
+        if content_hash != self.__content_hash:
+            paths = self.__get_paths(content_hash)
+
+            self.__content_hash = content_hash
+            # Plain arrays are faster to index than memory maps, and still read their file lazily
+            self.__matrices = (
+                tuple(np.load(path, mmap_mode="r").view(np.ndarray) for path in paths)
+                if all(os.path.exists(path) for path in paths)
+                else None
+            )
+
+        return self.__matrices
+
+    def __get_paths(self, content_hash: str) -> Tuple[str, str]:
+        """Get the paths of the files of the matrices of a map.
+
+        Args:
+            content_hash (str): Content hash of the map
+
+        Returns:
+            Tuple[str, str]: Paths of the lengths and of the next hops
+        """
+        return (
+            os.path.join(
+                Config.DISTANCE_MATRIX_DIRECTORY, f"{content_hash}-lengths.npy"
+            ),
+            os.path.join(
+                Config.DISTANCE_MATRIX_DIRECTORY, f"{content_hash}-next-hops.npy"
+            ),
+        )
@@ -0,0 +1,240 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import Config
+from src.services.singleton import Singleton
+
+
+class DistanceStoreService(Singleton):
+    """Keep the shortest paths computed on the maps on disk, so that a new session does not compute them again.
+
+    Paths are stored in a SQLite database at Config.DISTANCE_STORE_PATH, indexed by the content hash of the map they
+    were computed on, so a path is found again whatever the name or the location of the map file. The database is
+    opened in WAL mode and memory-mapped, so that reading it costs about as much as reading memory, and several
+    instances of the application can use it at the same time. The least recently used paths are dropped when there are
+    more than Config.DISTANCE_STORE_SIZE of them.
+
+    The store is only an accelerator: if the database cannot be opened or written, it is disabled and the paths are
+    computed as usual.
+    """
+
+    EVICTION_RATIO = 0.1
+    """Part of the store emptied at once when it is full, so that the eviction does not run on every addition
+    """
+
+    __connection: Optional[sqlite3.Connection]
+    __is_disabled: bool
+    __size: int
+    __lock: threading.Lock
+
+    def __init__(self) -> None:
+        self.__connection = None
+        self.__is_disabled = False
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+    def get_shortest_paths(
+        self, content_hash: str, source: int, targets: Iterable[int]
+    ) -> Tuple[Dict[int, float], Dict[int, List[int]]]:
+        """Get the stored shortest paths from a source to many targets, and mark them as used.
+
+        Args:
+            content_hash (str): Content hash of the map the paths were computed on
+            source (int): ID of the source intersection
+            targets (Iterable[int]): IDs of the target intersections
+
+        Returns:
+            Tuple[Dict[int, float], Dict[int, List[int]]]: Lengths of the stored paths, infinite for the targets known
+            to be unreachable, and paths to the reachable targets. Targets that are not stored are missing.
+        """
+        targets = list(targets)
+        lengths: Dict[int, float] = {}
+        paths: Dict[int, List[int]] = {}
+
+        if not targets:
+            return lengths, paths
+
+        with self.__lock:
+            connection = self.__get_connection()
+            if connection is None:
+                return lengths, paths
+
+            try:
+                placeholders = ", ".join("?" * len(targets))
+                rows = connection.execute(
+                    "SELECT target, length, path FROM distances "
+                    f"WHERE map_hash = ? AND source = ? AND target IN ({placeholders})",
+                    [content_hash, source, *targets],
+                ).fetchall()
+
+                if rows:
+                    with connection:
+                        connection.execute(
+                            "UPDATE distances SET last_used = ? "
+                            f"WHERE map_hash = ? AND source = ? AND target IN ({placeholders})",
+                            [time.time(), content_hash, source, *targets],
+                        )
+            except sqlite3.Error:
+                self.__disable()
+                return {}, {}
+
+        for target, length, path in rows:
+            if length is None:
+                lengths[target] = float("inf")
+            else:
+                lengths[target] = length
+                paths[target] = np.frombuffer(path, dtype=np.int64).tolist()
+
+        return lengths, paths
+
+    def add_shortest_paths(
+        self,
+        content_hash: str,
+        source: int,
+        targets: Iterable[int],
+        lengths: Dict[int, float],
+        paths: Dict[int, List[int]],
+    ) -> None:
+        """Store the result of a search from a source. Targets missing from the result are stored as unreachable.
+
+        Args:
+            content_hash (str): Content hash of the map the search was done on
+            source (int): ID of the source intersection
+            targets (Iterable[int]): IDs of the target intersections of the search
+            lengths (Dict[int, float]): Lengths of the shortest paths to the reachable targets
+            paths (Dict[int, List[int]]): Shortest paths to the reachable targets
+
+        Returns:
+            None
+        """
+        last_used = time.time()
+        rows = [
+            (
+                content_hash,
+                source,
+                target,
+                lengths[target],
+                np.array(paths[target], dtype=np.int64).tobytes(),
+                last_used,
+            )
+            if target in paths
+            else (content_hash, source, target, None, None, last_used)
+            for target in targets
+        ]
+
+        if not rows:
+            return
+
+        with self.__lock:
+            connection = self.__get_connection()
+            if connection is None:
+                return
+
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO distances VALUES (?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                self.__size += len(rows)
+
+                if self.__size > Config.DISTANCE_STORE_SIZE:
+                    self.__evict(connection)
+            except sqlite3.Error:
+                self.__disable()
+
+    def close(self) -> None:
+        """Close the database. It is opened again when it is used.
+
+        Returns:
+            None
+        """
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+    def __get_connection(self) -> Optional[sqlite3.Connection]:
+        """Get the connection to the database, opening and creating it the first time, the lock being held.
+
+        Returns:
+            Optional[sqlite3.Connection]: Connection to the database, None if the store is disabled
+        """
+        if self.__connection is not None or self.__is_disabled:
+            return self.__connection
+
+        if not Config.DISTANCE_STORE_PATH:
+            self.__is_disabled = True
+            return None
+
+        try:
+            os.makedirs(os.path.dirname(Config.DISTANCE_STORE_PATH), exist_ok=True)
+            self.__connection = sqlite3.connect(
+                Config.DISTANCE_STORE_PATH, timeout=10, check_same_thread=False
+            )
+            self.__connection.execute("PRAGMA journal_mode = WAL")
+            self.__connection.execute("PRAGMA synchronous = NORMAL")
+            self.__connection.execute(
+                f"PRAGMA mmap_size = {int(Config.DISTANCE_STORE_MMAP_SIZE)}"
+            )
+            with self.__connection:
+                self.__connection.execute(
+                    "CREATE TABLE IF NOT EXISTS distances ("
+                    "map_hash TEXT NOT NULL, source INTEGER NOT NULL, target INTEGER NOT NULL, "
+                    "length REAL, path BLOB, last_used REAL NOT NULL, "
+                    "PRIMARY KEY (map_hash, source, target)) WITHOUT ROWID"
+                )
+                self.__connection.execute(
+                    "CREATE INDEX IF NOT EXISTS distances_last_used ON distances (last_used)"
+                )
+            self.__size = self.__connection.execute(
+                "SELECT COUNT(*) FROM distances"
+            ).fetchone()[0]
+        except (OSError, sqlite3.Error):
+            self.__disable()
+
+        return self.__connection
+
+    def __evict(self, connection: sqlite3.Connection) -> None:
+        """Drop the least recently used paths so that the store is below its size, the lock being held.
+
+        Other instances of the application may have added paths too, so the size is counted again first.
+
+        Args:
+            connection (sqlite3.Connection): Connection to the database
+
+        Returns:
+            None
+        """
+        self.__size = connection.execute("SELECT COUNT(*) FROM distances").fetchone()[0]
+        excess = self.__size - int(
+            Config.DISTANCE_STORE_SIZE * (1 - self.EVICTION_RATIO)
+        )
+
+        if self.__size <= Config.DISTANCE_STORE_SIZE or excess <= 0:
+            return
+
+        with connection:
+            connection.execute(
+                "DELETE FROM distances WHERE (map_hash, source, target) IN ("
+                "SELECT map_hash, source, target FROM distances ORDER BY last_used LIMIT ?)",
+                [excess],
+            )
+        self.__size -= excess
+
+    def __disable(self) -> None:
+        """Stop using the store after an error, the lock being held.
+
+        Returns:
+            None
+        """
+        if self.__connection is not None:
+            self.__connection.close()
+
+        self.__connection = None
+        self.__is_disabled = True
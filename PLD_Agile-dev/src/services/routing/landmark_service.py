@@ -0,0 +1,174 @@
+import dataclasses
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.config import Config
+from src.models.map import LandmarkIndex, Map, RoadGraph
+from src.services.routing.shortest_path_service import ShortestPathService
+from src.services.singleton import Singleton
+
+
+class LandmarkService(Singleton):
+    """Build landmark indexes of road graphs and get lower bounds on the lengths of shortest paths from them, without
+    searching the graph.
+
+    Landmarks are chosen by farthest-point selection: each new landmark is the intersection farthest from the landmarks
+    already chosen, so that they end up spread on the edges of the map, where they give the best bounds.
+    """
+
+    LANDMARK_COUNT = 12
+    """Number of landmarks of an index. Each landmark costs a search from it and a search to it when the index is
+    built, and two numbers per intersection
+    """
+
+    __bounds_landmarks: Optional[LandmarkIndex]
+    __bounds: Tuple[List[List[float]], List[List[float]]]
+
+    def __init__(self) -> None:
+        self.__bounds_landmarks = None
+        self.__bounds = ([], [])
+
+    def get_landmarks(self, map: Map, graph: RoadGraph) -> LandmarkIndex:
+        """Get the landmark index of the graph of a map. The index of a map loaded from a file is read from
+        Config.LANDMARK_DIRECTORY if it was already built, and written there otherwise.
+
+        Args:
+            map (Map): Map of the graph
+            graph (RoadGraph): Road graph of the map
+
+        Returns:
+            LandmarkIndex: Landmark index of the graph
+        """
+        if not map.content_hash:
+            return self.build_landmarks(graph)
+
+        path = os.path.join(
+            Config.LANDMARK_DIRECTORY, f"{map.content_hash}-landmarks.npz"
+        )
+
+        if os.path.exists(path):
+            with np.load(path) as arrays:
+                return LandmarkIndex(
+                    **{
+                        field.name: arrays[field.name]
+                        for field in dataclasses.fields(LandmarkIndex)
+                    }
+                )
+
+        landmarks = self.build_landmarks(graph)
+
+        os.makedirs(Config.LANDMARK_DIRECTORY, exist_ok=True)
+        # The file is renamed once complete, so that an interrupted write is never read
+        with open(f"{path}.tmp", "wb") as file:
+            np.savez(file, **dataclasses.asdict(landmarks))
+        os.replace(f"{path}.tmp", path)
+
+        return landmarks
+
+    def build_landmarks(self, graph: RoadGraph) -> LandmarkIndex:
+        """Build the landmark index of a graph.
+
+        The distance of an intersection to the landmarks is the smallest sum of the lengths of the shortest paths to and
+        from one of them, and the first landmark is the intersection farthest from the first intersection of the graph
+        in the same way. Intersections with no path to or from a landmark are left out: they are usually dead ends or
+        one-way pockets, from which most of the graph cannot be reached or which cannot be reached from it, and
+        landmarks there give no useful bound.
+
+        Args:
+            graph (RoadGraph): Graph to build the index of
+
+        Returns:
+            LandmarkIndex: Landmark index of the graph
+        """
+        shortest_path_service = ShortestPathService.instance()
+        reversed_graph = graph.reverse()
+        count = min(self.LANDMARK_COUNT, graph.intersection_count)
+
+        landmarks = np.zeros(count, dtype=np.int32)
+        lengths_from = np.zeros((count, graph.intersection_count))
+        lengths_to = np.zeros((count, graph.intersection_count))
+
+        round_trip_lengths = (
+            shortest_path_service.compute_shortest_path_tree(graph, 0)[0]
+            + shortest_path_service.compute_shortest_path_tree(reversed_graph, 0)[0]
+        )
+        distances = np.where(np.isfinite(round_trip_lengths), round_trip_lengths, 0.0)
+
+        for landmark in range(count):
+            node = int(np.argmax(distances))
+            landmarks[landmark] = node
+            lengths_from[landmark] = shortest_path_service.compute_shortest_path_tree(
+                graph, node
+            )[0]
+            lengths_to[landmark] = shortest_path_service.compute_shortest_path_tree(
+                reversed_graph, node
+            )[0]
+
+            round_trip_lengths = lengths_from[landmark] + lengths_to[landmark]
+            distances = np.minimum(
+                distances,
+                np.where(np.isfinite(round_trip_lengths), round_trip_lengths, 0.0),
+            )
+            distances[landmarks[: landmark + 1]] = 0.0
+
+        return LandmarkIndex(
+            landmarks=landmarks, lengths_from=lengths_from, lengths_to=lengths_to
+        )
+
+    def get_lower_bound(self, graph: RoadGraph, source: int, target: int) -> float:
+        """Get a lower bound on the length of the shortest path between two intersections, in constant time.
+
+        Args:
+            graph (RoadGraph): Graph of the intersections
+            source (int): ID of the source intersection
+            target (int): ID of the target intersection
+
+        Returns:
+            float: Lower bound on the length of the shortest path, zero if the graph has no landmark index, infinite if
+            the target is known to be unreachable
+        """
+        if graph.landmarks is None:
+            return 0.0
+
+        lengths_from, lengths_to = self.__get_bounds(graph.landmarks)
+        source_index = graph.indexes[source]
+        target_index = graph.indexes[target]
+
+        bound = 0.0
+
+        for longer_lengths, shorter_lengths in [
+            (lengths_from[target_index], lengths_from[source_index]),
+            (lengths_to[source_index], lengths_to[target_index]),
+        ]:
+            for longer_length, shorter_length in zip(longer_lengths, shorter_lengths):
+                # The difference of two infinite lengths is NaN, which gives no bound as it is never greater
+                if longer_length - shorter_length > bound:
+                    bound = longer_length - shorter_length
+
+        return bound
+
+    def __get_bounds(
+        self, landmarks: LandmarkIndex
+    ) -> Tuple[List[List[float]], List[List[float]]]:
+        """Get the lengths of the paths from and to the landmarks of an index as Python lists, grouped by intersection,
+        which are faster to read for a single pair of intersections.
+
+        The lists are kept for the last index used.
+
+        Args:
+            landmarks (LandmarkIndex): Landmark index
+
+        Returns:
+            Tuple[List[List[float]], List[List[float]]]: Lengths of the paths from and to each landmark, for each
+            intersection
+        """
+        if landmarks is not self.__bounds_landmarks:
+            self.__bounds_landmarks = landmarks
+            self.__bounds = (
+                landmarks.lengths_from.T.tolist(),
+                landmarks.lengths_to.T.tolist(),
+            )
+
+        return self.__bounds
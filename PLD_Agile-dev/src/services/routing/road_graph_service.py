@@ -0,0 +1,75 @@
+import dataclasses
+from typing import Optional
+
+from src.config import Config
+from src.models.map import Map, ReachabilityIndex, RoadGraph
+from src.services.map.map_service import MapService
+from src.services.routing.contraction_hierarchy_service import (
+    ContractionHierarchyService,
+)
+from src.services.routing.landmark_service import LandmarkService
+from src.services.singleton import Singleton
+
+
+class RoadGraphService(Singleton):
+    __map: Optional[Map]
+    __road_graph: Optional[RoadGraph]
+
+    def __init__(self) -> None:
+        self.__map = None
+        self.__road_graph = None
+
+        MapService.instance().map.subscribe(self.__on_map_change)
+
+    def get_road_graph(self, map: Map) -> RoadGraph:
+        """Get the road graph of a map. The graph is created once per map with its strongly connected components, its
+        contraction hierarchy if Config.USE_CONTRACTION_HIERARCHY is set and its landmark index if Config.USE_LANDMARKS
+        is set.
+
+        Args:
+            map (Map): Map to get the graph of
+
+        Returns:
+            RoadGraph: Road graph of the map
+        """
+        if map is not self.__map:
+            self.__map = map
+            graph = RoadGraph.from_map(map)
+            # Cheap to build, so every graph has it
+            self.__road_graph = dataclasses.replace(
+                graph,
+                reachability=ReachabilityIndex.from_segments(
+                    graph.offsets, graph.targets
+                ),
+            )
+
+            if Config.USE_CONTRACTION_HIERARCHY:
+                self.__road_graph = dataclasses.replace(
+                    self.__road_graph,
+                    hierarchy=ContractionHierarchyService.instance().get_hierarchy(
+                        map, self.__road_graph
+                    ),
+                )
+
+            if Config.USE_LANDMARKS:
+                self.__road_graph = dataclasses.replace(
+                    self.__road_graph,
+                    landmarks=LandmarkService.instance().get_landmarks(
+                        map, self.__road_graph
+                    ),
+                )
+
+        return self.__road_graph
+
+    def __on_map_change(self, map: Optional[Map]) -> None:
+        """Drop the road graph when another map is published.
+
+        Args:
+            map (Optional[Map]): New map
+
+        Returns:
+            None
+        """
+        if map is not self.__map:
+            self.__map = None
+            self.__road_graph = None
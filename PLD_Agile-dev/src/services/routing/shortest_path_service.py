@@ -0,0 +1,398 @@
+import math
+from heapq import heappop, heappush
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.map import RoadGraph
+from src.services.routing.contraction_hierarchy_service import (
+    ContractionHierarchyService,
+)
+from src.services.singleton import Singleton
+
+
+class ShortestPathService(Singleton):
+    EARTH_RADIUS = 6371008.8
+    """Mean radius of the Earth in meters, the unit of the lengths of the segments
+    """
+
+    HEURISTIC_MARGIN = 1e-6
+    """Relative margin removed from the straight-line lower bound, so that rounding errors never make it overestimate a
+    distance
+    """
+
+    __adjacency_graph: Optional[RoadGraph]
+    __adjacency: Tuple[List[int], List[int], List[float], List[int]]
+    __heuristic_graph: Optional[RoadGraph]
+    __heuristic: Tuple[float, List[float], List[float], List[float]]
+
+    def __init__(self) -> None:
+        self.__adjacency_graph = None
+        self.__adjacency = ([], [], [], [])
+        self.__heuristic_graph = None
+        self.__heuristic = (0.0, [], [], [])
+
+    def compute_shortest_paths(
+        self, graph: RoadGraph, source: int, targets: Iterable[int]
+    ) -> Tuple[Dict[int, float], Dict[int, Optional[int]]]:
+        """Compute the shortest paths from a source to many targets with a single Dijkstra search.
+
+        The search stops as soon as every target is settled instead of exploring the whole graph. A search for a single
+        target is done with compute_shortest_path, which goes towards the target instead of around the source. When the
+        graph has a contraction hierarchy, the search is done in it instead. When the graph has a reachability index,
+        the targets that cannot be reached are left out without searching.
+
+        Args:
+            graph (RoadGraph): Graph to search in
+            source (int): ID of the source intersection
+            targets (Iterable[int]): IDs of the target intersections
+
+        Returns:
+            Tuple[Dict[int, float], Dict[int, Optional[int]]]: Lengths of the shortest paths to the reachable targets and
+            predecessor of every intersection reached by the search (None for the source)
+        """
+        targets = list(targets)
+        if graph.reachability is not None:
+            targets = [
+                target
+                for target in targets
+                if target in graph.indexes
+                and graph.reachability.can_reach(
+                    graph.indexes[source], graph.indexes[target]
+                )
+            ]
+            if not targets:
+                return {}, {source: None}
+
+        if len(targets) == 1:
+            return self.compute_shortest_path(graph, source, targets[0])
+
+        if graph.hierarchy is not None:
+            return self.__search_hierarchy(graph, source, targets)
+
+        offsets, neighbours, lengths, ids = self.__get_adjacency(graph)
+
+        source_index = graph.indexes[source]
+        remaining = {
+            graph.indexes[target] for target in targets if target in graph.indexes
+        }
+        target_lengths: Dict[int, float] = {}
+        distances: Dict[int, float] = {source_index: 0}
+        predecessors: Dict[int, int] = {source_index: -1}
+        settled = set()
+        queue = [(0, source_index)]
+
+        while queue and remaining:
+            distance, node = heappop(queue)
+
+            if node in settled:
+                continue
+            settled.add(node)
+
+            if node in remaining:
+                remaining.remove(node)
+                target_lengths[ids[node]] = distance
+
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbour = neighbours[edge]
+                neighbour_distance = distance + lengths[edge]
+
+                if neighbour_distance < distances.get(neighbour, float("inf")):
+                    distances[neighbour] = neighbour_distance
+                    predecessors[neighbour] = node
+                    heappush(queue, (neighbour_distance, neighbour))
+
+        return target_lengths, {
+            ids[node]: ids[predecessor] if predecessor >= 0 else None
+            for node, predecessor in predecessors.items()
+        }
+
+    def compute_shortest_path(
+        self, graph: RoadGraph, source: int, target: int
+    ) -> Tuple[Dict[int, float], Dict[int, Optional[int]]]:
+        """Compute the shortest path from a source to a single target with an A* search.
+
+        The search is guided by the great-circle distance to the target, scaled down so that it never exceeds the length
+        of a path: the scale is the smallest ratio between the length of a segment of the graph and the straight-line
+        distance between its intersections. When no segment gives a positive scale, for example when the intersections
+        have no coordinates, the estimate is zero and the search is a Dijkstra search. When the graph has a landmark
+        index, the estimate is the lower bound given by the landmarks instead, which is much closer to the length of the
+        path. When the graph has a contraction hierarchy, the search is done in it instead. When the graph has a
+        reachability index and the target cannot be reached, nothing is searched.
+
+        Args:
+            graph (RoadGraph): Graph to search in
+            source (int): ID of the source intersection
+            target (int): ID of the target intersection
+
+        Returns:
+            Tuple[Dict[int, float], Dict[int, Optional[int]]]: Length of the shortest path to the target if it is
+            reachable and predecessor of every intersection reached by the search (None for the source)
+        """
+        if target not in graph.indexes or (
+            graph.reachability is not None
+            and not graph.reachability.can_reach(
+                graph.indexes[source], graph.indexes[target]
+            )
+        ):
+            return {}, {source: None}
+
+        if graph.hierarchy is not None:
+            return self.__search_hierarchy(graph, source, [target])
+
+        offsets, neighbours, lengths, ids = self.__get_adjacency(graph)
+        scale, latitudes, longitudes, latitude_cosines = self.__get_heuristic(graph)
+
+        source_index = graph.indexes[source]
+        target_index = graph.indexes[target]
+        target_latitude = latitudes[target_index]
+        target_longitude = longitudes[target_index]
+        target_latitude_cosine = latitude_cosines[target_index]
+
+        def estimate_great_circle_length(node: int) -> float:
+            # Haversine formula
+            return scale * math.asin(
+                min(
+                    1.0,
+                    math.sqrt(
+                        math.sin((latitudes[node] - target_latitude) / 2) ** 2
+                        + latitude_cosines[node]
+                        * target_latitude_cosine
+                        * math.sin((longitudes[node] - target_longitude) / 2) ** 2
+                    ),
+                )
+            )
+
+        estimate: Callable[[int], float] = estimate_great_circle_length
+        if graph.landmarks is not None:
+            # The bounds to the target are computed at once for every intersection, with the same margin against
+            # rounding errors
+            lower_bounds = graph.landmarks.get_lower_bounds(target_index) * (
+                1 - self.HEURISTIC_MARGIN
+            )
+            estimate = lower_bounds.tolist().__getitem__
+
+        target_lengths: Dict[int, float] = {}
+        distances: Dict[int, float] = {source_index: 0}
+        predecessors: Dict[int, int] = {source_index: -1}
+        settled = set()
+        queue = [(estimate(source_index), 0, source_index)]
+
+        while queue:
+            _, distance, node = heappop(queue)
+
+            if node in settled:
+                continue
+            settled.add(node)
+
+            if node == target_index:
+                target_lengths[target] = distance
+                break
+
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbour = neighbours[edge]
+                neighbour_distance = distance + lengths[edge]
+
+                if neighbour_distance < distances.get(neighbour, float("inf")):
+                    distances[neighbour] = neighbour_distance
+                    predecessors[neighbour] = node
+                    heappush(
+                        queue,
+                        (
+                            neighbour_distance + estimate(neighbour),
+                            neighbour_distance,
+                            neighbour,
+                        ),
+                    )
+
+        return target_lengths, {
+            ids[node]: ids[predecessor] if predecessor >= 0 else None
+            for node, predecessor in predecessors.items()
+        }
+
+    def compute_shortest_path_tree(
+        self, graph: RoadGraph, source_index: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute the shortest paths from a source to every intersection of a graph, with the first intersection of
+        each path after the source.
+
+        Args:
+            graph (RoadGraph): Graph to search in
+            source_index (int): Index of the source intersection in the graph
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Length of the shortest path to each intersection, infinite if it cannot be
+            reached, and index of the first intersection of the path after the source, -1 for the source and the
+            intersections that cannot be reached
+        """
+        offsets, neighbours, lengths, _ = self.__get_adjacency(graph)
+
+        distances = [float("inf")] * (len(offsets) - 1)
+        first_hops = [-1] * len(distances)
+        distances[source_index] = 0
+        settled = [False] * len(distances)
+        queue = [(0, source_index)]
+
+        while queue:
+            distance, node = heappop(queue)
+
+            if settled[node]:
+                continue
+            settled[node] = True
+
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbour = neighbours[edge]
+                neighbour_distance = distance + lengths[edge]
+
+                if neighbour_distance < distances[neighbour]:
+                    distances[neighbour] = neighbour_distance
+                    first_hops[neighbour] = (
+                        neighbour if node == source_index else first_hops[node]
+                    )
+                    heappush(queue, (neighbour_distance, neighbour))
+
+        return np.array(distances), np.array(first_hops)
+
+    def build_path(
+        self, predecessors: Dict[int, Optional[int]], target: int
+    ) -> List[int]:
+        """Build the path from the source of a search to a target using the predecessor tree of the search.
+
+        Args:
+            predecessors (Dict[int, Optional[int]]): Predecessor tree returned by compute_shortest_paths
+            target (int): ID of an intersection reached by the search
+
+        Returns:
+            List[int]: IDs of the intersections of the path, from the source to the target
+        """
+        path = [target]
+
+        while predecessors[path[-1]] is not None:
+            path.append(predecessors[path[-1]])
+
+        return path[::-1]
+
+    def __search_hierarchy(
+        self, graph: RoadGraph, source: int, targets: List[int]
+    ) -> Tuple[Dict[int, float], Dict[int, Optional[int]]]:
+        """Compute the shortest paths from a source to many targets in the contraction hierarchy of a graph.
+
+        Args:
+            graph (RoadGraph): Graph with a contraction hierarchy
+            source (int): ID of the source intersection
+            targets (List[int]): IDs of the target intersections
+
+        Returns:
+            Tuple[Dict[int, float], Dict[int, Optional[int]]]: Lengths of the shortest paths to the reachable targets and
+            predecessor of every intersection of these paths (None for the source)
+        """
+        hierarchy_service = ContractionHierarchyService.instance()
+        source_index = graph.indexes[source]
+        target_indexes = [
+            graph.indexes[target] for target in targets if target in graph.indexes
+        ]
+
+        if len(target_indexes) == 1:
+            length, path = hierarchy_service.compute_shortest_path(
+                graph.hierarchy, source_index, target_indexes[0]
+            )
+            results = {target_indexes[0]: (length, path)} if path else {}
+        else:
+            results = hierarchy_service.compute_shortest_paths(
+                graph.hierarchy, source_index, target_indexes
+            )
+
+        _, _, _, ids = self.__get_adjacency(graph)
+        target_lengths: Dict[int, float] = {}
+        predecessors: Dict[int, Optional[int]] = {source: None}
+
+        for target_index, (length, path) in results.items():
+            target_lengths[ids[target_index]] = length
+
+            # The first path found to an intersection is kept, so that the predecessors always lead back to the source
+            for previous_node, node in zip(path, path[1:]):
+                predecessors.setdefault(ids[node], ids[previous_node])
+
+        return target_lengths, predecessors
+
+    def __get_heuristic(
+        self, graph: RoadGraph
+    ) -> Tuple[float, List[float], List[float], List[float]]:
+        """Get what the A* search needs to estimate the distance between two intersections of a graph, computed once
+        per graph.
+
+        The estimate is the great-circle distance multiplied by a scale, which is the smallest ratio between the length
+        of a segment and the great-circle distance between its intersections. The estimate is then never longer than
+        a segment, and therefore never longer than a path (it is admissible and consistent).
+
+        Args:
+            graph (RoadGraph): Graph to get the estimate of
+
+        Returns:
+            Tuple[float, List[float], List[float], List[float]]: Scale multiplied by the diameter of the Earth, zero if
+            no segment gives a positive scale, latitudes and longitudes in radians and cosines of the latitudes of the
+            intersections
+        """
+        if graph is not self.__heuristic_graph:
+            latitudes = np.radians(graph.latitudes)
+            longitudes = np.radians(graph.longitudes)
+            origins = np.repeat(
+                np.arange(graph.intersection_count), np.diff(graph.offsets)
+            )
+            origin_latitudes = latitudes[origins]
+            target_latitudes = latitudes[graph.targets]
+            # Haversine formula
+            squared_half_chords = (
+                np.sin((target_latitudes - origin_latitudes) / 2) ** 2
+                + np.cos(origin_latitudes)
+                * np.cos(target_latitudes)
+                * np.sin((longitudes[graph.targets] - longitudes[origins]) / 2) ** 2
+            )
+            straight_lengths = (
+                2
+                * self.EARTH_RADIUS
+                * np.arcsin(np.sqrt(np.minimum(squared_half_chords, 1.0)))
+            )
+            is_measured = straight_lengths > 0
+            scale = (
+                np.min(graph.lengths[is_measured] / straight_lengths[is_measured])
+                if is_measured.any()
+                else 0.0
+            )
+
+            self.__heuristic_graph = graph
+            self.__heuristic = (
+                max(float(scale), 0.0)
+                * (1 - self.HEURISTIC_MARGIN)
+                * 2
+                * self.EARTH_RADIUS,
+                latitudes.tolist(),
+                longitudes.tolist(),
+                np.cos(latitudes).tolist(),
+            )
+
+        return self.__heuristic
+
+    def __get_adjacency(
+        self, graph: RoadGraph
+    ) -> Tuple[List[int], List[int], List[float], List[int]]:
+        """Get the arrays of a graph as Python lists, which are faster to read one element at a time.
+
+        The lists are kept for the last graph used.
+
+        Args:
+            graph (RoadGraph): Graph to get the arrays of
+
+        Returns:
+            Tuple[List[int], List[int], List[float], List[int]]: Offsets, targets, lengths and intersection IDs
+        """
+        if graph is not self.__adjacency_graph:
+            self.__adjacency_graph = graph
+            self.__adjacency = (
+                graph.offsets.tolist(),
+                graph.targets.tolist(),
+                graph.lengths.tolist(),
+                graph.intersection_ids.tolist(),
+            )
+
+        return self.__adjacency
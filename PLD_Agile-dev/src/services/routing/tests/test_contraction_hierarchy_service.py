@@ -0,0 +1,156 @@
+import dataclasses
+import os
+from random import Random
+
+import numpy as np
+from pytest import fixture
+
+from src.config import Config
+from src.models.map import Intersection, Map, RoadGraph
+from src.models.map.tests.map_factory import create_map
+from src.services.routing.contraction_hierarchy_service import (
+    ContractionHierarchyService,
+)
+from src.services.routing.shortest_path_service import ShortestPathService
+
+
+def create_grid_map(size: int = 8, seed: int = 0) -> Map:
+    # Grid of streets of random lengths, some of them one-way
+    random = Random(seed)
+    intersections = {
+        id: Intersection(id % size, id // size, id) for id in range(size * size)
+    }
+    segments = []
+
+    for id in intersections:
+        for neighbour in [id + 1 if id % size < size - 1 else -1, id + size]:
+            if neighbour not in intersections:
+                continue
+
+            length = random.uniform(1, 10)
+            directions = random.choice(
+                [
+                    [(id, neighbour)],
+                    [(neighbour, id)],
+                    [(id, neighbour), (neighbour, id)],
+                ]
+            )
+            segments.extend(
+                (origin, destination, length) for origin, destination in directions
+            )
+
+    return create_map(segments, intersections, warehouse_id=0)
+
+
+class TestContractionHierarchyService:
+    service: ContractionHierarchyService
+    graph: RoadGraph
+
+    @fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            Config, "CONTRACTION_HIERARCHY_DIRECTORY", os.path.join(tmp_path, "ch")
+        )
+        self.service = ContractionHierarchyService.instance()
+        self.graph = RoadGraph.from_map(create_grid_map())
+
+        yield
+
+        ContractionHierarchyService.reset()
+        ShortestPathService.reset()
+
+    def get_path_length(self, path):
+        return sum(
+            min(
+                self.graph.lengths[edge]
+                for edge in range(
+                    self.graph.offsets[origin], self.graph.offsets[origin + 1]
+                )
+                if self.graph.targets[edge] == destination
+            )
+            for origin, destination in zip(path, path[1:])
+        )
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_rank_every_intersection_once(self):
+        hierarchy = self.service.build_hierarchy(self.graph)
+
+        assert sorted(hierarchy.ranks.tolist()) == list(
+            range(self.graph.intersection_count)
+        )
+
+    def test_should_compute_same_lengths_as_dijkstra(self):
+        hierarchy = self.service.build_hierarchy(self.graph)
+
+        for source in range(self.graph.intersection_count):
+            expected, _ = ShortestPathService.instance().compute_shortest_path_tree(
+                self.graph, source
+            )
+
+            for target in range(self.graph.intersection_count):
+                length, path = self.service.compute_shortest_path(
+                    hierarchy, source, target
+                )
+
+                assert np.isclose(length, expected[target])
+                assert len(path) > 0 or length == float("inf")
+
+    def test_should_unpack_paths_into_segments(self):
+        hierarchy = self.service.build_hierarchy(self.graph)
+
+        length, path = self.service.compute_shortest_path(hierarchy, 0, 63)
+
+        assert path[0] == 0
+        assert path[-1] == 63
+        assert np.isclose(self.get_path_length(path), length)
+
+    def test_should_compute_paths_to_many_targets(self):
+        hierarchy = self.service.build_hierarchy(self.graph)
+        targets = [5, 18, 40, 63]
+
+        results = self.service.compute_shortest_paths(hierarchy, 7, targets)
+
+        for target in targets:
+            length, path = self.service.compute_shortest_path(hierarchy, 7, target)
+            assert np.isclose(results[target][0], length)
+            assert np.isclose(self.get_path_length(results[target][1]), length)
+
+    def test_should_return_source_when_it_is_the_target(self):
+        hierarchy = self.service.build_hierarchy(self.graph)
+
+        assert self.service.compute_shortest_path(hierarchy, 3, 3) == (0.0, [3])
+
+    def test_should_compute_paths_in_reversed_graph(self):
+        hierarchy = self.service.build_hierarchy(self.graph)
+        reversed_graph = dataclasses.replace(self.graph, hierarchy=hierarchy).reverse()
+
+        length, path = self.service.compute_shortest_path(
+            reversed_graph.hierarchy, 63, 0
+        )
+
+        assert np.isclose(
+            length, self.service.compute_shortest_path(hierarchy, 0, 63)[0]
+        )
+        assert path[::-1] == self.service.compute_shortest_path(hierarchy, 0, 63)[1]
+
+    def test_should_keep_hierarchy_of_map_loaded_from_file(self):
+        map = create_grid_map()
+        map.content_hash = "map"
+
+        hierarchy = self.service.get_hierarchy(map, self.graph)
+        loaded_hierarchy = self.service.get_hierarchy(map, self.graph)
+
+        assert os.path.exists(
+            os.path.join(Config.CONTRACTION_HIERARCHY_DIRECTORY, "map-hierarchy.npz")
+        )
+        for field in dataclasses.fields(hierarchy):
+            assert np.array_equal(
+                getattr(loaded_hierarchy, field.name), getattr(hierarchy, field.name)
+            )
+
+    def test_should_not_keep_hierarchy_of_other_maps(self):
+        self.service.get_hierarchy(create_grid_map(), self.graph)
+
+        assert not os.path.exists(Config.CONTRACTION_HIERARCHY_DIRECTORY)
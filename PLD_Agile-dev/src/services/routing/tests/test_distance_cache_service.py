@@ -0,0 +1,172 @@
+import os
+
+from pytest import fixture
+
+from src.config import Config
+from src.models.map import Intersection, Map, RoadGraph
+from src.models.map.tests.map_factory import create_map
+from src.services.map.map_service import MapService
+from src.services.routing.distance_cache_service import DistanceCacheService
+from src.services.routing.distance_store_service import DistanceStoreService
+from src.services.routing.road_graph_service import RoadGraphService
+from src.services.routing.shortest_path_service import ShortestPathService
+
+
+class TestDistanceCacheService:
+    service: DistanceCacheService
+    map: Map
+    graph: RoadGraph
+
+    @fixture(autouse=True)
+    def setup(self):
+        self.service = DistanceCacheService.instance()
+
+        intersections = {id: Intersection(0, 0, id) for id in range(1, 5)}
+        self.map = create_map(
+            [
+                (1, 2, 1.0),
+                (2, 3, 1.5),
+                (3, 1, 2.0),
+                (1, 3, 4.0),
+            ],
+            intersections,
+        )
+        self.graph = RoadGraph.from_map(self.map)
+
+        yield
+
+        DistanceCacheService.reset()
+        MapService.reset()
+
+    def count_searches(self, monkeypatch) -> list:
+        searches = []
+        compute_shortest_paths = ShortestPathService.instance().compute_shortest_paths
+
+        def spy(graph, source, targets):
+            searches.append((source, list(targets)))
+            return compute_shortest_paths(graph, source, targets)
+
+        monkeypatch.setattr(
+            ShortestPathService.instance(), "compute_shortest_paths", spy
+        )
+
+        return searches
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_compute_shortest_paths(self):
+        lengths, paths = self.service.get_shortest_paths(self.graph, 1, [2, 3])
+
+        assert lengths == {2: 1.0, 3: 2.5}
+        assert paths == {2: [1, 2], 3: [1, 2, 3]}
+
+    def test_should_only_compute_missing_targets(self, monkeypatch):
+        searches = self.count_searches(monkeypatch)
+
+        self.service.get_shortest_paths(self.graph, 1, [2])
+        lengths, _ = self.service.get_shortest_paths(self.graph, 1, [2, 3])
+        self.service.get_shortest_paths(self.graph, 1, [3, 2])
+
+        assert searches == [(1, [2]), (1, [3])]
+        assert lengths == {2: 1.0, 3: 2.5}
+
+    def test_should_cache_unreachable_targets(self, monkeypatch):
+        searches = self.count_searches(monkeypatch)
+
+        self.service.get_shortest_paths(self.graph, 1, [4])
+        lengths, paths = self.service.get_shortest_paths(self.graph, 1, [4])
+
+        assert searches == [(1, [4])]
+        assert lengths == {}
+        assert paths == {}
+
+    def test_should_add_shortest_paths(self):
+        self.service.add_shortest_paths(self.graph, 1, [2, 4], {2: 1.0}, {2: [1, 2]})
+
+        assert self.service.get_missing_targets(self.graph, 1, [2, 3, 4]) == [3]
+        assert self.service.get_cached_shortest_paths(self.graph, 1, [2, 4]) == (
+            {2: 1.0},
+            {2: [1, 2]},
+        )
+
+    def test_should_compute_backward_shortest_paths(self):
+        self.service.compute_backward_shortest_paths(self.graph, 3, [1, 2, 4])
+
+        assert self.service.get_missing_targets(self.graph, 4, [3]) == []
+        assert self.service.get_cached_shortest_paths(self.graph, 1, [3]) == (
+            {3: 2.5},
+            {3: [1, 2, 3]},
+        )
+        assert self.service.get_cached_shortest_paths(self.graph, 2, [3]) == (
+            {3: 1.5},
+            {3: [2, 3]},
+        )
+
+    def test_should_search_new_row_and_column(self):
+        self.service.compute_missing_shortest_paths(self.graph, {1: [2], 2: [1]})
+
+        forward_searches, backward_searches = self.service.get_missing_searches(
+            self.graph, {1: [2, 3], 2: [1, 3], 3: [1, 2]}
+        )
+
+        assert forward_searches == {3: [1, 2]}
+        assert backward_searches == {3: [1, 2]}
+
+    def test_should_compute_missing_shortest_paths(self, monkeypatch):
+        self.service.compute_missing_shortest_paths(self.graph, {1: [2], 2: [1]})
+        searches = self.count_searches(monkeypatch)
+
+        self.service.compute_missing_shortest_paths(
+            self.graph, {1: [2, 3], 2: [1, 3], 3: [1, 2]}
+        )
+
+        assert len(searches) == 2
+        assert self.service.get_cached_shortest_paths(self.graph, 2, [1, 3]) == (
+            {1: 3.5, 3: 1.5},
+            {1: [2, 3, 1], 3: [2, 3]},
+        )
+
+    def test_should_clear_when_graph_changes(self):
+        self.service.get_shortest_paths(self.graph, 1, [2])
+
+        assert self.service.get_missing_targets(
+            RoadGraph.from_map(self.map), 1, [2]
+        ) == [2]
+
+    def test_should_clear_when_map_changes(self):
+        self.service.get_shortest_paths(self.graph, 1, [2])
+
+        MapService.instance().set_map(self.map)
+
+        assert self.service.get_missing_targets(self.graph, 1, [2]) == [2]
+
+    def test_should_read_shortest_paths_of_previous_sessions(
+        self, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(
+            Config, "DISTANCE_STORE_PATH", os.path.join(tmp_path, "distances.sqlite3")
+        )
+        self.map.content_hash = "map"
+        MapService.instance().set_map(self.map)
+        graph = RoadGraphService.instance().get_road_graph(self.map)
+        self.service.get_shortest_paths(graph, 1, [2, 3])
+
+        # New session
+        DistanceStoreService.instance().close()
+        DistanceStoreService.reset()
+        DistanceCacheService.reset()
+        MapService.instance().set_map(self.map)
+        searches = self.count_searches(monkeypatch)
+
+        lengths, paths = DistanceCacheService.instance().get_shortest_paths(
+            graph, 1, [2, 3]
+        )
+
+        assert searches == []
+        assert lengths == {2: 1.0, 3: 2.5}
+        assert paths == {2: [1, 2], 3: [1, 2, 3]}
+
+        DistanceStoreService.instance().close()
+        DistanceStoreService.reset()
+        RoadGraphService.reset()
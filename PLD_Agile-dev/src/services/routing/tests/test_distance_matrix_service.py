@@ -0,0 +1,93 @@
+import os
+
+from pytest import fixture, raises
+
+from src.config import Config
+from src.models.map import Intersection, Map
+from src.models.map.tests.map_factory import create_map
+from src.services.map.map_service import MapService
+from src.services.routing.distance_cache_service import DistanceCacheService
+from src.services.routing.distance_matrix_service import DistanceMatrixService
+from src.services.routing.road_graph_service import RoadGraphService
+from src.services.routing.shortest_path_service import ShortestPathService
+
+
+class TestDistanceMatrixService:
+    service: DistanceMatrixService
+    map: Map
+
+    @fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            Config, "DISTANCE_MATRIX_DIRECTORY", os.path.join(tmp_path, "matrices")
+        )
+        monkeypatch.setattr(Config, "DISTANCE_STORE_PATH", None)
+        self.service = DistanceMatrixService.instance()
+
+        intersections = {id: Intersection(0, 0, id) for id in range(1, 5)}
+        self.map = create_map(
+            [
+                (1, 2, 1.0),
+                (2, 3, 1.5),
+                (3, 1, 2.0),
+                (1, 3, 4.0),
+            ],
+            intersections,
+            content_hash="map",
+        )
+
+        yield
+
+        DistanceMatrixService.reset()
+        DistanceCacheService.reset()
+        RoadGraphService.reset()
+        MapService.reset()
+
+    def precompute_matrices(self) -> None:
+        graph = RoadGraphService.instance().get_road_graph(self.map)
+        paths = self.service.create_matrix_files(self.map)
+        self.service.compute_rows(graph, *paths, 0, 2)
+        self.service.compute_rows(graph, *paths, 2, 4)
+        self.service.save_matrix_files(self.map, *paths)
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_not_have_matrices_before_precomputing(self):
+        graph = RoadGraphService.instance().get_road_graph(self.map)
+
+        assert not self.service.has_matrices(self.map)
+        assert self.service.get_shortest_paths("map", graph, 1, [3]) == ({}, {})
+
+    def test_should_only_precompute_maps_loaded_from_files(self):
+        self.map.content_hash = None
+
+        with raises(ValueError):
+            self.service.create_matrix_files(self.map)
+
+    def test_should_read_precomputed_shortest_paths(self):
+        self.precompute_matrices()
+        graph = RoadGraphService.instance().get_road_graph(self.map)
+
+        lengths, paths = self.service.get_shortest_paths("map", graph, 2, [1, 3, 4])
+
+        assert self.service.has_matrices(self.map)
+        assert lengths == {1: 3.5, 3: 1.5, 4: float("inf")}
+        assert paths == {1: [2, 3, 1], 3: [2, 3]}
+
+    def test_should_answer_distance_cache_without_search(self, monkeypatch):
+        self.precompute_matrices()
+        MapService.instance().set_map(self.map)
+        graph = RoadGraphService.instance().get_road_graph(self.map)
+
+        def fail(*args):
+            raise AssertionError("Shortest paths should not be computed")
+
+        monkeypatch.setattr(
+            ShortestPathService.instance(), "compute_shortest_paths", fail
+        )
+
+        assert DistanceCacheService.instance().get_shortest_paths(graph, 1, [3]) == (
+            {3: 2.5},
+            {3: [1, 2, 3]},
+        )
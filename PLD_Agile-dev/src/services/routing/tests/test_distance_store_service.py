@@ -0,0 +1,76 @@
+import os
+
+from pytest import fixture
+
+from src.config import Config
+from src.services.routing.distance_store_service import DistanceStoreService
+
+
+class TestDistanceStoreService:
+    service: DistanceStoreService
+
+    @fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            Config, "DISTANCE_STORE_PATH", os.path.join(tmp_path, "distances.sqlite3")
+        )
+        self.service = DistanceStoreService.instance()
+
+        yield
+
+        self.service.close()
+        DistanceStoreService.reset()
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_return_stored_shortest_paths(self):
+        self.service.add_shortest_paths(
+            "map", 1, [2, 3, 4], {2: 1.0, 3: 2.5}, {2: [1, 2], 3: [1, 2, 3]}
+        )
+
+        lengths, paths = self.service.get_shortest_paths("map", 1, [2, 3, 4, 5])
+
+        assert lengths == {2: 1.0, 3: 2.5, 4: float("inf")}
+        assert paths == {2: [1, 2], 3: [1, 2, 3]}
+
+    def test_should_separate_maps(self):
+        self.service.add_shortest_paths("map", 1, [2], {2: 1.0}, {2: [1, 2]})
+
+        assert self.service.get_shortest_paths("other map", 1, [2]) == ({}, {})
+
+    def test_should_keep_shortest_paths_between_sessions(self):
+        self.service.add_shortest_paths("map", 1, [2], {2: 1.0}, {2: [1, 2]})
+        self.service.close()
+        DistanceStoreService.reset()
+
+        lengths, paths = DistanceStoreService.instance().get_shortest_paths(
+            "map", 1, [2]
+        )
+
+        assert lengths == {2: 1.0}
+        assert paths == {2: [1, 2]}
+
+    def test_should_drop_least_recently_used_shortest_paths(self, monkeypatch):
+        monkeypatch.setattr(Config, "DISTANCE_STORE_SIZE", 10)
+        times = iter(range(100))
+        monkeypatch.setattr("time.time", lambda: next(times))
+
+        for target in range(2, 12):
+            self.service.add_shortest_paths(
+                "map", 1, [target], {target: 1.0}, {target: [1, target]}
+            )
+        self.service.get_shortest_paths("map", 1, [2])
+        self.service.add_shortest_paths("map", 1, [12], {12: 1.0}, {12: [1, 12]})
+
+        lengths, _ = self.service.get_shortest_paths("map", 1, range(2, 13))
+
+        # The store is emptied down to 90% of its size, the oldest paths first
+        assert sorted(lengths) == [2, *range(5, 13)]
+
+    def test_should_be_disabled_without_path(self, monkeypatch):
+        monkeypatch.setattr(Config, "DISTANCE_STORE_PATH", None)
+
+        self.service.add_shortest_paths("map", 1, [2], {2: 1.0}, {2: [1, 2]})
+
+        assert self.service.get_shortest_paths("map", 1, [2]) == ({}, {})
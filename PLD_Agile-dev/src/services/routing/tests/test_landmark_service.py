@@ -0,0 +1,152 @@
+import dataclasses
+import os
+from random import Random
+
+import numpy as np
+from pytest import fixture
+
+from src.config import Config
+from src.models.map import Intersection, Map, RoadGraph
+from src.models.map.tests.map_factory import create_map
+from src.services.routing.landmark_service import LandmarkService
+from src.services.routing.shortest_path_service import ShortestPathService
+
+
+def create_grid_map(size: int = 6, seed: int = 0) -> Map:
+    # Grid of streets of random lengths, some of them one-way
+    random = Random(seed)
+    intersections = {
+        id: Intersection(0.001 * (id % size), 45 + 0.001 * (id // size), id)
+        for id in range(size * size)
+    }
+    segments = []
+
+    for id in intersections:
+        for neighbour in [id + 1 if id % size < size - 1 else -1, id + size]:
+            if neighbour not in intersections:
+                continue
+
+            length = random.uniform(100, 200)
+            directions = random.choice(
+                [
+                    [(id, neighbour)],
+                    [(neighbour, id)],
+                    [(id, neighbour), (neighbour, id)],
+                ]
+            )
+            segments.extend(
+                (origin, destination, length) for origin, destination in directions
+            )
+
+    return create_map(segments, intersections, warehouse_id=0)
+
+
+class TestLandmarkService:
+    service: LandmarkService
+    graph: RoadGraph
+
+    @fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            Config, "LANDMARK_DIRECTORY", os.path.join(tmp_path, "landmarks")
+        )
+        monkeypatch.setattr(LandmarkService, "LANDMARK_COUNT", 4)
+        self.service = LandmarkService.instance()
+        self.graph = RoadGraph.from_map(create_grid_map())
+
+        yield
+
+        LandmarkService.reset()
+        ShortestPathService.reset()
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_choose_distinct_landmarks(self):
+        landmarks = self.service.build_landmarks(self.graph)
+
+        assert len(set(landmarks.landmarks.tolist())) == 4
+        assert landmarks.lengths_from.shape == (4, self.graph.intersection_count)
+        assert landmarks.lengths_to.shape == (4, self.graph.intersection_count)
+
+    def test_should_never_exceed_shortest_path_lengths(self):
+        graph = dataclasses.replace(
+            self.graph, landmarks=self.service.build_landmarks(self.graph)
+        )
+        ids = graph.intersection_ids.tolist()
+
+        for source_index, source in enumerate(ids):
+            lengths, _ = ShortestPathService.instance().compute_shortest_path_tree(
+                graph, source_index
+            )
+
+            for target_index, target in enumerate(ids):
+                bound = self.service.get_lower_bound(graph, source, target)
+
+                assert bound <= lengths[target_index] * (1 + 1e-9)
+                assert np.isclose(
+                    graph.landmarks.get_lower_bounds(target_index)[source_index], bound
+                )
+
+    def test_should_give_exact_length_from_landmark(self):
+        landmarks = self.service.build_landmarks(self.graph)
+        graph = dataclasses.replace(self.graph, landmarks=landmarks)
+        landmark = int(landmarks.landmarks[0])
+        target = int(
+            np.argmax(
+                np.where(
+                    np.isfinite(landmarks.lengths_from[0]), landmarks.lengths_from[0], 0
+                )
+            )
+        )
+
+        assert np.isclose(
+            self.service.get_lower_bound(
+                graph, graph.intersection_ids[landmark], graph.intersection_ids[target]
+            ),
+            landmarks.lengths_from[0, target],
+        )
+
+    def test_should_give_no_bound_without_landmarks(self):
+        assert self.service.get_lower_bound(self.graph, 0, 35) == 0.0
+
+    def test_should_guide_search_with_landmarks(self):
+        graph = dataclasses.replace(
+            self.graph, landmarks=self.service.build_landmarks(self.graph)
+        )
+        shortest_path_service = ShortestPathService.instance()
+
+        for source, target in [(0, 35), (35, 0), (7, 29), (30, 5)]:
+            lengths, predecessors = shortest_path_service.compute_shortest_path(
+                graph, source, target
+            )
+            expected_lengths, _ = shortest_path_service.compute_shortest_path(
+                self.graph, source, target
+            )
+
+            assert lengths.keys() == expected_lengths.keys()
+            for target_id, length in lengths.items():
+                assert np.isclose(length, expected_lengths[target_id])
+                assert (
+                    shortest_path_service.build_path(predecessors, target)[0] == source
+                )
+
+    def test_should_keep_landmarks_of_map_loaded_from_file(self):
+        map = create_grid_map()
+        map.content_hash = "map"
+
+        landmarks = self.service.get_landmarks(map, self.graph)
+        loaded_landmarks = self.service.get_landmarks(map, self.graph)
+
+        assert os.path.exists(
+            os.path.join(Config.LANDMARK_DIRECTORY, "map-landmarks.npz")
+        )
+        for field in dataclasses.fields(landmarks):
+            assert np.array_equal(
+                getattr(loaded_landmarks, field.name), getattr(landmarks, field.name)
+            )
+
+    def test_should_not_keep_landmarks_of_other_maps(self):
+        self.service.get_landmarks(create_grid_map(), self.graph)
+
+        assert not os.path.exists(Config.LANDMARK_DIRECTORY)
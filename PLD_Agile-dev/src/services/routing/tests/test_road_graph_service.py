@@ -0,0 +1,72 @@
+from pytest import fixture
+
+from src.config import Config
+from src.models.map.tests.map_factory import create_map
+from src.services.map.map_service import MapService
+from src.services.routing.contraction_hierarchy_service import (
+    ContractionHierarchyService,
+)
+from src.services.routing.landmark_service import LandmarkService
+from src.services.routing.road_graph_service import RoadGraphService
+
+
+class TestRoadGraphService:
+    service: RoadGraphService
+
+    @fixture(autouse=True)
+    def setup(self):
+        self.service = RoadGraphService.instance()
+
+        yield
+
+        RoadGraphService.reset()
+        MapService.reset()
+        ContractionHierarchyService.reset()
+        LandmarkService.reset()
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_reuse_graph_of_same_map(self):
+        map = create_map([(1, 2, 1.0)])
+
+        assert self.service.get_road_graph(map) is self.service.get_road_graph(map)
+
+    def test_should_create_graph_of_other_map(self):
+        graph = self.service.get_road_graph(create_map([(1, 2, 1.0)]))
+
+        assert self.service.get_road_graph(create_map([(1, 2, 1.0)])) is not graph
+
+    def test_should_drop_graph_when_map_changes(self):
+        map = create_map([(1, 2, 1.0)])
+        graph = self.service.get_road_graph(map)
+
+        MapService.instance().set_map(create_map([(1, 2, 1.0)]))
+
+        assert self.service.get_road_graph(map) is not graph
+
+    def test_should_build_reachability_index(self):
+        graph = self.service.get_road_graph(create_map([(1, 2, 1.0)]))
+
+        assert graph.reachability is not None
+        assert graph.reachability.can_reach(0, 1)
+        assert not graph.reachability.can_reach(1, 0)
+
+    def test_should_not_build_contraction_hierarchy_by_default(self):
+        assert self.service.get_road_graph(create_map([(1, 2, 1.0)])).hierarchy is None
+
+    def test_should_build_contraction_hierarchy(self, monkeypatch):
+        monkeypatch.setattr(Config, "USE_CONTRACTION_HIERARCHY", True)
+
+        graph = self.service.get_road_graph(create_map([(1, 2, 1.0)]))
+
+        assert graph.hierarchy is not None
+        assert graph.hierarchy.ranks.shape == (2,)
+
+    def test_should_build_landmark_index(self, monkeypatch):
+        monkeypatch.setattr(Config, "USE_LANDMARKS", True)
+
+        graph = self.service.get_road_graph(create_map([(1, 2, 1.0)]))
+
+        assert graph.landmarks is not None
+        assert graph.hierarchy is None
@@ -0,0 +1,172 @@
+import dataclasses
+
+from pytest import fixture
+
+from src.models.map import Intersection, ReachabilityIndex, RoadGraph
+from src.models.map.tests.map_factory import create_road_graph
+from src.services.routing.contraction_hierarchy_service import (
+    ContractionHierarchyService,
+)
+from src.services.routing.shortest_path_service import ShortestPathService
+
+
+class TestShortestPathService:
+    service: ShortestPathService
+    graph: RoadGraph
+
+    @fixture(autouse=True)
+    def setup(self):
+        self.service = ShortestPathService.instance()
+
+        self.graph = create_road_graph(
+            [
+                (1, 2, 1.0),
+                (1, 3, 2.0),
+                (2, 3, 1.5),
+                (3, 4, 2.5),
+                (4, 5, 1.0),
+                (5, 4, 1.0),
+            ]
+        )
+
+        yield
+
+        ShortestPathService.reset()
+        ContractionHierarchyService.reset()
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_compute_lengths_to_all_targets(self):
+        lengths, _ = self.service.compute_shortest_paths(self.graph, 1, [2, 4])
+
+        assert lengths == {2: 1.0, 4: 4.5}
+
+    def test_should_build_paths_from_predecessors(self):
+        _, predecessors = self.service.compute_shortest_paths(self.graph, 1, [2, 4])
+
+        assert self.service.build_path(predecessors, 2) == [1, 2]
+        assert self.service.build_path(predecessors, 4) == [1, 3, 4]
+
+    def test_should_ignore_unreachable_targets(self):
+        lengths, _ = self.service.compute_shortest_paths(self.graph, 4, [1, 5])
+
+        assert lengths == {5: 1.0}
+
+    def test_should_stop_once_targets_are_settled(self):
+        _, predecessors = self.service.compute_shortest_paths(self.graph, 1, [2])
+
+        assert 5 not in predecessors
+
+    def test_should_return_source_when_it_is_a_target(self):
+        lengths, predecessors = self.service.compute_shortest_paths(self.graph, 1, [1])
+
+        assert lengths == {1: 0}
+        assert self.service.build_path(predecessors, 1) == [1]
+
+    def test_should_not_search_unreachable_targets(self):
+        graph = dataclasses.replace(
+            self.graph,
+            reachability=ReachabilityIndex.from_segments(
+                self.graph.offsets, self.graph.targets
+            ),
+        )
+
+        assert self.service.compute_shortest_paths(graph, 4, [1, 2]) == (
+            {},
+            {4: None},
+        )
+        assert self.service.compute_shortest_path(graph, 4, 1) == ({}, {4: None})
+
+    def test_should_search_reachable_targets_only(self):
+        graph = dataclasses.replace(
+            self.graph,
+            reachability=ReachabilityIndex.from_segments(
+                self.graph.offsets, self.graph.targets
+            ),
+        )
+
+        lengths, predecessors = self.service.compute_shortest_paths(graph, 3, [1, 5])
+
+        assert lengths == {5: 3.5}
+        assert self.service.build_path(predecessors, 5) == [3, 4, 5]
+
+    def test_should_compute_shortest_path_tree(self):
+        lengths, first_hops = self.service.compute_shortest_path_tree(self.graph, 0)
+
+        # Intersection 3 is reached directly, 4 and 5 through it
+        assert lengths.tolist() == [0.0, 1.0, 2.0, 4.5, 5.5]
+        assert first_hops.tolist() == [-1, 1, 2, 2, 2]
+
+    def test_should_not_reach_intersections_without_path(self):
+        lengths, first_hops = self.service.compute_shortest_path_tree(self.graph, 3)
+
+        assert lengths.tolist() == [float("inf")] * 3 + [0.0, 1.0]
+        assert first_hops.tolist() == [-1, -1, -1, -1, 4]
+
+    def create_street_graph(self, shortcut_length: float) -> RoadGraph:
+        # Intersections every 0.001 degree of longitude (about 79 meters) on a street going east from 0 and west from
+        # 10, with a shortcut from 0 to 5
+        intersections = {
+            id: Intersection(0.001 * (id if id <= 9 else 9 - id), 45, id)
+            for id in range(20)
+        }
+
+        return create_road_graph(
+            [(id, id + 1, 100.0) for id in range(9)]
+            + [(id + 1, id, 100.0) for id in range(9)]
+            + [(0, 10, 100.0)]
+            + [(id, id + 1, 100.0) for id in range(10, 19)]
+            + [(0, 5, shortcut_length)],
+            intersections,
+        )
+
+    def test_should_search_towards_single_target(self):
+        graph = self.create_street_graph(1000.0)
+
+        lengths, predecessors = self.service.compute_shortest_path(graph, 0, 9)
+
+        assert lengths == {9: 900.0}
+        assert self.service.build_path(predecessors, 9) == list(range(10))
+        # The street going west is not explored
+        assert 13 not in predecessors
+
+    def test_should_find_shortest_path_through_short_segments(self):
+        graph = self.create_street_graph(10.0)
+
+        lengths, predecessors = self.service.compute_shortest_path(graph, 0, 7)
+
+        assert lengths == {7: 210.0}
+        assert self.service.build_path(predecessors, 7) == [0, 5, 6, 7]
+
+    def test_should_search_without_coordinates(self):
+        lengths, predecessors = self.service.compute_shortest_path(self.graph, 1, 5)
+
+        assert lengths == {5: 5.5}
+        assert self.service.build_path(predecessors, 5) == [1, 3, 4, 5]
+
+    def test_should_search_contraction_hierarchy(self):
+        graph = dataclasses.replace(
+            self.graph,
+            hierarchy=ContractionHierarchyService.instance().build_hierarchy(
+                self.graph
+            ),
+        )
+
+        lengths, predecessors = self.service.compute_shortest_paths(graph, 1, [2, 5])
+
+        assert lengths == {2: 1.0, 5: 5.5}
+        assert self.service.build_path(predecessors, 2) == [1, 2]
+        assert self.service.build_path(predecessors, 5) == [1, 3, 4, 5]
+
+    def test_should_search_single_target_in_contraction_hierarchy(self):
+        graph = self.create_street_graph(10.0)
+        graph = dataclasses.replace(
+            graph,
+            hierarchy=ContractionHierarchyService.instance().build_hierarchy(graph),
+        )
+
+        lengths, predecessors = self.service.compute_shortest_path(graph, 0, 7)
+
+        assert lengths == {7: 210.0}
+        assert self.service.build_path(predecessors, 7) == [0, 5, 6, 7]
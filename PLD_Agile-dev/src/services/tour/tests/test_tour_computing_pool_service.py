@@ -0,0 +1,222 @@
+import time
+from uuid import uuid4
+
+import networkx as nx
+from pytest import fixture
+
+from src.models.map.intersection import Intersection
+from src.models.map.map import Map
+from src.models.map.map_size import MapSize
+from src.models.map.position import Position
+from src.models.map.segment import Segment
+from src.models.tour import DeliveryLocation, DeliveryRequest, TourRequest
+from src.services.map.map_service import MapService
+from src.services.routing.distance_cache_service import DistanceCacheService
+from src.services.tour.tour_computing_pool_service import TourComputingPoolService
+from src.services.tour.tour_computing_service import TourComputingService
+
+
+class TestTourComputingPoolService:
+    service: TourComputingPoolService
+    map: Map
+
+    @fixture(autouse=True)
+    def setup(self, monkeypatch):
+        monkeypatch.setattr(TourComputingPoolService, "MAX_WORKERS", 2)
+
+        intersections = [
+            Intersection(0, 0, 0),
+            Intersection(1, 2, 1),
+            Intersection(2, 2, 2),
+            Intersection(3, 3, 3),
+        ]
+
+        segments = {
+            0: {
+                1: Segment(100, "A", intersections[0], intersections[1], length=1),
+                2: Segment(104, "E", intersections[0], intersections[2], length=5),
+            },
+            1: {
+                2: Segment(106, "B", intersections[1], intersections[2], length=1),
+            },
+            2: {
+                0: Segment(104, "E", intersections[2], intersections[0], length=1),
+                3: Segment(107, "C", intersections[2], intersections[3], length=1),
+            },
+            3: {
+                2: Segment(107, "C", intersections[3], intersections[2], length=1),
+            },
+        }
+
+        self.map = Map(
+            intersections={
+                intersection.id: intersection for intersection in intersections
+            },
+            segments=segments,
+            warehouse=intersections[0],
+            size=MapSize(Position(0, 0), Position(3, 3)),
+        )
+        MapService.instance().set_map(self.map)
+
+        self.service = TourComputingPoolService.instance()
+
+        yield
+
+        self.service.shutdown()
+        TourComputingPoolService.reset()
+        MapService.reset()
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_compute_shortest_paths_in_workers(self):
+        lengths, paths = self.service.compute_shortest_paths(
+            self.map, 0, [2, 3]
+        ).result()
+
+        assert lengths == {2: 2, 3: 3}
+        assert paths == {2: [0, 1, 2], 3: [0, 1, 2, 3]}
+
+    def test_should_ignore_unreachable_targets(self):
+        lengths, paths = self.service.compute_shortest_paths(
+            self.map, 3, [1, 4]
+        ).result()
+
+        assert lengths == {1: 3}
+        assert paths == {1: [3, 2, 0, 1]}
+
+    def test_should_cancel_previous_computations(self):
+        first_computation = self.service.start_computation()
+        second_computation = self.service.start_computation()
+
+        assert TourComputingPoolService.is_computation_cancelled(first_computation)
+        assert not TourComputingPoolService.is_computation_cancelled(second_computation)
+        assert not TourComputingPoolService.is_computation_cancelled(None)
+
+        self.service.cancel_computations()
+
+        assert TourComputingPoolService.is_computation_cancelled(second_computation)
+
+    def test_should_report_progress_from_workers(self):
+        self.service.submit(
+            TourComputingPoolService.report_progress, 1, "tour", "result"
+        ).result()
+
+        progress = []
+        deadline = time.time() + 10
+        while not progress and time.time() < deadline:
+            progress = self.service.get_progress()
+
+        assert progress == [(1, "tour", "result")]
+
+    def test_should_solve_tsp_in_workers(self):
+        G = nx.DiGraph()
+        G.add_node(0, timewindow=8)
+        G.add_node(1, timewindow=8)
+        G.add_node(2, timewindow=10)
+        G.add_node(3, timewindow=11)
+
+        G.add_edge(0, 1, length=1.0, path=[0, 23, 56, 1])
+        G.add_edge(1, 0, length=2.0, path=[1, 12, 16, 0])
+        G.add_edge(0, 2, length=3.0, path=[0, 5, 33, 2])
+        G.add_edge(2, 0, length=4.0, path=[2, 42, 27, 0])
+        G.add_edge(1, 2, length=50.0, path=[1, 7, 6, 2])
+        G.add_edge(1, 3, length=5.0, path=[1, 9, 54, 2, 3])
+        G.add_edge(3, 1, length=6.0, path=[3, 54, 9, 1])
+        G.add_edge(3, 2, length=7.0, path=[3, 4, 19, 2])
+        G.add_edge(2, 3, length=8.0, path=[2, 4, 7, 3])
+        G.add_edge(3, 0, length=555.0, path=[3, 2, 99, 33, 0])
+
+        path = TourComputingService.instance().solve_tsp_parallel(G)
+
+        assert path.route == TourComputingService.instance().solve_tsp(G).route
+
+    def test_should_submit_tours(self):
+        tour_requests = [
+            TourRequest(
+                id=uuid4(),
+                deliveries={
+                    delivery.id: delivery
+                    for delivery in [
+                        DeliveryRequest(
+                            DeliveryLocation(self.map.segments[origin][destination], 0),
+                            8,
+                        )
+                        for origin, destination in segments
+                    ]
+                },
+                delivery_man=None,
+                color="",
+            )
+            for segments in [[(1, 2), (3, 2)], [(2, 3)]]
+        ]
+
+        futures = [
+            TourComputingService.instance().submit_tour(tour_request, self.map)
+            for tour_request in tour_requests
+        ]
+
+        for tour_request, future in zip(tour_requests, futures):
+            assert future.result() == TourComputingService.instance().compute_tour(
+                tour_request, self.map
+            )
+
+    def test_should_compute_distances_of_all_tours_before_waiting(self, monkeypatch):
+        DistanceCacheService.reset()
+        distance_cache_service = DistanceCacheService.instance()
+        compute_shortest_paths = self.service.compute_shortest_paths
+        get_missing_searches = distance_cache_service.get_missing_searches
+        add_shortest_paths = distance_cache_service.add_shortest_paths
+        pair_sources = []
+        searched_sources = []
+        added_sources = []
+
+        def get_searches(graph, targets_by_source):
+            pair_sources.append(sorted(targets_by_source))
+            return get_missing_searches(graph, targets_by_source)
+
+        def submit_search(map, source, targets):
+            searched_sources.append(source)
+            assert not added_sources, "Every search should be sent before waiting"
+            return compute_shortest_paths(map, source, targets)
+
+        def add_result(graph, source, *args):
+            if source in searched_sources:
+                added_sources.append(source)
+            add_shortest_paths(graph, source, *args)
+
+        monkeypatch.setattr(self.service, "compute_shortest_paths", submit_search)
+        monkeypatch.setattr(
+            distance_cache_service, "get_missing_searches", get_searches
+        )
+        monkeypatch.setattr(distance_cache_service, "add_shortest_paths", add_result)
+        tour_requests = [
+            TourRequest(
+                id=uuid4(),
+                deliveries={
+                    delivery.id: delivery
+                    for delivery in [
+                        DeliveryRequest(
+                            DeliveryLocation(self.map.segments[origin][destination], 0),
+                            8,
+                        )
+                        for origin, destination in segments
+                    ]
+                },
+                delivery_man=None,
+                color="",
+            )
+            for segments in [[(1, 2), (2, 0)], [(3, 2), (1, 2)]]
+        ]
+
+        futures = TourComputingService.instance().submit_tours(tour_requests, self.map)
+
+        # The deliveries of both tours are searched from together, after the warehouse
+        assert pair_sources[-1] == [0, 1, 2, 3]
+        assert all(sources == [0] for sources in pair_sources[:-1])
+        assert searched_sources
+        assert sorted(added_sources) == sorted(searched_sources)
+        for tour_request in tour_requests:
+            assert futures[tour_request.id].result().route
+
+        DistanceCacheService.reset()
@@ -1,11 +1,26 @@
+import platform
+import time
+from random import Random
 from typing import List
+from uuid import uuid4
 
 import networkx as nx
-from pytest import fixture
-
-from src.models.map import Intersection, Segment
-from src.models.tour import DeliveryLocation, DeliveryRequest
+from pytest import approx, fixture, raises
+
+from src.config import Config
+from src.models.errors.computing_errors import (
+    TourComputingCancelledError,
+    TourInfeasibleError,
+)
+from src.models.map import Intersection, RoadGraph, Segment
+from src.models.map.tests.map_factory import create_map, create_road_graph
+from src.models.tour import DeliveryLocation, DeliveryRequest, TourRequest
+from src.services.routing.distance_matrix_service import DistanceMatrixService
+from src.services.routing.road_graph_service import RoadGraphService
+from src.services.routing.shortest_path_service import ShortestPathService
+from src.services.tour.tour_computing_pool_service import TourComputingPoolService
 from src.services.tour.tour_computing_service import TourComputingService
+from src.services.tour.tour_result_cache_service import TourResultCacheService
 
 
 @fixture
@@ -20,15 +35,16 @@ def test_compute_tours(tour_service):
 
 def test_compute_shortest_path_graph(tour_service):
     # Create a simple graph for testing
-    G = nx.DiGraph()
-    G.add_node(1, latitude=0.0, longitude=0.0)
-    G.add_node(2, latitude=1.0, longitude=1.0)
-    G.add_node(3, latitude=2.0, longitude=2.0)
-    G.add_node(4, latitude=3.0, longitude=3.0)
-    G.add_edge(1, 2, length=1.0)
-    G.add_edge(1, 3, length=2.0)
-    G.add_edge(2, 3, length=1.5)
-    G.add_edge(3, 4, length=2.5)
+    G = create_road_graph(
+        [
+            (1, 2, 1.0),
+            (1, 3, 2.0),
+            (2, 3, 1.5),
+            (3, 4, 2.5),
+            # Without a way back, the deliveries at 4 and 2 could not follow each other
+            (4, 1, 1.0),
+        ]
+    )
 
     # Define a set of delivery locations
     delivery_locations: List[DeliveryRequest] = [
@@ -59,6 +75,148 @@ def test_compute_shortest_path_graph(tour_service):
     assert shortest_path_graph[2][4]["path"] == [2, 3, 4]
 
 
+def test_time_window_change_should_only_schedule(tour_service, monkeypatch):
+    map = create_map(
+        (origin, destination, 250.0)
+        for origin, destination in [(1, 2), (2, 3), (3, 1), (2, 1), (3, 2), (1, 3)]
+    )
+    graph = RoadGraph.from_map(map)
+    intersections = map.intersections
+    deliveries = [
+        DeliveryRequest(
+            DeliveryLocation(Segment(-1, "", intersections[i], intersections[i], 0), 0),
+            time_window,
+        )
+        for i, time_window in [(1, 8), (2, 8), (3, 9)]
+    ]
+
+    tour_service.compute_delivery_distances(graph, deliveries)
+    assert [
+        id for id, _ in tour_service.schedule_tour(graph, deliveries).deliveries
+    ] == [2, 3]
+
+    def fail(*args):
+        raise AssertionError("Shortest paths should not be computed again")
+
+    monkeypatch.setattr(ShortestPathService.instance(), "compute_shortest_paths", fail)
+    deliveries[1].time_window = 10
+    tour_service.compute_delivery_distances(graph, deliveries)
+
+    assert [
+        id for id, _ in tour_service.schedule_tour(graph, deliveries).deliveries
+    ] == [3, 2]
+
+
+def test_submit_tour_should_not_compute_same_request_again(tour_service, monkeypatch):
+    map = create_map(
+        (origin, destination, 250.0)
+        for origin, destination in [(1, 2), (2, 3), (3, 1), (2, 1), (3, 2), (1, 3)]
+    )
+    intersections = map.intersections
+    tour_request = TourRequest(
+        id=uuid4(),
+        deliveries={
+            uuid4(): DeliveryRequest(
+                DeliveryLocation(
+                    Segment(-1, "", intersections[i], intersections[i], 0), 0
+                ),
+                8,
+            )
+            for i in [2, 3]
+        },
+        delivery_man=None,
+        color="",
+    )
+    # Solve in the calling thread, so that the result is cached when the future is returned
+    monkeypatch.setattr(platform, "system", lambda: "Windows")
+
+    result = tour_service.submit_tour(tour_request, map).result()
+
+    def fail(*args):
+        raise AssertionError("Tour should not be computed again")
+
+    monkeypatch.setattr(tour_service, "check_tour_feasibility", fail)
+    tour_request.deliveries = dict(reversed(tour_request.deliveries.items()))
+
+    assert tour_service.submit_tour(tour_request, map).result() is result
+
+    TourResultCacheService.reset()
+
+
+def test_submit_tour_should_compute_stopped_search_again(tour_service, monkeypatch):
+    map = create_map(
+        (origin, destination, 250.0)
+        for origin, destination in [(1, 2), (2, 3), (3, 1), (2, 1), (3, 2), (1, 3)]
+    )
+    intersections = map.intersections
+    tour_request = TourRequest(
+        id=uuid4(),
+        deliveries={
+            uuid4(): DeliveryRequest(
+                DeliveryLocation(
+                    Segment(-1, "", intersections[i], intersections[i], 0), 0
+                ),
+                8,
+            )
+            for i in [2, 3]
+        },
+        delivery_man=None,
+        color="",
+    )
+    monkeypatch.setattr(platform, "system", lambda: "Windows")
+    solve_shortest_path_graph = tour_service.solve_shortest_path_graph
+    results = []
+
+    def solve_until_deadline(*args):
+        # The deadline stops the search before it is complete
+        result = solve_shortest_path_graph(*args)
+        result.is_optimal = False
+        results.append(result)
+        return result
+
+    monkeypatch.setattr(tour_service, "solve_shortest_path_graph", solve_until_deadline)
+
+    tour_service.submit_tour(tour_request, map).result()
+    tour_service.submit_tour(tour_request, map).result()
+
+    assert len(results) == 2
+
+    TourResultCacheService.reset()
+
+
+def test_precompute_distance_matrices_should_write_matrices(
+    tour_service, tmp_path, monkeypatch
+):
+    map = create_map([(1, 2, 250.0), (2, 3, 250.0), (3, 1, 250.0)], content_hash="map")
+    monkeypatch.setattr(Config, "DISTANCE_MATRIX_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(tour_service, "DISTANCE_MATRIX_ROWS_PER_TASK", 2)
+    monkeypatch.setattr(platform, "system", lambda: "Windows")
+
+    tour_service.precompute_distance_matrices(map)
+
+    assert DistanceMatrixService.instance().get_shortest_paths(
+        "map", RoadGraphService.instance().get_road_graph(map), 3, [1, 2]
+    ) == ({1: 250.0, 2: 500.0}, {1: [3, 1], 2: [3, 1, 2]})
+
+    DistanceMatrixService.reset()
+    RoadGraphService.reset()
+
+
+def test_check_tour_feasibility_should_reject_deliveries_out_of_reach(tour_service):
+    map = create_map([(1, 2, 20000.0), (2, 1, 20000.0)], name="Rue A")
+    graph = RoadGraph.from_map(map)
+    deliveries = [
+        DeliveryRequest(DeliveryLocation(map.segments[i][3 - i], 0), 8) for i in [1, 2]
+    ]
+
+    # Going to the delivery takes 80 minutes
+    with raises(TourInfeasibleError, match="Rue A entre 8h et 9h"):
+        tour_service.check_tour_feasibility(graph, deliveries)
+
+    deliveries[1].time_window = 9
+    tour_service.check_tour_feasibility(graph, deliveries)
+
+
 def test_solve_tsp_should_return_solution(tour_service):
     # Create a sample complete directed graph
     G = nx.DiGraph()
@@ -149,3 +307,368 @@ def test_solve_tsp_should_pass_if_delivery_in_time_window(tour_service):
     # Check if the above graph is a valid NetworkX DiGraph
     assert isinstance(G, nx.DiGraph)
     assert path.route == [0, 23, 56, 1, 7, 6, 2, 4, 7, 3, 2, 99, 33, 0]
+
+
+def test_solve_tsp_dynamic_programming_should_return_solution(tour_service):
+    G = nx.DiGraph()
+    G.add_node(0, timewindow=8)
+    G.add_node(1, timewindow=8)
+    G.add_node(2, timewindow=8)
+
+    G.add_edge(0, 1, length=1.0, path=[0, 23, 56, 1])
+    G.add_edge(1, 0, length=2.0, path=[1, 12, 16, 0])
+    G.add_edge(0, 2, length=3.0, path=[0, 5, 33, 2])
+    G.add_edge(2, 0, length=4.0, path=[2, 42, 27, 0])
+    G.add_edge(1, 2, length=5.0, path=[1, 7, 6, 2])
+
+    path = tour_service.solve_tsp_dynamic_programming(G)
+
+    assert path.route == [0, 23, 56, 1, 7, 6, 2, 42, 27, 0]
+
+
+def test_solve_tsp_dynamic_programming_should_return_empty_solution_if_cul_de_sac(
+    tour_service,
+):
+    G = nx.DiGraph()
+    G.add_node(0, timewindow=8)
+    G.add_node(1, timewindow=8)
+    G.add_node(2, timewindow=8)
+
+    G.add_edge(0, 1, length=1.0, path=[0, 23, 56, 1])
+    G.add_edge(1, 0, length=2.0, path=[1, 12, 16, 0])
+    G.add_edge(0, 2, length=3.0, path=[0, 5, 33, 2])
+    G.add_edge(1, 2, length=5.0, path=[1, 7, 6, 2])
+
+    assert tour_service.solve_tsp_dynamic_programming(G) == []
+
+
+def test_solve_tsp_dynamic_programming_should_respect_time_windows(tour_service):
+    G = nx.DiGraph()
+    G.add_node(0, timewindow=8)
+    G.add_node(1, timewindow=8)
+    G.add_node(2, timewindow=10)
+    G.add_node(3, timewindow=11)
+
+    G.add_edge(0, 1, length=1.0, path=[0, 23, 56, 1])
+    G.add_edge(1, 0, length=2.0, path=[1, 12, 16, 0])
+    G.add_edge(0, 2, length=3.0, path=[0, 5, 33, 2])
+    G.add_edge(2, 0, length=4.0, path=[2, 42, 27, 0])
+    G.add_edge(1, 2, length=50.0, path=[1, 7, 6, 2])
+    G.add_edge(1, 3, length=5.0, path=[1, 9, 54, 2, 3])
+    G.add_edge(3, 1, length=6.0, path=[3, 54, 9, 1])
+    G.add_edge(3, 2, length=7.0, path=[3, 4, 19, 2])
+    G.add_edge(2, 3, length=8.0, path=[2, 4, 7, 3])
+    G.add_edge(3, 0, length=555.0, path=[3, 2, 99, 33, 0])
+
+    path = tour_service.solve_tsp_dynamic_programming(G)
+
+    assert path.route == [0, 23, 56, 1, 7, 6, 2, 4, 7, 3, 2, 99, 33, 0]
+    assert [delivery for delivery, _ in path.deliveries] == [1, 2, 3]
+    assert [time for _, time in path.deliveries] == approx([480.004, 600, 660])
+
+
+def test_solve_tsp_dynamic_programming_should_match_brute_force(tour_service):
+    random = Random(42)
+
+    for _ in range(10):
+        G = nx.DiGraph()
+        G.add_node(0, timewindow=8)
+        for node in range(1, 7):
+            G.add_node(node, timewindow=random.choice([8, 9]))
+
+        for source in G.nodes:
+            for target in G.nodes:
+                if source != target and (
+                    target == 0
+                    or G.nodes[target]["timewindow"] >= G.nodes[source]["timewindow"]
+                ):
+                    G.add_edge(
+                        source,
+                        target,
+                        length=random.uniform(500, 5000),
+                        path=[source, target],
+                    )
+
+        brute_force = tour_service.solve_tsp(G)
+        dynamic_programming = tour_service.solve_tsp_dynamic_programming(G)
+
+        if brute_force == []:
+            assert dynamic_programming == []
+        else:
+            assert dynamic_programming.route == brute_force.route
+
+
+def create_time_window_graph(
+    random: Random, deliveries: int, time_windows: List[int]
+) -> nx.DiGraph:
+    # Deliveries placed on a 600 m square, with the edges kept by the time window pruning
+    positions = [(0, 0)] + [
+        (random.randint(0, 600), random.randint(0, 600)) for _ in range(deliveries)
+    ]
+    G = nx.DiGraph()
+    G.add_node(0, timewindow=8)
+    for node in range(1, deliveries + 1):
+        G.add_node(node, timewindow=random.choice(time_windows))
+
+    for source in G.nodes:
+        for target in G.nodes:
+            if source != target and (
+                target == 0
+                or G.nodes[target]["timewindow"] >= G.nodes[source]["timewindow"]
+            ):
+                G.add_edge(
+                    source,
+                    target,
+                    length=abs(positions[source][0] - positions[target][0])
+                    + abs(positions[source][1] - positions[target][1]),
+                    path=[source, target],
+                )
+
+    return G
+
+
+def test_solve_tsp_time_window_blocks_should_match_dynamic_programming(tour_service):
+    random = Random(42)
+
+    for _ in range(10):
+        G = create_time_window_graph(random, 10, [8, 9, 10])
+
+        dynamic_programming = tour_service.solve_tsp_dynamic_programming(G)
+        time_window_blocks = tour_service.solve_tsp_time_window_blocks(G)
+
+        if dynamic_programming == []:
+            assert time_window_blocks == []
+        else:
+            assert time_window_blocks.route == dynamic_programming.route
+
+
+def test_solve_shortest_path_graph_should_solve_tour_with_small_time_window_blocks(
+    tour_service,
+):
+    G = create_time_window_graph(Random(0), 28, [8, 9, 10, 11])
+
+    path = tour_service.solve_shortest_path_graph(G)
+
+    assert [delivery for delivery, _ in path.deliveries] == [
+        delivery
+        for delivery, _ in tour_service.solve_tsp_time_window_blocks(G).deliveries
+    ]
+    assert path.is_optimal
+    assert len(path.deliveries) == 28
+
+
+def test_solve_tsp_branch_and_bound_should_return_solution(tour_service):
+    G = nx.DiGraph()
+    G.add_node(0, timewindow=8)
+    G.add_node(1, timewindow=8)
+    G.add_node(2, timewindow=8)
+
+    G.add_edge(0, 1, length=1.0, path=[0, 23, 56, 1])
+    G.add_edge(1, 0, length=2.0, path=[1, 12, 16, 0])
+    G.add_edge(0, 2, length=3.0, path=[0, 5, 33, 2])
+    G.add_edge(2, 0, length=4.0, path=[2, 42, 27, 0])
+    G.add_edge(1, 2, length=5.0, path=[1, 7, 6, 2])
+
+    path = tour_service.solve_tsp_branch_and_bound(G)
+
+    assert path.route == [0, 23, 56, 1, 7, 6, 2, 42, 27, 0]
+
+
+def test_solve_tsp_branch_and_bound_should_return_empty_solution_if_cul_de_sac(
+    tour_service,
+):
+    G = nx.DiGraph()
+    G.add_node(0, timewindow=8)
+    G.add_node(1, timewindow=8)
+    G.add_node(2, timewindow=8)
+
+    G.add_edge(0, 1, length=1.0, path=[0, 23, 56, 1])
+    G.add_edge(1, 0, length=2.0, path=[1, 12, 16, 0])
+    G.add_edge(0, 2, length=3.0, path=[0, 5, 33, 2])
+    G.add_edge(1, 2, length=5.0, path=[1, 7, 6, 2])
+
+    assert tour_service.solve_tsp_branch_and_bound(G) == []
+
+
+def test_solve_tsp_branch_and_bound_should_match_brute_force(tour_service):
+    random = Random(7)
+
+    for _ in range(10):
+        G = nx.DiGraph()
+        G.add_node(0, timewindow=8)
+        for node in range(1, 7):
+            G.add_node(node, timewindow=random.choice([8, 9]))
+
+        for source in G.nodes:
+            for target in G.nodes:
+                if source != target and (
+                    target == 0
+                    or G.nodes[target]["timewindow"] >= G.nodes[source]["timewindow"]
+                ):
+                    G.add_edge(
+                        source,
+                        target,
+                        length=random.uniform(500, 5000),
+                        path=[source, target],
+                    )
+
+        brute_force = tour_service.solve_tsp(G)
+        branch_and_bound = tour_service.solve_tsp_branch_and_bound(G)
+
+        if brute_force == []:
+            assert branch_and_bound == []
+        else:
+            assert branch_and_bound.route == brute_force.route
+
+
+def test_solve_tsp_branch_and_bound_should_return_greedy_solution_if_no_node_can_be_explored(
+    tour_service,
+):
+    G = nx.DiGraph()
+    G.add_node(0, timewindow=8)
+    G.add_node(1, timewindow=8)
+    G.add_node(2, timewindow=8)
+
+    G.add_edge(0, 1, length=1.0, path=[0, 1])
+    G.add_edge(1, 0, length=1.0, path=[1, 0])
+    G.add_edge(0, 2, length=3.0, path=[0, 2])
+    G.add_edge(2, 0, length=1.0, path=[2, 0])
+    G.add_edge(1, 2, length=5.0, path=[1, 2])
+    G.add_edge(2, 1, length=1.0, path=[2, 1])
+
+    path = tour_service.solve_tsp_branch_and_bound(G, max_explored_nodes=1)
+
+    assert path.route == tour_service.solve_greedy_tsp(G).route
+    # The local search already found the shortest tour, the lower bound of the first node proves it
+    assert path.is_optimal
+
+
+def create_graph_improved_by_branch_and_bound() -> nx.DiGraph:
+    G = nx.DiGraph()
+    G.add_node(0, timewindow=8)
+    G.add_node(1, timewindow=8)
+    G.add_node(2, timewindow=8)
+
+    G.add_edge(0, 1, length=1.0, path=[0, 1])
+    G.add_edge(1, 0, length=1.0, path=[1, 0])
+    G.add_edge(0, 2, length=3.0, path=[0, 2])
+    G.add_edge(2, 0, length=1.0, path=[2, 0])
+    G.add_edge(1, 2, length=5.0, path=[1, 2])
+    G.add_edge(2, 1, length=1.0, path=[2, 1])
+
+    return G
+
+
+def test_solve_tsp_large_neighbourhood_search_should_return_solution(tour_service):
+    G = create_graph_improved_by_branch_and_bound()
+    improvements = []
+
+    path = tour_service.solve_tsp_large_neighbourhood_search(
+        G, max_iterations=100, on_improvement=improvements.append, seed=0
+    )
+
+    assert path.route == tour_service.solve_tsp_branch_and_bound(G).route
+    assert not path.is_optimal
+    assert improvements[-1].route == path.route
+
+
+def test_check_arrival_time_constraint_should_check_time_windows(tour_service):
+    G = create_graph_improved_by_branch_and_bound()
+    path = tour_service.solve_tsp(G)
+
+    assert tour_service.check_arrival_time_constraint(path, G)
+
+    G.nodes[path.deliveries[-1][0]]["timewindow"] = 7
+
+    assert not tour_service.check_arrival_time_constraint(path, G)
+
+
+def test_solve_tsp_branch_and_bound_should_report_better_tours(tour_service):
+    improvements = []
+
+    path = tour_service.solve_tsp_branch_and_bound(
+        create_graph_improved_by_branch_and_bound(),
+        on_improvement=improvements.append,
+    )
+
+    assert path.is_optimal
+    assert path.route == [0, 2, 1, 0]
+    assert [improvement.route for improvement in improvements] == [[0, 2, 1, 0]]
+    assert not improvements[0].is_optimal
+
+
+def test_solve_tsp_branch_and_bound_should_stop_at_deadline(tour_service):
+    G = create_graph_improved_by_branch_and_bound()
+
+    path = tour_service.solve_tsp_branch_and_bound(G, deadline=time.time() - 1)
+
+    # The local search has no time to improve the greedy tour either
+    assert (
+        path.route == tour_service.solve_greedy_tsp(G, deadline=time.time() - 1).route
+    )
+    assert not path.is_optimal
+
+
+def test_solve_shortest_path_graph_should_return_greedy_solution_after_deadline(
+    tour_service,
+):
+    G = create_graph_improved_by_branch_and_bound()
+
+    path = tour_service.solve_shortest_path_graph(G, deadline=time.time() - 1)
+
+    # The local search has no time to improve the greedy tour either
+    assert (
+        path.route == tour_service.solve_greedy_tsp(G, deadline=time.time() - 1).route
+    )
+    assert not path.is_optimal
+
+
+def test_solve_shortest_path_graph_should_report_greedy_solution_once(
+    tour_service, monkeypatch
+):
+    G = create_graph_improved_by_branch_and_bound()
+    solve_greedy_tsp = tour_service.solve_greedy_tsp
+    greedy_results = []
+    progress = []
+
+    def count_greedy(*args):
+        greedy_results.append(solve_greedy_tsp(*args))
+        return greedy_results[-1]
+
+    monkeypatch.setattr(tour_service, "solve_greedy_tsp", count_greedy)
+    monkeypatch.setattr(
+        TourComputingPoolService,
+        "report_progress",
+        lambda computation_id, tour_id, result: progress.append((tour_id, result)),
+    )
+
+    for max_deliveries in [tour_service.MAX_DELIVERIES_DYNAMIC_PROGRAMMING, 0]:
+        # Without dynamic programming, the branch and bound starts from the greedy tour instead of solving it again
+        monkeypatch.setattr(
+            tour_service, "MAX_DELIVERIES_DYNAMIC_PROGRAMMING", max_deliveries
+        )
+        monkeypatch.setattr(
+            tour_service, "MAX_DELIVERIES_TIME_WINDOW_BLOCK", max_deliveries
+        )
+        greedy_results.clear()
+        progress.clear()
+
+        path = tour_service.solve_shortest_path_graph(G, tour_id="tour")
+
+        assert len(greedy_results) == 1
+        assert progress[0] == ("tour", greedy_results[0])
+        assert not greedy_results[0].is_optimal
+        assert path.route == [0, 2, 1, 0]
+
+
+def test_solvers_should_stop_when_cancelled(tour_service):
+    G = nx.DiGraph()
+    G.add_node(0, timewindow=8)
+    G.add_node(1, timewindow=8)
+    G.add_edge(0, 1, length=1.0, path=[0, 1])
+    G.add_edge(1, 0, length=1.0, path=[1, 0])
+
+    with raises(TourComputingCancelledError):
+        tour_service.solve_tsp_dynamic_programming(G, lambda: True)
+
+    assert tour_service.solve_tsp_dynamic_programming(G, lambda: False)
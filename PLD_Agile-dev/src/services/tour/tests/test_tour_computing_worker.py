@@ -0,0 +1,69 @@
+import concurrent.futures
+from uuid import uuid4
+
+from pytest import fixture
+
+from src.models.map.tests.map_factory import create_map
+from src.models.tour import (
+    DeliveryLocation,
+    DeliveryRequest,
+    NonComputedTour,
+    TourRequest,
+)
+from src.services.map.map_service import MapService
+from src.services.tour.tour_computing_service import TourComputingService
+from src.services.tour.tour_computing_worker import TourComputingWorker
+
+
+class TestTourComputingWorker:
+    tour_request: TourRequest
+
+    @fixture(autouse=True)
+    def setup(self):
+        map = create_map([(1, 2, 100.0), (2, 1, 100.0)])
+        MapService.instance().set_map(map)
+
+        delivery_request = DeliveryRequest(DeliveryLocation(map.segments[2][1], 0), 8)
+        self.tour_request = TourRequest(
+            id=uuid4(),
+            deliveries={delivery_request.id: delivery_request},
+            delivery_man=None,
+            color="",
+        )
+
+        yield
+
+        MapService.reset()
+
+    def test_should_finish_when_computation_fails(self, monkeypatch):
+        def submit_failing_tours(tour_requests, *args):
+            future = concurrent.futures.Future()
+            future.set_exception(RuntimeError("Worker process killed"))
+            return {tour_request.id: future for tour_request in tour_requests}
+
+        monkeypatch.setattr(
+            TourComputingService.instance(), "submit_tours", submit_failing_tours
+        )
+
+        self.assert_finishes_with_non_computed_tour()
+
+    def test_should_finish_when_submission_fails(self, monkeypatch):
+        def fail(*args):
+            raise RuntimeError("Pool shut down")
+
+        monkeypatch.setattr(TourComputingService.instance(), "submit_tours", fail)
+
+        self.assert_finishes_with_non_computed_tour()
+
+    def assert_finishes_with_non_computed_tour(self):
+        worker = TourComputingWorker({self.tour_request.id: self.tour_request}, None)
+        finished = []
+        worker.finished.connect(finished.append)
+
+        worker.run()
+
+        assert finished == [2]
+        assert isinstance(worker.result[self.tour_request.id], NonComputedTour)
+        assert worker.result[self.tour_request.id].errors == [
+            "Impossible de trouver un chemin."
+        ]
@@ -0,0 +1,123 @@
+from typing import List
+
+from pytest import approx, fixture
+
+from src.services.tour.tour_constraint_service import TourConstraintService
+
+
+def create_lengths(positions: List[int]) -> List[List[float]]:
+    # Points on a straight road, 250 meters take one minute
+    return [
+        [abs(source - target) * 250.0 for target in positions] for source in positions
+    ]
+
+
+class TestTourConstraintService:
+    service: TourConstraintService
+
+    @fixture(autouse=True)
+    def setup(self):
+        self.service = TourConstraintService.instance()
+
+        yield
+
+        TourConstraintService.reset()
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_compute_service_times(self):
+        lengths = create_lengths([0, 20, 30])
+
+        earliest_times, latest_times = self.service.compute_service_times(
+            lengths, [8, 8, 9]
+        )
+
+        assert earliest_times == approx([480, 500, 540])
+        assert latest_times == approx([480, 540, 600])
+
+    def test_should_tighten_service_times_of_predecessors(self):
+        # The delivery of 9 a.m. is 60 minutes away, the first one must start before 8:55
+        lengths = create_lengths([0, 10, 70])
+
+        earliest_times, latest_times = self.service.compute_service_times(
+            lengths, [8, 8, 9]
+        )
+
+        assert earliest_times == approx([480, 490, 555])
+        assert latest_times == approx([480, 535, 600])
+
+    def test_should_find_deliveries_that_cannot_be_made_in_time(self):
+        lengths = create_lengths([0, 10, 70])
+
+        service_times = self.service.compute_service_times(lengths, [8, 8, 8])
+
+        assert self.service.get_infeasible_points(service_times) == [2]
+
+    def test_should_find_deliveries_that_cannot_follow_each_other(self):
+        # Both deliveries are reachable, but not one after the other
+        lengths = create_lengths([0, -40, 40])
+
+        service_times = self.service.compute_service_times(lengths, [8, 8, 8])
+
+        assert self.service.get_infeasible_points(service_times)
+
+    def test_should_find_time_windows_with_too_many_deliveries(self):
+        # Fourteen deliveries at the same place, the last one starts 65 minutes after the first one
+        lengths = create_lengths([0] + [10] * 14 + [10])
+        time_windows = [8] + [9] * 14 + [10]
+
+        service_times = self.service.compute_service_times(lengths, time_windows)
+
+        assert self.service.get_infeasible_points(service_times) == []
+        assert self.service.get_overloaded_time_windows(
+            lengths, time_windows, service_times
+        ) == [(9, 9)]
+
+    def test_should_count_travel_between_deliveries_of_time_windows(self):
+        # Deliveries 25 minutes apart, the last one starts at 9:10 in any order
+        lengths = create_lengths([0, 10, 35, 60])
+        time_windows = [8, 8, 8, 8]
+
+        service_times = self.service.compute_service_times(lengths, time_windows)
+
+        assert self.service.get_overloaded_time_windows(
+            lengths, time_windows, service_times
+        ) == [(8, 8)]
+
+        time_windows[3] = 9
+        service_times = self.service.compute_service_times(lengths, time_windows)
+
+        assert (
+            self.service.get_overloaded_time_windows(
+                lengths, time_windows, service_times
+            )
+            == []
+        )
+
+    def test_should_remove_legs_skipping_time_windows(self):
+        lengths = create_lengths([0, 1, 2, 3])
+
+        possible_legs = self.service.get_possible_legs(
+            lengths, self.service.compute_service_times(lengths, [8, 8, 9, 10])
+        )
+
+        assert possible_legs == [
+            [False, True, False, False],
+            [False, False, True, False],
+            [False, False, False, True],
+            [True, False, False, False],
+        ]
+
+    def test_should_keep_legs_within_time_window(self):
+        lengths = create_lengths([0, 1, 2])
+
+        possible_legs = self.service.get_possible_legs(
+            lengths, self.service.compute_service_times(lengths, [8, 8, 8])
+        )
+
+        assert possible_legs == [
+            [False, True, True],
+            [True, False, True],
+            [True, True, False],
+        ]
@@ -0,0 +1,156 @@
+from datetime import time
+from typing import List, Tuple
+from uuid import uuid4
+
+from pytest import approx, fixture
+
+from src.models.delivery_man.delivery_man import DeliveryMan
+from src.models.map import Intersection, Map
+from src.models.map.tests.map_factory import create_map
+from src.models.tour import (
+    ComputedDelivery,
+    ComputedTour,
+    DeliveryLocation,
+    DeliveryRequest,
+    TourRequest,
+)
+from src.services.map.map_service import MapService
+from src.services.routing.distance_cache_service import DistanceCacheService
+from src.services.tour.tour_editing_service import TourEditingService
+
+
+class TestTourEditingService:
+    service: TourEditingService
+    map: Map
+
+    @fixture(autouse=True)
+    def setup(self):
+        self.service = TourEditingService.instance()
+
+        # A straight road where going from an intersection to the next one takes 10 minutes
+        intersections = {id: Intersection(0, id, id) for id in range(6)}
+        self.map = create_map(
+            (
+                (source, target, 2500)
+                for origin in range(5)
+                for source, target in [(origin, origin + 1), (origin + 1, origin)]
+            ),
+            intersections,
+        )
+
+        yield
+
+        TourEditingService.reset()
+        DistanceCacheService.reset()
+        MapService.reset()
+
+    def create_delivery_request(
+        self, intersection_id: int, time_window: int
+    ) -> DeliveryRequest:
+        return DeliveryRequest(
+            DeliveryLocation(
+                self.map.segments[intersection_id][
+                    intersection_id - 1 if intersection_id else 1
+                ],
+                0,
+            ),
+            time_window,
+        )
+
+    def create_tours(
+        self, deliveries: List[Tuple[int, int]], new_delivery: Tuple[int, int]
+    ) -> Tuple[TourRequest, ComputedTour, DeliveryRequest]:
+        delivery_requests = [
+            self.create_delivery_request(intersection_id, time_window)
+            for intersection_id, time_window in deliveries
+        ]
+        new_delivery_request = self.create_delivery_request(*new_delivery)
+
+        tour_request = TourRequest(
+            id=uuid4(),
+            deliveries={
+                delivery_request.id: delivery_request
+                for delivery_request in delivery_requests + [new_delivery_request]
+            },
+            delivery_man=DeliveryMan("John Doe", [8, 9, 10, 11]),
+            color="",
+        )
+        computed_tour = ComputedTour.create_from_request(
+            tour_request=tour_request,
+            deliveries={
+                delivery_request.id: ComputedDelivery.create_from_request(
+                    delivery_request, time(hour=8)
+                )
+                for delivery_request in delivery_requests
+            },
+            route=[],
+        )
+
+        return tour_request, computed_tour, new_delivery_request
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_insert_delivery_at_cheapest_position(self):
+        result = self.service.insert_delivery(
+            *self.create_tours([(2, 8), (4, 8)], (3, 8)), self.map
+        )
+
+        assert [delivery for delivery, _ in result.deliveries] == [2, 3, 4]
+        assert [start_time for _, start_time in result.deliveries] == approx(
+            [500, 515, 530]
+        )
+        assert result.route == [0, 1, 2, 3, 4, 3, 2, 1, 0]
+        assert not result.is_optimal
+
+    def test_should_insert_delivery_after_earlier_time_windows(self):
+        result = self.service.insert_delivery(
+            *self.create_tours([(2, 8), (4, 9)], (3, 10)), self.map
+        )
+
+        assert [delivery for delivery, _ in result.deliveries] == [2, 4, 3]
+        assert [start_time for _, start_time in result.deliveries] == approx(
+            [500, 540, 600]
+        )
+
+    def test_should_not_delay_following_deliveries_after_their_time_window(self):
+        # Delivering 4 first is as short, but delivery 5 would then start after 9 a.m.
+        result = self.service.insert_delivery(
+            *self.create_tours([(5, 8)], (4, 9)), self.map
+        )
+
+        assert [delivery for delivery, _ in result.deliveries] == [5, 4]
+        assert [start_time for _, start_time in result.deliveries] == approx([530, 545])
+
+    def test_should_not_insert_delivery_without_feasible_position(self):
+        result = self.service.insert_delivery(
+            *self.create_tours([(2, 8)], (5, 7)), self.map
+        )
+
+        assert result is None
+
+    def test_should_remove_delivery_and_keep_order(self):
+        tour_request, computed_tour, _ = self.create_tours(
+            [(2, 8), (5, 8), (3, 9)], (1, 8)
+        )
+        removed_delivery_id = list(computed_tour.deliveries)[1]
+        del tour_request.deliveries[removed_delivery_id]
+
+        result = self.service.remove_delivery(
+            tour_request, computed_tour, removed_delivery_id, self.map
+        )
+
+        assert [delivery for delivery, _ in result.deliveries] == [2, 3]
+        assert [start_time for _, start_time in result.deliveries] == approx([500, 540])
+        assert result.route == [0, 1, 2, 3, 2, 1, 0]
+        assert not result.is_optimal
+
+    def test_should_insert_delivery_in_empty_tour(self):
+        tour_request, _, delivery_request = self.create_tours([], (3, 9))
+
+        result = self.service.insert_delivery(
+            tour_request, None, delivery_request, self.map
+        )
+
+        assert result.deliveries == [(3, 540)]
+        assert result.route == [0, 1, 2, 3, 2, 1, 0]
@@ -0,0 +1,72 @@
+import numpy as np
+from pytest import approx, fixture
+
+from src.services.tour.tour_evaluation_service import TourEvaluationService
+
+
+class TestTourEvaluationService:
+    service: TourEvaluationService
+
+    @fixture(autouse=True)
+    def setup(self):
+        self.service = TourEvaluationService.instance()
+
+        # Points on a straight road, 2500 meters take ten minutes
+        self.lengths = np.array(
+            [
+                [abs(source - target) * 2500.0 for target in range(4)]
+                for source in range(4)
+            ]
+        )
+
+        yield
+
+        TourEvaluationService.reset()
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_evaluate_many_sequences(self):
+        lengths, start_times = self.service.evaluate_sequences(
+            np.array([[0, 1, 2, 3], [0, 3, 2, 1]]),
+            self.lengths,
+            np.array([8, 8, 8, 8]),
+        )
+
+        assert lengths.tolist() == [15000, 15000]
+        assert start_times == approx(np.array([[490, 505, 520], [510, 525, 540]]))
+
+    def test_should_wait_for_time_windows(self):
+        lengths, start_times = self.service.evaluate_sequences(
+            np.array([[0, 1, 2]]), self.lengths, np.array([8, 8, 9, 8])
+        )
+
+        assert lengths.tolist() == [10000]
+        assert start_times == approx(np.array([[490, 540]]))
+
+    def test_should_not_score_sequences_missing_time_windows(self):
+        lengths, _ = self.service.evaluate_sequences(
+            np.array([[0, 1, 2], [0, 2, 1]]), self.lengths, np.array([8, 9, 8, 8])
+        )
+
+        assert lengths.tolist() == [float("inf"), 10000]
+
+    def test_should_not_score_sequences_with_missing_paths(self):
+        self.lengths[1][2] = float("inf")
+
+        lengths, _ = self.service.evaluate_sequences(
+            np.array([[0, 1, 2], [0, 2, 1]]), self.lengths, np.array([8, 8, 8, 8])
+        )
+
+        assert lengths.tolist() == [float("inf"), 10000]
+
+    def test_should_compute_travel_and_arrival_times(self):
+        assert self.service.get_travel_time(2500) == approx(10)
+        assert self.service.get_arrival_time(480, 5000) == approx(500)
+
+    def test_should_compute_delivery_start_time(self):
+        # Arriving at 8:10 in the 9h time window waits until it starts, arriving at 9:10 in the 8h one is too late
+        assert self.service.get_delivery_start_time(480, 2500, 9) == 540
+        assert self.service.get_delivery_start_time(480, 2500, 8) == approx(490)
+        assert self.service.get_delivery_start_time(540, 2500, 8) is None
+        assert self.service.get_time_window_end(8) == 540
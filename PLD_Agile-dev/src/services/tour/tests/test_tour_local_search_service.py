@@ -0,0 +1,142 @@
+from random import Random
+from typing import List, Optional
+
+from pytest import fixture, raises
+
+from src.models.errors.computing_errors import TourComputingCancelledError
+from src.services.tour.tour_local_search_service import TourLocalSearchService
+
+
+def compute_length(
+    cycle: List[int], lengths: List[List[float]], time_windows: List[int]
+) -> Optional[float]:
+    """Length of a tour, or None if it misses a time window."""
+    current_time, length = 8 * 60, 0
+    for source, target in zip(cycle, cycle[1:]):
+        length += lengths[source][target]
+        current_time = max(
+            current_time + lengths[source][target] / 250, time_windows[target] * 60
+        )
+        if current_time > time_windows[target] * 60 + 60:
+            return None
+        current_time += 5
+
+    return length + lengths[cycle[-1]][cycle[0]]
+
+
+def create_lengths(positions: List[tuple]) -> List[List[float]]:
+    return [
+        [
+            float("inf")
+            if source == target
+            else abs(source[0] - target[0]) + abs(source[1] - target[1])
+            for target in positions
+        ]
+        for source in positions
+    ]
+
+
+class TestTourLocalSearchService:
+    service: TourLocalSearchService
+
+    @fixture(autouse=True)
+    def setup(self):
+        self.service = TourLocalSearchService.instance()
+
+        yield
+
+        TourLocalSearchService.reset()
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_remove_crossing_paths(self):
+        # Deliveries on the corners of a square, the initial tour uses both diagonals
+        lengths = create_lengths([(0, 0), (0, 1000), (1000, 1000), (1000, 0)])
+
+        cycle = self.service.improve_cycle([0, 2, 1, 3], lengths, [8, 8, 8, 8])
+
+        assert cycle in ([0, 1, 2, 3], [0, 3, 2, 1])
+
+    def test_should_repair_missed_time_windows(self):
+        lengths = create_lengths([(0, 0), (5000, 0), (0, 5000), (0, 10000)])
+        time_windows = [8, 8, 9, 9]
+
+        # Delivery 1 is missed when delivery 3 is delivered first
+        assert compute_length([0, 3, 2, 1], lengths, time_windows) is None
+
+        cycle = self.service.improve_cycle([0, 3, 2, 1], lengths, time_windows)
+
+        assert cycle is not None
+        assert compute_length(cycle, lengths, time_windows) is not None
+
+    def test_should_not_return_tour_missing_time_windows(self):
+        lengths = create_lengths([(0, 0), (20000, 0), (0, 20000)])
+
+        assert self.service.improve_cycle([0, 1, 2], lengths, [8, 8, 8]) is None
+
+    def test_should_stop_when_cancelled(self):
+        lengths = create_lengths([(0, 0), (0, 1000), (1000, 1000), (1000, 0)])
+
+        with raises(TourComputingCancelledError):
+            self.service.improve_cycle(
+                [0, 2, 1, 3], lengths, [8, 8, 8, 8], is_cancelled=lambda: True
+            )
+
+    def test_should_return_shorter_tours_meeting_time_windows(self):
+        random = Random(0)
+
+        for _ in range(50):
+            positions = [
+                (random.randint(0, 1500), random.randint(0, 1500)) for _ in range(10)
+            ]
+            time_windows = [8] + sorted(random.choice([8, 9, 10]) for _ in range(9))
+            lengths = create_lengths(positions)
+            initial_cycle = list(range(10))
+
+            cycle = self.service.improve_cycle(initial_cycle, lengths, time_windows)
+
+            initial_length = compute_length(initial_cycle, lengths, time_windows)
+            length = compute_length(cycle, lengths, time_windows)
+
+            assert sorted(cycle) == initial_cycle
+            assert length is not None
+            if initial_length is not None:
+                assert length <= initial_length
+
+    def test_should_search_large_neighbourhood_reproducibly(self):
+        random = Random(1)
+        positions = [
+            (random.randint(0, 1000), random.randint(0, 1000)) for _ in range(13)
+        ]
+        time_windows = [8] + sorted(random.choice([8, 9, 10]) for _ in range(12))
+        lengths = create_lengths(positions)
+        improvements = []
+
+        cycle = self.service.search_large_neighbourhood(
+            list(range(13)),
+            lengths,
+            time_windows,
+            max_iterations=200,
+            seed=0,
+            on_improvement=improvements.append,
+        )
+
+        local_search_cycle = self.service.improve_cycle(
+            list(range(13)), lengths, time_windows
+        )
+        length = compute_length(cycle, lengths, time_windows)
+
+        assert sorted(cycle) == list(range(13))
+        assert length is not None
+        assert length <= compute_length(local_search_cycle, lengths, time_windows)
+        assert improvements == [] or improvements[-1] == cycle
+        assert cycle == self.service.search_large_neighbourhood(
+            list(range(13)), lengths, time_windows, max_iterations=200, seed=0
+        )
+
+    def test_should_not_search_large_neighbourhood_without_limit(self):
+        lengths = create_lengths([(0, 0), (0, 1000), (1000, 1000), (1000, 0)])
+
+        with raises(ValueError):
+            self.service.search_large_neighbourhood([0, 1, 2, 3], lengths, [8] * 4)
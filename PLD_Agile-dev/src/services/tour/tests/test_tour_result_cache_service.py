@@ -0,0 +1,131 @@
+from pytest import fixture
+
+from src.config import Config
+from src.models.map import Intersection, Map, MapSize, Position, Segment
+from src.models.tour import DeliveryLocation, DeliveryRequest, TourComputingResult
+from src.services.map.map_service import MapService
+from src.services.tour.tour_result_cache_service import TourResultCacheService
+
+
+def create_map() -> Map:
+    intersections = {id: Intersection(0, 0, id) for id in range(1, 5)}
+
+    return Map(
+        intersections=intersections,
+        segments={},
+        warehouse=intersections[1],
+        size=MapSize(Position(0, 0), Position(0, 0)),
+    )
+
+
+class TestTourResultCacheService:
+    service: TourResultCacheService
+    map: Map
+    fingerprints: list
+
+    @fixture(autouse=True)
+    def setup(self):
+        self.service = TourResultCacheService.instance()
+        self.map = create_map()
+        self.fingerprints = [(1, ((id, 8),), ()) for id in range(2, 5)]
+
+        yield
+
+        TourResultCacheService.reset()
+        MapService.reset()
+
+    def create_deliveries(self, time_windows: dict) -> list:
+        return [
+            DeliveryRequest(
+                DeliveryLocation(
+                    Segment(
+                        -1,
+                        "",
+                        self.map.intersections[id],
+                        self.map.intersections[id],
+                        0,
+                    ),
+                    0,
+                ),
+                time_window,
+            )
+            for id, time_window in time_windows.items()
+        ]
+
+    def test_should_create_service(self):
+        assert self.service is not None
+
+    def test_should_ignore_order_of_deliveries(self):
+        fingerprint = self.service.get_fingerprint(
+            self.create_deliveries({1: 8, 2: 8, 3: 9}), ()
+        )
+
+        assert fingerprint == self.service.get_fingerprint(
+            self.create_deliveries({1: 8, 3: 9, 2: 8}), ()
+        )
+        assert fingerprint != self.service.get_fingerprint(
+            self.create_deliveries({1: 8, 2: 9, 3: 9}), ()
+        )
+        assert fingerprint != self.service.get_fingerprint(
+            self.create_deliveries({1: 8, 2: 8, 3: 9}), (1,)
+        )
+
+    def test_should_return_cached_result(self):
+        result = TourComputingResult([1, 2, 1], [(2, 480)])
+
+        self.service.add_result(self.map, self.fingerprints[0], result)
+
+        assert self.service.get_result(self.map, self.fingerprints[0]) is result
+        assert self.service.get_result(self.map, self.fingerprints[1]) is None
+        assert self.service.get_result(create_map(), self.fingerprints[0]) is None
+
+    def test_should_drop_least_recently_used_results(self, monkeypatch):
+        monkeypatch.setattr(Config, "TOUR_RESULT_CACHE_SIZE", 2)
+
+        self.service.add_result(
+            self.map, self.fingerprints[0], TourComputingResult([1], [])
+        )
+        self.service.add_result(
+            self.map, self.fingerprints[1], TourComputingResult([1], [])
+        )
+        self.service.get_result(self.map, self.fingerprints[0])
+        self.service.add_result(
+            self.map, self.fingerprints[2], TourComputingResult([1], [])
+        )
+
+        assert self.service.get_result(self.map, self.fingerprints[0]) is not None
+        assert self.service.get_result(self.map, self.fingerprints[1]) is None
+        assert self.service.get_result(self.map, self.fingerprints[2]) is not None
+
+    def test_should_drop_results_over_memory_limit(self, monkeypatch):
+        monkeypatch.setattr(
+            Config,
+            "TOUR_RESULT_CACHE_MEMORY",
+            TourResultCacheService.RESULT_ITEM_SIZE * 4,
+        )
+
+        self.service.add_result(
+            self.map, self.fingerprints[0], TourComputingResult([1, 2], [])
+        )
+        self.service.add_result(
+            self.map, self.fingerprints[1], TourComputingResult([1, 3], [])
+        )
+        self.service.add_result(
+            self.map, self.fingerprints[2], TourComputingResult([1, 2, 3], [])
+        )
+
+        assert self.service.get_result(self.map, self.fingerprints[0]) is None
+        assert self.service.get_result(self.map, self.fingerprints[1]) is None
+        assert self.service.get_result(self.map, self.fingerprints[2]) is not None
+
+    def test_should_clear_results_when_map_changes(self):
+        MapService.instance().set_map(self.map)
+        self.service.add_result(
+            self.map, self.fingerprints[0], TourComputingResult([1], [])
+        )
+
+        MapService.instance().set_map(self.map)
+        assert self.service.get_result(self.map, self.fingerprints[0]) is not None
+
+        MapService.instance().set_map(create_map())
+        assert self.service.get_result(self.map, self.fingerprints[0]) is None
@@ -1,3 +1,6 @@
+from time import monotonic, sleep
+
+from PyQt6.QtCore import QCoreApplication
 from pytest import fixture
 
 from src.models.delivery_man.delivery_man import DeliveryMan
@@ -6,9 +9,13 @@ from src.models.map.map import Map
 from src.models.map.map_size import MapSize
 from src.models.map.position import Position
 from src.models.map.segment import Segment
+from src.models.tour import ComputedTour
 from src.services.delivery_man.delivery_man_service import DeliveryManService
 from src.services.map.map_service import MapService
+from src.services.tour import tour_service
+from src.services.tour.tour_computing_pool_service import TourComputingPoolService
 from src.services.tour.tour_service import TourService
+from src.services.tour.tour_time_computing_service import TourTimeComputingService
 
 
 class TestTourService:
@@ -62,6 +69,8 @@ class TestTourService:
 
         yield
 
+        TourComputingPoolService.instance().shutdown()
+        TourComputingPoolService.reset()
         TourService.reset()
         DeliveryManService.reset()
         MapService.reset()
@@ -154,3 +163,235 @@ class TestTourService:
             )
             is not None
         )
+
+    def test_should_compute_once_for_many_edits(self, monkeypatch):
+        application = QCoreApplication.instance() or QCoreApplication([])
+        workers = []
+
+        class CountedTourComputingWorker(tour_service.TourComputingWorker):
+            def __init__(self, *args):
+                super().__init__(*args)
+                workers.append(self)
+
+        monkeypatch.setattr(
+            tour_service, "TourComputingWorker", CountedTourComputingWorker
+        )
+        computed_tours = []
+        self.service.computed_tours.subscribe(computed_tours.append)
+
+        delivery_requests = [
+            self.service.add_delivery_request(position, 8, self.delivery_man.id)
+            for position in [Position(1, 2), Position(2, 2), Position(3, 3)]
+        ]
+
+        # Unlike added deliveries, time window changes need the tours to be computed
+        for delivery_request, time_window in zip(delivery_requests, [9, 10, 11]):
+            self.service.update_delivery_request_time_window(
+                delivery_request.id, self.delivery_man.id, time_window
+            )
+
+        is_computing = []
+        self.service.is_computing.subscribe(is_computing.append)
+        deadline = monotonic() + 10
+        while is_computing[-1] and monotonic() < deadline:
+            application.processEvents()
+
+        tour_request = self.service.get_tour_requests()[self.delivery_man.id]
+        computed_tour = computed_tours[-1][self.delivery_man.id]
+
+        assert len(workers) == 1
+        assert isinstance(computed_tour, ComputedTour)
+        assert computed_tour.deliveries.keys() == tour_request.deliveries.keys()
+
+    def test_should_stop_computing_when_cleared_before_computation(self, monkeypatch):
+        application = QCoreApplication.instance() or QCoreApplication([])
+        workers = []
+        monkeypatch.setattr(
+            tour_service, "TourComputingWorker", lambda *args: workers.append(args)
+        )
+        is_computing = []
+        self.service.is_computing.subscribe(is_computing.append)
+
+        delivery_request = self.service.add_delivery_request(
+            Position(1, 2), 8, self.delivery_man.id
+        )
+        self.service.update_delivery_request_time_window(
+            delivery_request.id, self.delivery_man.id, 9
+        )
+        assert is_computing[-1]
+
+        self.service.clear()
+
+        deadline = monotonic() + 2 * TourService.COMPUTING_DELAY / 1000
+        while monotonic() < deadline:
+            application.processEvents()
+
+        assert workers == []
+        assert not is_computing[-1]
+
+    def test_should_stop_computing_when_cleared_during_computation(self, monkeypatch):
+        application = QCoreApplication.instance() or QCoreApplication([])
+        workers = []
+
+        class CancelledTourComputingWorker(tour_service.TourComputingWorker):
+            def __init__(self, *args):
+                super().__init__(*args)
+                workers.append(self)
+
+            def run(self):
+                # Keep running until the computation is cancelled
+                deadline = monotonic() + 10
+                while not self.is_cancelled and monotonic() < deadline:
+                    sleep(0.01)
+                super().run()
+
+        monkeypatch.setattr(
+            tour_service, "TourComputingWorker", CancelledTourComputingWorker
+        )
+        completions = []
+        handle_tour_complete = self.service.handle_tour_complete
+
+        def count_tour_complete():
+            handle_tour_complete()
+            completions.append(True)
+
+        self.service.handle_tour_complete = count_tour_complete
+        is_computing = []
+        self.service.is_computing.subscribe(is_computing.append)
+
+        delivery_request = self.service.add_delivery_request(
+            Position(1, 2), 8, self.delivery_man.id
+        )
+        self.service.update_delivery_request_time_window(
+            delivery_request.id, self.delivery_man.id, 9
+        )
+
+        deadline = monotonic() + 10
+        while not workers and monotonic() < deadline:
+            application.processEvents()
+
+        self.service.clear()
+
+        deadline = monotonic() + 10
+        while not completions and monotonic() < deadline:
+            application.processEvents()
+
+        assert completions == [True]
+        assert len(workers) == 1
+        assert not is_computing[-1]
+        assert self.service.get_computed_tours() == {}
+
+    def test_should_insert_delivery_in_computed_tour(self):
+        application = QCoreApplication.instance() or QCoreApplication([])
+        computed_tours = []
+        self.service.computed_tours.subscribe(computed_tours.append)
+        is_computing = []
+        self.service.is_computing.subscribe(is_computing.append)
+
+        self.service.add_delivery_request(Position(1, 2), 8, self.delivery_man.id)
+
+        deadline = monotonic() + 10
+        while is_computing[-1] and monotonic() < deadline:
+            application.processEvents()
+
+        computations = []
+        self.service.compute_tours = lambda: computations.append(True)
+
+        self.service.add_delivery_request(Position(3, 3), 9, self.delivery_man.id)
+
+        tour_request = self.service.get_tour_requests()[self.delivery_man.id]
+        computed_tour = computed_tours[-1][self.delivery_man.id]
+
+        assert computations == []
+        assert isinstance(computed_tour, ComputedTour)
+        assert computed_tour.deliveries.keys() == tour_request.deliveries.keys()
+        assert not computed_tour.is_optimal
+
+    def test_should_compute_tours_when_insertion_fails(self, monkeypatch):
+        application = QCoreApplication.instance() or QCoreApplication([])
+        is_computing = []
+        self.service.is_computing.subscribe(is_computing.append)
+
+        self.service.add_delivery_request(Position(1, 2), 8, self.delivery_man.id)
+
+        deadline = monotonic() + 10
+        while is_computing[-1] and monotonic() < deadline:
+            application.processEvents()
+
+        def fail(*args):
+            raise RuntimeError("Invalid route")
+
+        monkeypatch.setattr(
+            TourTimeComputingService.instance(),
+            "get_computed_tour_from_route_ids",
+            fail,
+        )
+        computations = []
+        self.service.compute_tours = lambda: computations.append(True)
+
+        self.service.add_delivery_request(Position(3, 3), 9, self.delivery_man.id)
+
+        assert computations == [True]
+
+    def test_should_remove_delivery_from_computed_tour(self):
+        computed_tours = []
+        self.service.computed_tours.subscribe(computed_tours.append)
+
+        delivery_request = self.service.add_delivery_request(
+            Position(1, 2), 8, self.delivery_man.id
+        )
+        self.service.add_delivery_request(Position(3, 3), 9, self.delivery_man.id)
+
+        computations = []
+        self.service.compute_tours = lambda: computations.append(True)
+
+        self.service.remove_delivery_request(delivery_request.id, self.delivery_man.id)
+
+        tour_request = self.service.get_tour_requests()[self.delivery_man.id]
+        computed_tour = computed_tours[-1][self.delivery_man.id]
+
+        assert computations == []
+        assert computed_tour.deliveries.keys() == tour_request.deliveries.keys()
+
+    def test_should_compute_tours_when_removal_fails(self, monkeypatch):
+        delivery_request = self.service.add_delivery_request(
+            Position(1, 2), 8, self.delivery_man.id
+        )
+        self.service.add_delivery_request(Position(3, 3), 9, self.delivery_man.id)
+
+        def fail(*args):
+            raise RuntimeError("Invalid route")
+
+        monkeypatch.setattr(
+            TourTimeComputingService.instance(),
+            "get_computed_tour_from_route_ids",
+            fail,
+        )
+        computations = []
+        self.service.compute_tours = lambda: computations.append(True)
+
+        self.service.remove_delivery_request(delivery_request.id, self.delivery_man.id)
+
+        assert computations == [True]
+
+    def test_should_move_delivery_between_computed_tours(self):
+        delivery_man_2 = DeliveryManService.instance().create_delivery_man("Jane Doe")
+        computed_tours = []
+        self.service.computed_tours.subscribe(computed_tours.append)
+
+        delivery_request = self.service.add_delivery_request(
+            Position(1, 2), 8, self.delivery_man.id
+        )
+
+        computations = []
+        self.service.compute_tours = lambda: computations.append(True)
+
+        self.service.update_delivery_request_delivery_man(
+            delivery_request.id, self.delivery_man.id, delivery_man_2.id
+        )
+
+        assert computations == []
+        assert self.delivery_man.id not in computed_tours[-1]
+        assert computed_tours[-1][delivery_man_2.id].deliveries.keys() == {
+            delivery_request.id
+        }
@@ -0,0 +1,280 @@
+import concurrent.futures
+import multiprocessing
+import os
+import queue
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.models.map import Map, RoadGraph
+from src.services.map.map_service import MapService
+from src.services.routing.distance_matrix_service import DistanceMatrixService
+from src.services.routing.road_graph_service import RoadGraphService
+from src.services.routing.shortest_path_service import ShortestPathService
+from src.services.singleton import Singleton
+
+
+class TourComputingPoolService(Singleton):
+    """Long-lived pool of processes used to parallelize the tour computations.
+
+    The road graph of the current map is sent once to every process when it starts. Tasks then only send intersection IDs.
+    The pool is restarted when a new map is published by the MapService.
+
+    Computations are identified by a generation number shared with the processes. Starting a new computation or
+    cancelling the computations changes it, so that tasks of older computations can stop early. Tasks can also report
+    intermediate results, which are read in the main process with get_progress.
+    """
+
+    MAX_WORKERS = multiprocessing.cpu_count()
+    """Number of processes of the pool
+    """
+
+    __executor: Optional[concurrent.futures.ProcessPoolExecutor]
+    __map: Optional[Map]
+    __worker_graph: Optional[RoadGraph] = None
+    __computation_generation = multiprocessing.Value("q", 0)
+    __progress_queue = multiprocessing.Queue()
+
+    def __init__(self) -> None:
+        self.__executor = None
+        self.__map = None
+
+        MapService.instance().map.subscribe(self.set_map)
+
+    def set_map(self, map: Optional[Map]) -> None:
+        """Restart the pool with the graph of a map. Does nothing if the pool is already running for this map.
+
+        Args:
+            map (Optional[Map]): Map to send to the processes, None to only stop the pool
+
+        Returns:
+            None
+        """
+        if map is self.__map and self.__executor:
+            return
+
+        self.shutdown()
+        self.__map = map
+
+        if map:
+            self.__start(RoadGraphService.instance().get_road_graph(map))
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> concurrent.futures.Future:
+        """Run a function in a process of the pool.
+
+        Args:
+            fn (Callable[..., Any]): Function to run, it must be picklable
+            *args (Any): Arguments of the function
+
+        Returns:
+            concurrent.futures.Future: Future of the result
+        """
+        if not self.__executor:
+            self.__start(None)
+
+        return self.__executor.submit(fn, *args)
+
+    def compute_shortest_paths(
+        self, map: Map, source: int, targets: List[int]
+    ) -> concurrent.futures.Future:
+        """Compute the shortest paths from a source to many targets in a process of the pool.
+
+        Args:
+            map (Map): Map to compute the shortest paths on
+            source (int): ID of the source intersection
+            targets (List[int]): IDs of the target intersections
+
+        Returns:
+            concurrent.futures.Future: Future of the lengths and paths to the reachable targets
+        """
+        self.set_map(map)
+
+        return self.submit(
+            TourComputingPoolService.compute_shortest_paths_in_worker, source, targets
+        )
+
+    def compute_distance_matrix_rows(
+        self, map: Map, lengths_path: str, next_hops_path: str, start: int, stop: int
+    ) -> concurrent.futures.Future:
+        """Compute rows of the matrices of the DistanceMatrixService in a process of the pool.
+
+        Args:
+            map (Map): Map of the matrices
+            lengths_path (str): Path of the file of the lengths
+            next_hops_path (str): Path of the file of the next hops
+            start (int): Index of the first row to compute
+            stop (int): Index after the last row to compute
+
+        Returns:
+            concurrent.futures.Future: Future completed once the rows are written
+        """
+        self.set_map(map)
+
+        return self.submit(
+            TourComputingPoolService.compute_distance_matrix_rows_in_worker,
+            lengths_path,
+            next_hops_path,
+            start,
+            stop,
+        )
+
+    def start_computation(self) -> int:
+        """Start a new computation, which cancels the previous ones.
+
+        Returns:
+            int: ID of the computation, to check if it was cancelled with is_computation_cancelled
+        """
+        with TourComputingPoolService.__computation_generation.get_lock():
+            TourComputingPoolService.__computation_generation.value += 1
+            return TourComputingPoolService.__computation_generation.value
+
+    def cancel_computations(self) -> None:
+        """Cancel all the computations that were started.
+
+        Returns:
+            None
+        """
+        self.start_computation()
+
+    def get_progress(self) -> List[Tuple[int, Any, Any]]:
+        """Get the intermediate results reported since the last call, by all the computations.
+
+        Returns:
+            List[Tuple[int, Any, Any]]: Computation ID, key and value of each intermediate result
+        """
+        progress = []
+
+        while True:
+            try:
+                progress.append(TourComputingPoolService.__progress_queue.get_nowait())
+            except queue.Empty:
+                return progress
+
+    def shutdown(self) -> None:
+        """Stop the processes of the pool. Pending tasks are cancelled.
+
+        Returns:
+            None
+        """
+        if self.__executor:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+            self.__executor = None
+
+    @staticmethod
+    def is_computation_cancelled(computation_id: Optional[int]) -> bool:
+        """Check if a computation was cancelled. Can be called in the worker processes.
+
+        Args:
+            computation_id (Optional[int]): ID of the computation returned by start_computation, None for a
+            computation that cannot be cancelled
+
+        Returns:
+            bool: True if another computation was started or the computations were cancelled
+        """
+        return (
+            computation_id is not None
+            and TourComputingPoolService.__computation_generation.value
+            != computation_id
+        )
+
+    @staticmethod
+    def report_progress(computation_id: Optional[int], key: Any, value: Any) -> None:
+        """Report an intermediate result of a computation. Can be called in the worker processes.
+
+        Args:
+            computation_id (Optional[int]): ID of the computation returned by start_computation, nothing is reported
+            for None
+            key (Any): Identifier of the task that produced the result, it must be picklable
+            value (Any): Intermediate result, it must be picklable
+
+        Returns:
+            None
+        """
+        if computation_id is not None:
+            TourComputingPoolService.__progress_queue.put((computation_id, key, value))
+
+    @staticmethod
+    def initialize_worker(
+        graph: Optional[RoadGraph],
+        computation_generation,
+        progress_queue: multiprocessing.Queue,
+    ) -> None:
+        """Keep the road graph of the map in a process of the pool. Runs in the worker process when it starts.
+
+        Args:
+            graph (Optional[RoadGraph]): Road graph of the map
+            computation_generation (multiprocessing.Value): Generation number of the computations, shared with the
+            main process
+            progress_queue (multiprocessing.Queue): Queue of the intermediate results, read by the main process
+        """
+        TourComputingPoolService.__worker_graph = graph
+        TourComputingPoolService.__computation_generation = computation_generation
+        TourComputingPoolService.__progress_queue = progress_queue
+
+    @staticmethod
+    def compute_shortest_paths_in_worker(
+        source: int, targets: List[int]
+    ) -> Tuple[Dict[int, float], Dict[int, List[int]]]:
+        """Compute the shortest paths from a source to many targets on the graph of the process. Runs in the worker process.
+
+        Args:
+            source (int): ID of the source intersection
+            targets (List[int]): IDs of the target intersections
+
+        Returns:
+            Tuple[Dict[int, float], Dict[int, List[int]]]: Lengths and paths to the reachable targets
+        """
+        shortest_path_service = ShortestPathService.instance()
+        lengths, predecessors = shortest_path_service.compute_shortest_paths(
+            TourComputingPoolService.__worker_graph, source, targets
+        )
+
+        return lengths, {
+            target: shortest_path_service.build_path(predecessors, target)
+            for target in lengths
+        }
+
+    @staticmethod
+    def compute_distance_matrix_rows_in_worker(
+        lengths_path: str, next_hops_path: str, start: int, stop: int
+    ) -> None:
+        """Compute rows of the matrices of the DistanceMatrixService on the graph of the process. Runs in the worker
+        process.
+
+        Args:
+            lengths_path (str): Path of the file of the lengths
+            next_hops_path (str): Path of the file of the next hops
+            start (int): Index of the first row to compute
+            stop (int): Index after the last row to compute
+
+        Returns:
+            None
+        """
+        DistanceMatrixService.instance().compute_rows(
+            TourComputingPoolService.__worker_graph,
+            lengths_path,
+            next_hops_path,
+            start,
+            stop,
+        )
+
+    def __start(self, graph: Optional[RoadGraph]) -> None:
+        """Start the processes of the pool and send them the road graph of the map.
+
+        Args:
+            graph (Optional[RoadGraph]): Road graph of the map
+
+        Returns:
+            None
+        """
+        self.__executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.MAX_WORKERS,
+            initializer=TourComputingPoolService.initialize_worker,
+            initargs=(
+                graph,
+                TourComputingPoolService.__computation_generation,
+                TourComputingPoolService.__progress_queue,
+            ),
+        )
+
+        # Start the processes now so that the first computation does not wait for them
+        for _ in range(self.MAX_WORKERS):
+            self.__executor.submit(os.getpid)
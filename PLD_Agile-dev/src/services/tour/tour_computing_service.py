@@ -1,136 +1,547 @@
 import concurrent.futures
+import functools
 import itertools
-import multiprocessing
 import platform
-from typing import List, Optional
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 import networkx as nx
+import numpy as np
 
 from src.config import Config
-from src.models.map import Map, Segment
+from src.models.errors.computing_errors import (
+    TourComputingCancelledError,
+    TourInfeasibleError,
+)
+from src.models.map import Map, RoadGraph, Segment
 from src.models.tour import (
-    DeliveriesComputingResult,
     DeliveryLocation,
     DeliveryRequest,
     TourComputingResult,
+    TourID,
     TourRequest,
 )
+from src.services.routing.distance_cache_service import DistanceCacheService
+from src.services.routing.distance_matrix_service import DistanceMatrixService
+from src.services.routing.road_graph_service import RoadGraphService
 from src.services.singleton import Singleton
+from src.services.tour.tour_computing_pool_service import TourComputingPoolService
+from src.services.tour.tour_constraint_service import (
+    ServiceTimes,
+    TourConstraintService,
+)
+from src.services.tour.tour_evaluation_service import TourEvaluationService
+from src.services.tour.tour_local_search_service import TourLocalSearchService
+from src.services.tour.tour_result_cache_service import (
+    TourFingerprint,
+    TourResultCacheService,
+)
+
+DynamicProgrammingLabel = Tuple[float, float, Optional["DynamicProgrammingLabel"], int]
+"""Label of a partial tour in the dynamic programming solver: (length, departure time, previous label, index of the last point)
+"""
 
 
 class TourComputingService(Singleton):
-    def compute_tour(self, tour_request: TourRequest, map: Map) -> TourComputingResult:
+    MAX_DELIVERIES_DYNAMIC_PROGRAMMING = 18
+    """Maximum number of deliveries in a tour for which the exact dynamic programming solver is used
+    """
+    MAX_DELIVERIES_TIME_WINDOW_BLOCK = 11
+    """Maximum number of deliveries in each time window of a tour for which the exact time window blocks solver is used
+    """
+    MAX_DELIVERIES_BRANCH_AND_BOUND = 30
+    """Maximum number of deliveries in a tour for which the branch and bound solver is used, larger tours are solved by
+    the large neighbourhood search
+    """
+    MAX_LARGE_NEIGHBOURHOOD_SEARCH_ITERATIONS = 20000
+    """Maximum number of iterations of the large neighbourhood search, which also stops at the deadline
+    """
+    LARGE_NEIGHBOURHOOD_SEARCH_SEED = 0
+    """Seed of the large neighbourhood search, so that the same tour request gives the same tour
+    """
+    MAX_BRANCH_AND_BOUND_EXPLORED_NODES = 200000
+    """Maximum number of partial tours explored by the branch and bound solver before returning its best tour
+    """
+    GREEDY_TIME_BUDGET = 0.1
+    """Maximum time in seconds spent improving the greedy tour published before the search starts
+    """
+    PERMUTATION_BATCH_SIZE = 10000
+    """Number of orders of the deliveries evaluated together by the brute force solvers
+    """
+    CANCELLATION_CHECK_INTERVAL = 1000
+    """Number of partial tours explored by the branch and bound solver between two checks of the cancellation
+    """
+
+    DISTANCE_MATRIX_ROWS_PER_TASK = 64
+    """Number of rows of the precomputed distance matrices computed by each task sent to the tour computing pool
+    """
+
+    def compute_tour(
+        self,
+        tour_request: TourRequest,
+        map: Map,
+        computation_id: Optional[int] = None,
+    ) -> TourComputingResult:
         """Compute tours for a list of tour requests.
 
+        The search stops after Config.TOUR_COMPUTING_TIME_BUDGET seconds and returns the best tour found so far.
+
         Args:
             tour_request (TourRequest): The tour request to compute the tour for.
             map (Map): The map to compute the tour on.
+            computation_id (Optional[int]): ID of the computation given by the TourComputingPoolService, the solver
+            stops with a TourComputingCancelledError when it is cancelled. Defaults to a computation that cannot be
+            cancelled.
 
         Returns:
             TourComputingResult: Result of the computation
+
+        Raises:
+            TourInfeasibleError: If a delivery cannot be made in its time window whatever the order of the deliveries
         """
-        map_graph = self.create_graph_from_map(map)
-        warehouse = DeliveryRequest(
-            DeliveryLocation(Segment(-1, "", map.warehouse, map.warehouse, 0), 0), 8
-        )
+        deliveries = self.__get_tour_deliveries(tour_request, map)
+        graph = RoadGraphService.instance().get_road_graph(map)
+
+        self.check_tour_feasibility(graph, deliveries)
 
         os_name = platform.system()
+
         if os_name == "Linux":
-            max_deliveries_brut_force = 8
+            self.compute_delivery_distances_parallel(map, deliveries)
         else:
-            max_deliveries_brut_force = 6
+            self.compute_delivery_distances(graph, deliveries)
 
-        if os_name == "Linux":
-            shortest_path_graph = self.compute_shortest_path_graph_parallel(
-                map_graph, [warehouse] + list(tour_request.deliveries.values())
+        return self.schedule_tour(
+            graph,
+            deliveries,
+            computation_id,
+            time.time() + Config.TOUR_COMPUTING_TIME_BUDGET,
+        )
+
+    def submit_tour(
+        self,
+        tour_request: TourRequest,
+        map: Map,
+        computation_id: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> concurrent.futures.Future:
+        """Start the computation of a tour without waiting for its result.
+
+        Args:
+            tour_request (TourRequest): The tour request to compute the tour for.
+            map (Map): The map to compute the tour on.
+            computation_id (Optional[int]): ID of the computation given by the TourComputingPoolService. Defaults to a
+            computation that cannot be cancelled.
+            deadline (Optional[float]): Time (as returned by time.time()) at which the search stops and returns the
+            best tour found so far. Defaults to no limit.
+
+        Returns:
+            concurrent.futures.Future: Future of the TourComputingResult of the tour, raising a TourInfeasibleError if
+            a delivery cannot be made in its time window whatever the order of the deliveries
+        """
+        return self.submit_tours([tour_request], map, computation_id, deadline)[
+            tour_request.id
+        ]
+
+    def submit_tours(
+        self,
+        tour_requests: List[TourRequest],
+        map: Map,
+        computation_id: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Dict[TourID, concurrent.futures.Future]:
+        """Start the computation of several tours without waiting for their results.
+
+        The distance stage of all the tours is sent to the tour computing pool at once, so the shortest paths of every
+        courier are computed in parallel. The scheduling stages of all the tours are then sent to the pool one after the
+        other without any other work, so every search starts at once and a long search for one tour does not delay the
+        others.
+
+        When a computation ID is given, each search reports its greedy tour first, then the better tours it finds, as
+        progress to the TourComputingPoolService with the ID of the tour request as key.
+
+        Optimal results are kept by the TourResultCacheService: a tour with the same deliveries and time windows as a
+        tour computed before is not computed again, its future is already done.
+
+        Args:
+            tour_requests (List[TourRequest]): The tour requests to compute the tours for.
+            map (Map): The map to compute the tours on.
+            computation_id (Optional[int]): ID of the computation given by the TourComputingPoolService. Defaults to a
+            computation that cannot be cancelled.
+            deadline (Optional[float]): Time (as returned by time.time()) at which the searches stop and return the
+            best tours found so far. Defaults to no limit.
+
+        Returns:
+            Dict[TourID, concurrent.futures.Future]: Future of the TourComputingResult of each tour, raising a
+            TourInfeasibleError if a delivery cannot be made in its time window whatever the order of the deliveries
+        """
+        graph = RoadGraphService.instance().get_road_graph(map)
+        result_cache_service = TourResultCacheService.instance()
+        futures: Dict[TourID, concurrent.futures.Future] = {}
+        tours: List[Tuple[TourRequest, List[DeliveryRequest], TourFingerprint]] = []
+
+        for tour_request in tour_requests:
+            deliveries = self.__get_tour_deliveries(tour_request, map)
+            fingerprint = result_cache_service.get_fingerprint(
+                deliveries, self.__get_solver_settings()
             )
+            cached_result = result_cache_service.get_result(map, fingerprint)
+            if cached_result:
+                futures[tour_request.id] = self.__create_done_future(cached_result)
+            else:
+                tours.append((tour_request, deliveries, fingerprint))
+
+        # A single search from the warehouse gives the distances used to check every tour
+        DistanceCacheService.instance().compute_missing_shortest_paths(
+            graph,
+            {
+                map.warehouse.id: [
+                    delivery.location.segment.origin.id
+                    for _, deliveries, _ in tours
+                    for delivery in deliveries[1:]
+                ]
+            },
+        )
+
+        feasible_tours: List[
+            Tuple[TourRequest, List[DeliveryRequest], TourFingerprint]
+        ] = []
+        for tour_request, deliveries, fingerprint in tours:
+            try:
+                self.check_tour_feasibility(graph, deliveries)
+                feasible_tours.append((tour_request, deliveries, fingerprint))
+            except TourInfeasibleError as e:
+                futures[tour_request.id] = self.__create_done_future(exception=e)
+
+        # The searches of all the tours are sent together, so every courier is computed in parallel
+        os_name = platform.system()
+        targets_by_source: Dict[int, Set[int]] = {}
+        for _, deliveries, _ in feasible_tours:
+            for source, targets in self.__get_delivery_pairs(deliveries).items():
+                targets_by_source.setdefault(source, set()).update(targets)
+        delivery_pairs = {
+            source: list(targets) for source, targets in targets_by_source.items()
+        }
+
+        if os_name == "Linux":
+            self.__compute_missing_shortest_paths_parallel(map, delivery_pairs)
         else:
-            shortest_path_graph = self.compute_shortest_path_graph(
-                map_graph, [warehouse] + list(tour_request.deliveries.values())
+            DistanceCacheService.instance().compute_missing_shortest_paths(
+                graph, delivery_pairs
             )
 
-        if len(tour_request.deliveries) <= max_deliveries_brut_force:
-            if os_name == "Linux":
-                tsp_result = self.solve_tsp_parallel(shortest_path_graph)
+        for tour_request, deliveries, fingerprint in feasible_tours:
+            try:
+                shortest_path_graph = self.create_shortest_path_graph(graph, deliveries)
+            except TourInfeasibleError as e:
+                futures[tour_request.id] = self.__create_done_future(exception=e)
+                continue
+
+            if os_name != "Linux":
+                future = concurrent.futures.Future()
+                try:
+                    future.set_result(
+                        self.solve_shortest_path_graph(
+                            shortest_path_graph,
+                            computation_id,
+                            tour_request.id,
+                            deadline,
+                        )
+                    )
+                except Exception as e:
+                    future.set_exception(e)
             else:
-                tsp_result = self.solve_tsp(shortest_path_graph)
+                future = TourComputingPoolService.instance().submit(
+                    TourComputingService.solve_shortest_path_graph_in_worker,
+                    shortest_path_graph,
+                    computation_id,
+                    tour_request.id,
+                    deadline,
+                )
 
-        else:
-            tsp_result = self.solve_greedy_tsp(shortest_path_graph)
+            future.add_done_callback(
+                functools.partial(self.__cache_result, map, fingerprint)
+            )
+            futures[tour_request.id] = future
 
-        return tsp_result
+        return futures
 
-    def create_graph_from_map(self, map: Map) -> nx.Graph:
-        """Create a directed graph from a Map object.
+    @staticmethod
+    def solve_shortest_path_graph_in_worker(
+        shortest_path_graph: nx.DiGraph,
+        computation_id: Optional[int],
+        tour_id: Optional[TourID],
+        deadline: Optional[float],
+    ) -> TourComputingResult:
+        """Find the order of the deliveries of a shortest path graph. Runs in a process of the tour computing pool.
 
         Args:
-            map (Map): The Map object to create the graph from.
+            shortest_path_graph (nx.DiGraph): The shortest path graph of the tour, starting with the warehouse.
+            computation_id (Optional[int]): ID of the computation given by the TourComputingPoolService.
+            tour_id (Optional[TourID]): ID of the tour, used as key of the reported progress.
+            deadline (Optional[float]): Time at which the search stops and returns the best tour found so far.
 
         Returns:
-            nx.Graph: The directed graph created from the Map object.
+            TourComputingResult: Result of the computation
         """
-        graph = nx.DiGraph()
+        return TourComputingService.instance().solve_shortest_path_graph(
+            shortest_path_graph, computation_id, tour_id, deadline
+        )
 
-        graph.add_node(map.warehouse.id)
+    def schedule_tour(
+        self,
+        graph: RoadGraph,
+        deliveries: List[DeliveryRequest],
+        computation_id: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> TourComputingResult:
+        """Find the order of the deliveries of a tour from the distances between them, which must already be computed.
 
-        for intersection in map.intersections.values():
-            graph.add_node(
-                intersection.id,
-                latitude=float(intersection.latitude),
-                longitude=float(intersection.longitude),
-            )
+        This is the only part of the computation that depends on the time windows: changing a time window only runs
+        it again.
 
-        for segment in map.get_all_segments():
-            graph.add_edge(
-                segment.origin.id, segment.destination.id, length=segment.length
-            )
+        Args:
+            graph (RoadGraph): The road graph the distances between delivery locations were computed on.
+            deliveries (List[DeliveryRequest]): The list of delivery requests, starting with the warehouse.
+            computation_id (Optional[int]): ID of the computation given by the TourComputingPoolService. Defaults to a
+            computation that cannot be cancelled.
+            deadline (Optional[float]): Time (as returned by time.time()) at which the search stops and returns the
+            best tour found so far. Defaults to no limit.
 
-        return graph
+        Returns:
+            TourComputingResult: Result of the computation
+        """
+        return self.solve_shortest_path_graph(
+            self.create_shortest_path_graph(graph, deliveries),
+            computation_id,
+            deadline=deadline,
+        )
 
-    def compute_shorted_path_graph_multiprocessing(
+    def solve_shortest_path_graph(
         self,
-        graph: nx.Graph,
         shortest_path_graph: nx.DiGraph,
-        source_deliveries: List[DeliveryRequest],
-        target_deliveries: List[DeliveryRequest],
-    ) -> nx.DiGraph:
-        for source in source_deliveries:
-            for target in target_deliveries:
-                if source != target:
-                    # add time windows constraints
-                    if (
-                        target.time_window + 1 <= source.time_window
-                        and target != target_deliveries[0]
-                    ):
-                        continue
-                    try:
-                        shortest_path_length, shortest_path = nx.single_source_dijkstra(
-                            graph,
-                            source.location.segment.origin.id,
-                            target.location.segment.origin.id,
-                            weight="length",
-                        )
-                    except nx.NetworkXNoPath:
-                        continue
-                    shortest_path_graph.add_edge(
-                        source.location.segment.origin.id,
-                        target.location.segment.origin.id,
-                        length=shortest_path_length,
-                        path=shortest_path,
-                    )
-        return shortest_path_graph
+        computation_id: Optional[int] = None,
+        tour_id: Optional[TourID] = None,
+        deadline: Optional[float] = None,
+    ) -> TourComputingResult:
+        """Find the order of the deliveries of a shortest path graph with the solver suited to its size: dynamic
+        programming over time window blocks for small tours and tours with few deliveries per time window, branch and
+        bound for medium ones and large neighbourhood search for large ones.
+
+        The greedy tour is found first and reported as progress, so a first tour is published right away while the
+        search runs. It is then the starting tour of the branch and bound and of the large neighbourhood search, and
+        is returned when the dynamic programming solver does not finish before the deadline.
 
-    def compute_shortest_path_graph_parallel(
-        self, graph: nx.Graph, deliveries: List[DeliveryRequest]
-    ) -> nx.DiGraph:
-        """Compute the shortest path graph between delivery locations.
+        Args:
+            shortest_path_graph (nx.DiGraph): The shortest path graph of the tour, starting with the warehouse.
+            computation_id (Optional[int]): ID of the computation given by the TourComputingPoolService. Defaults to a
+            computation that cannot be cancelled.
+            tour_id (Optional[TourID]): ID of the tour, used as key of the progress reported when a better tour is
+            found. Defaults to no progress reported.
+            deadline (Optional[float]): Time (as returned by time.time()) at which the search stops and returns the
+            best tour found so far. Defaults to no limit.
+
+        Returns:
+            TourComputingResult: Result of the computation
+        """
+        is_cancelled = functools.partial(
+            TourComputingPoolService.is_computation_cancelled, computation_id
+        )
+        on_improvement = (
+            functools.partial(
+                TourComputingPoolService.report_progress, computation_id, tour_id
+            )
+            if tour_id is not None
+            else None
+        )
+
+        greedy_deadline = time.time() + self.GREEDY_TIME_BUDGET
+        greedy_result = self.solve_greedy_tsp(
+            shortest_path_graph,
+            is_cancelled,
+            min(greedy_deadline, deadline) if deadline is not None else greedy_deadline,
+        )
+        if greedy_result and on_improvement:
+            greedy_result.is_optimal = False
+            on_improvement(greedy_result)
+
+        blocks = self.__get_time_window_blocks(shortest_path_graph)
+
+        if (
+            shortest_path_graph.number_of_nodes() - 1
+            <= self.MAX_DELIVERIES_DYNAMIC_PROGRAMMING
+            or max(len(block) for block in blocks)
+            <= self.MAX_DELIVERIES_TIME_WINDOW_BLOCK
+        ):
+            try:
+                return self.solve_tsp_time_window_blocks(
+                    shortest_path_graph, is_cancelled, deadline
+                )
+            except TimeoutError:
+                pass
+
+        if (
+            shortest_path_graph.number_of_nodes() - 1
+            > self.MAX_DELIVERIES_BRANCH_AND_BOUND
+        ):
+            return self.solve_tsp_large_neighbourhood_search(
+                shortest_path_graph,
+                self.MAX_LARGE_NEIGHBOURHOOD_SEARCH_ITERATIONS,
+                is_cancelled,
+                deadline,
+                on_improvement,
+                self.LARGE_NEIGHBOURHOOD_SEARCH_SEED,
+                greedy_result or [],
+            )
+
+        return self.solve_tsp_branch_and_bound(
+            shortest_path_graph,
+            self.MAX_BRANCH_AND_BOUND_EXPLORED_NODES,
+            is_cancelled,
+            deadline,
+            on_improvement,
+            greedy_result or [],
+        )
+
+    def check_tour_feasibility(
+        self, graph: RoadGraph, deliveries: List[DeliveryRequest]
+    ) -> None:
+        """Check that every delivery can be made in its time window before the shortest paths between the deliveries
+        are computed.
+
+        Only the shortest paths from the warehouse are computed: by the triangle inequality, the difference of the
+        distances from the warehouse to two deliveries is a lower bound of the distance between them, which is enough
+        to find most deliveries that cannot be made in time.
+
+        Args:
+            graph (RoadGraph): The road graph to compute the shortest paths from the warehouse on.
+            deliveries (List[DeliveryRequest]): The list of delivery requests, starting with the warehouse.
+
+        Raises:
+            TourInfeasibleError: If a delivery cannot be made in its time window whatever the order of the deliveries
+        """
+        distance_cache_service = DistanceCacheService.instance()
+        points = [delivery.location.segment.origin.id for delivery in deliveries]
+        distance_cache_service.compute_missing_shortest_paths(
+            graph, {points[0]: points[1:]}
+        )
+        warehouse_lengths, _ = distance_cache_service.get_cached_shortest_paths(
+            graph, points[0], points[1:]
+        )
+        distances = [0.0] + [
+            warehouse_lengths.get(point, float("inf")) for point in points[1:]
+        ]
+
+        lengths = [
+            [
+                max(distances[target] - distances[source], 0.0)
+                if distances[source] != float("inf")
+                else 0.0
+                for target in range(len(points))
+            ]
+            for source in range(len(points))
+        ]
+
+        self.__check_service_times(
+            deliveries,
+            lengths,
+            TourConstraintService.instance().compute_service_times(
+                lengths, [delivery.time_window for delivery in deliveries]
+            ),
+        )
+
+    def compute_delivery_distances(
+        self, graph: RoadGraph, deliveries: List[DeliveryRequest]
+    ) -> None:
+        """Compute the shortest paths between every pair of delivery locations into the distance cache.
+
+        The distances do not depend on the time windows, so they are computed once and reused by every computation
+        with the same delivery locations. Only the paths that are not cached yet are computed.
+
+        Args:
+            graph (RoadGraph): The road graph to compute the shortest path distances and paths on.
+            deliveries (List[DeliveryRequest]): The list of delivery requests.
+
+        Returns:
+            None
+        """
+        DistanceCacheService.instance().compute_missing_shortest_paths(
+            graph, self.__get_delivery_pairs(deliveries)
+        )
+
+    def compute_delivery_distances_parallel(
+        self, map: Map, deliveries: List[DeliveryRequest]
+    ) -> None:
+        """Compute the shortest paths between every pair of delivery locations into the distance cache using the
+        processes of the tour computing pool.
+
+        The processes already have the graph of the map, only the intersection IDs of the deliveries are sent to them.
+        Only the paths that are not cached yet are computed.
 
         Args:
-            graph (nx.Graph): The graph to compute the shortest path distances and paths between delivery locations.
+            map (Map): The map to compute the shortest path distances and paths on.
             deliveries (List[DeliveryRequest]): The list of delivery requests.
 
+        Returns:
+            None
+        """
+        self.__compute_missing_shortest_paths_parallel(
+            map, self.__get_delivery_pairs(deliveries)
+        )
+
+    def precompute_distance_matrices(self, map: Map) -> None:
+        """Precompute the shortest paths between all the intersections of a map with the DistanceMatrixService, using
+        the processes of the tour computing pool. The distances of the tours on this map are then read from the
+        matrices instead of being computed.
+
+        Args:
+            map (Map): Map loaded from a file
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the map was not loaded from a file
+        """
+        distance_matrix_service = DistanceMatrixService.instance()
+        graph = RoadGraphService.instance().get_road_graph(map)
+        paths = distance_matrix_service.create_matrix_files(map)
+        size = graph.intersection_count
+        task_size = self.DISTANCE_MATRIX_ROWS_PER_TASK
+        row_ranges = [
+            (start, min(start + task_size, size)) for start in range(0, size, task_size)
+        ]
+
+        if platform.system() == "Linux":
+            futures = [
+                TourComputingPoolService.instance().compute_distance_matrix_rows(
+                    map, *paths, start, stop
+                )
+                for start, stop in row_ranges
+            ]
+            for future in futures:
+                future.result()
+        else:
+            for start, stop in row_ranges:
+                distance_matrix_service.compute_rows(graph, *paths, start, stop)
+
+        distance_matrix_service.save_matrix_files(map, *paths)
+
+    def create_shortest_path_graph(
+        self, graph: RoadGraph, deliveries: List[DeliveryRequest]
+    ) -> nx.DiGraph:
+        """Create the shortest path graph between delivery locations from the distance cache, keeping only the edges
+        that a tour meeting the time windows can use, as found by the TourConstraintService.
+
+        Args:
+            graph (RoadGraph): The road graph the shortest paths were computed on.
+            deliveries (List[DeliveryRequest]): The list of delivery requests, starting with the warehouse.
+
         Returns:
             nx.DiGraph: The directed graph with the shortest path distances and paths between delivery locations.
+
+        Raises:
+            TourInfeasibleError: If a delivery cannot be made in its time window whatever the order of the deliveries
         """
         G = nx.DiGraph()
         # Add delivery locations as nodes
@@ -139,105 +550,99 @@ class TourComputingService(Singleton):
                 delivery.location.segment.origin.id, timewindow=delivery.time_window
             )
 
-        max_cpu_count = multiprocessing.cpu_count()
-        if max_cpu_count > len(deliveries):
-            chunks = [deliveries]
-        else:
-            chunk_size = len(deliveries) // max_cpu_count
-            chunks = [
-                deliveries[i : i + chunk_size]
-                for i in range(0, len(deliveries), chunk_size)
-            ]
+        distance_cache_service = DistanceCacheService.instance()
+        points = list(G.nodes())
+        paths: Dict[int, Dict[int, List[int]]] = {}
+        lengths: List[List[float]] = []
+        for source in points:
+            (
+                source_lengths,
+                paths[source],
+            ) = distance_cache_service.get_cached_shortest_paths(graph, source, points)
+            lengths.append(
+                [
+                    source_lengths.get(target, float("inf"))
+                    if target != source
+                    else 0.0
+                    for target in points
+                ]
+            )
 
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=max_cpu_count
-        ) as executor:
-            futures = [
-                executor.submit(
-                    self.compute_shorted_path_graph_multiprocessing,
-                    graph,
-                    G,
-                    chunk,
-                    deliveries,
-                )
-                for chunk in chunks
-            ]
-            results = [
-                future.result() for future in concurrent.futures.as_completed(futures)
-            ]
+        constraint_service = TourConstraintService.instance()
+        service_times = constraint_service.compute_service_times(
+            lengths, [G.nodes[point]["timewindow"] for point in points]
+        )
+        deliveries_by_point = {
+            delivery.location.segment.origin.id: delivery for delivery in deliveries
+        }
+        self.__check_service_times(
+            [deliveries_by_point[point] for point in points], lengths, service_times
+        )
 
-        shortest_path_graph = nx.DiGraph()
-        # Merge all partial results
-        for partial_shortest_path_graph in results:
-            shortest_path_graph = nx.compose(
-                shortest_path_graph, partial_shortest_path_graph
-            )
+        # Only the legs that a tour meeting the time windows can use are kept
+        possible_legs = constraint_service.get_possible_legs(lengths, service_times)
+        for source_index, source in enumerate(points):
+            for target_index, target in enumerate(points):
+                if (
+                    possible_legs[source_index][target_index]
+                    and target in paths[source]
+                ):
+                    G.add_edge(
+                        source,
+                        target,
+                        length=lengths[source_index][target_index],
+                        path=paths[source][target],
+                    )
+
+        return G
+
+    def compute_shortest_path_graph_parallel(
+        self, map: Map, deliveries: List[DeliveryRequest]
+    ) -> nx.DiGraph:
+        """Compute the shortest path graph between delivery locations using the processes of the tour computing pool.
+
+        The processes already have the graph of the map, only the intersection IDs of the deliveries are sent to them.
+        Paths already in the distance cache are not computed again.
+
+        Args:
+            map (Map): The map to compute the shortest path distances and paths between delivery locations on.
+            deliveries (List[DeliveryRequest]): The list of delivery requests.
+
+        Returns:
+            nx.DiGraph: The directed graph with the shortest path distances and paths between delivery locations.
+        """
+        self.compute_delivery_distances_parallel(map, deliveries)
 
-        return shortest_path_graph
+        return self.create_shortest_path_graph(
+            RoadGraphService.instance().get_road_graph(map), deliveries
+        )
 
     def solve_tsp_multiprocessing(
-        self, permutations_chunk, warehouse_id, shortest_path_graph: nx.DiGraph
-    ):
-        shortest_cycle_length = float("inf")
-        shortest_cycle: List[DeliveriesComputingResult] = []
-        for permuted_points in permutations_chunk:
-            is_valid_tuple = True
-            permuted_points = list(permuted_points)
-            permuted_points = [warehouse_id] + permuted_points
-            cycle_length = 0
-            current_time = Config.INITIAL_DEPART_TIME
-
-            times = []
-
-            for i in range(len(permuted_points) - 1):
-                source = permuted_points[i]
-                target = permuted_points[i + 1]
-                if not shortest_path_graph.has_edge(source, target):
-                    is_valid_tuple = False
-                    break
-                travel_distance = shortest_path_graph[source][target]["length"]
-                cycle_length += travel_distance
-
-                # Check if the delivery time is within the time window
-                time_window = shortest_path_graph.nodes[target]["timewindow"] * 60
-                travel_time = (
-                    travel_distance / 15000
-                ) * 60  # Convert meters to minutes based on speed (15 km/h)
-                arrival_time = current_time + travel_time
-
-                if arrival_time < time_window:
-                    # Courier arrives before the time window, wait until it starts
-                    current_time = (
-                        time_window + Config.DELIVERY_TIME
-                    )  # Add 5 minutes for delivery
-                elif arrival_time <= time_window + Config.TIME_WINDOW_SIZE:
-                    # Courier arrives within the time window
-                    current_time = (
-                        arrival_time + Config.DELIVERY_TIME
-                    )  # Add 5 minutes for delivery
-                else:
-                    # Courier arrives after the time window, this tuple is invalid
-                    is_valid_tuple = False
-                    break
-
-                times.append(current_time - Config.DELIVERY_TIME)
-
-            if not is_valid_tuple:
-                continue
-            # Add the length of the last edge back to the starting point to complete the cycle
-            if not shortest_path_graph.has_edge(
-                permuted_points[-1], permuted_points[0]
-            ):
-                continue
-            cycle_length += shortest_path_graph[permuted_points[-1]][
-                permuted_points[0]
-            ]["length"]
+        self, first_delivery: int, lengths: np.ndarray, time_windows: np.ndarray
+    ) -> Tuple[float, Optional[List[int]]]:
+        """Find the shortest tour starting with a given delivery by trying every order of the other deliveries. Runs in
+        a process of the tour computing pool.
 
-            if cycle_length < shortest_cycle_length:
-                shortest_cycle_length = cycle_length
-                shortest_cycle = list(zip(permuted_points, [0] + times))
+        Args:
+            first_delivery (int): Index of the first delivery of the tours
+            lengths (np.ndarray): Distances between the points, the warehouse first
+            time_windows (np.ndarray): Time windows of the points
 
-            return shortest_cycle, shortest_cycle_length
+        Returns:
+            Tuple[float, Optional[List[int]]]: Length and indexes of the points of the shortest tour meeting the time
+            windows, None if there is none
+        """
+        # Permutations are generated in the process, only the first delivery is sent to it
+        return self.__find_shortest_permutation(
+            lengths,
+            time_windows,
+            [0, first_delivery],
+            [
+                delivery
+                for delivery in range(1, len(lengths))
+                if delivery != first_delivery
+            ],
+        )
 
     def solve_tsp_parallel(self, shortest_path_graph: nx.Graph) -> TourComputingResult:
         """Solves the Traveling Salesman Problem (TSP) for a given graph of delivery points and returns the shortest route.
@@ -248,72 +653,53 @@ class TourComputingService(Singleton):
         Returns:
             TourComputingResult: The result of the computed Tour.
         """
+        points, time_windows, lengths = self.__get_distance_matrix(shortest_path_graph)
         shortest_cycle_length = float("inf")
-        shortest_cycle: List[DeliveriesComputingResult] = []
-        route = []
-        # Generate all permutations of delivery points to find the shortest cycle
-        delivery_points = list(shortest_path_graph.nodes())
-        warehouse_id = delivery_points.pop(0)
-        permutations = itertools.permutations(delivery_points)
-        permutations = list(permutations)
-
-        max_cpu_count = multiprocessing.cpu_count()
-        if max_cpu_count > len(permutations):
-            chunks = [permutations]
-        else:
-            chunk_size = len(permutations) // max_cpu_count
-            chunks = [
-                permutations[i : i + chunk_size]
-                for i in range(0, len(permutations), chunk_size)
-            ]
-
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=max_cpu_count
-        ) as executor:
-            futures = [
-                executor.submit(
-                    self.solve_tsp_multiprocessing,
-                    chunk,
-                    warehouse_id,
-                    shortest_path_graph,
-                )
-                for chunk in chunks
-            ]
-            results = [
-                future.result() for future in concurrent.futures.as_completed(futures)
-            ]
+        shortest_cycle: Optional[List[int]] = None
+
+        # Only lengths and time windows are needed to score the permutations
+        futures = [
+            TourComputingPoolService.instance().submit(
+                self.solve_tsp_multiprocessing,
+                first_delivery,
+                np.array(lengths),
+                np.array(time_windows),
+            )
+            for first_delivery in range(1, len(points))
+        ]
 
-            for result in results:
-                if result == None:
-                    continue
-                if result[1] < shortest_cycle_length:
-                    shortest_cycle_length = result[1]
-                    shortest_cycle = result[0]
+        for future in concurrent.futures.as_completed(futures):
+            cycle_length, cycle = future.result()
+            if cycle_length < shortest_cycle_length:
+                shortest_cycle_length = cycle_length
+                shortest_cycle = cycle
 
-        # Compute the actual route from the shortest cycle
-        if shortest_cycle == []:
+        if shortest_cycle is None:
             return []
 
-        for i in range(len(shortest_cycle) - 1):
-            source, source_time = shortest_cycle[i]
-            target, target_time = shortest_cycle[i + 1]
-            dijkstra_path = shortest_path_graph[source][target]["path"]
-            route = route + dijkstra_path
-            route.pop()
-
-        # Complete the route with the path from the last delivery point to the first
-        dijkstra_path = shortest_path_graph[shortest_cycle[-1][0]][
-            shortest_cycle[0][0]
-        ]["path"]
+        return self.return_route_from_shortest_cycle(
+            shortest_path_graph, [points[point] for point in shortest_cycle]
+        )
 
-        route = route + dijkstra_path
+    def solve_greedy_tsp(
+        self,
+        shortest_path_graph: nx.Graph,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        deadline: Optional[float] = None,
+    ) -> TourComputingResult:
+        """Find a tour by going to the nearest delivery of the earliest time window, then improve it with the local
+        search of the TourLocalSearchService, which also repairs the missed time windows.
 
-        return TourComputingResult(
-            route=route,
-            deliveries=shortest_cycle[1:],
-        )
+        Args:
+            shortest_path_graph (nx.Graph): A graph representing the shortest path between delivery points.
+            is_cancelled (Optional[Callable[[], bool]]): Checked regularly, the local search raises a
+            TourComputingCancelledError when it returns True. Defaults to never cancelled.
+            deadline (Optional[float]): Time (as returned by time.time()) at which the local search stops and returns
+            the best tour found so far. Defaults to no limit.
 
-    def solve_greedy_tsp(self, shortest_path_graph: nx.Graph) -> TourComputingResult:
+        Returns:
+            TourComputingResult: The result of the computed Tour, None or an empty list if no tour was found.
+        """
         delivery_points = list(shortest_path_graph.nodes())
         warehouse_id = delivery_points.pop(0)
 
@@ -339,143 +725,105 @@ class TourComputingService(Singleton):
                         min_length = length
                         nearest_node = node
 
+            if nearest_node is None:
+                # Every remaining delivery is unreachable from the current one
+                return []
+
             route.append(nearest_node)
             unvisited_nodes.remove(nearest_node)
             current_node = nearest_node
 
-        return self.return_route_from_shortest_cycle(shortest_path_graph, route)
+        points, time_windows, lengths = self.__get_distance_matrix(shortest_path_graph)
+        cycle = TourLocalSearchService.instance().improve_cycle(
+            [points.index(point) for point in route],
+            lengths,
+            time_windows,
+            is_cancelled,
+            deadline,
+        )
+
+        if cycle is None:
+            return None
+
+        return self.return_route_from_shortest_cycle(
+            shortest_path_graph, [points[point] for point in cycle]
+        )
 
     def return_route_from_shortest_cycle(
         self, shortest_path_graph: nx.Graph, shortest_cycle: List[int]
     ) -> Optional[TourComputingResult]:
-        route = []
-        deliveries: List[DeliveriesComputingResult] = []
-        current_time = 8 * 60  # Starting time at the warehouse (8 a.m.)
+        """Create the result of a tour visiting the deliveries of a shortest path graph in a given order.
+
+        Args:
+            shortest_path_graph (nx.Graph): A graph representing the shortest path between delivery points.
+            shortest_cycle (List[int]): Intersection IDs of the points of the tour, starting with the warehouse
 
+        Returns:
+            Optional[TourComputingResult]: The result of the tour, an empty list if a leg of the tour is not in the graph
+            or None if a time window is missed.
+        """
         if len(shortest_cycle) < 2:
             return []
 
-        for i in range(len(shortest_cycle) - 1):
-            source = shortest_cycle[i]
-            target = shortest_cycle[i + 1]
-
-            if not shortest_path_graph.has_edge(source, target):
-                return []
-
-            time_window = shortest_path_graph.nodes[target]["timewindow"] * 60
-
-            travel_distance = shortest_path_graph[source][target]["length"]
-            travel_time = (
-                travel_distance / 15000
-            ) * 60  # Convert meters to minutes based on speed (15 km/h)
-            arrival_time = current_time + travel_time
-
-            if arrival_time < time_window:
-                # Courier arrives before the time window, wait until it starts
-                current_time = time_window + 5  # Add 5 minutes for delivery
-            elif arrival_time <= time_window + 60:
-                # Courier arrives within the time window
-                current_time = arrival_time + 5  # Add 5 minutes for delivery
-            else:
-                return None
-
-            deliveries.append((target, current_time - 5))
-
-            dijkstra_path = shortest_path_graph[source][target]["path"]
-            route = route + dijkstra_path
-            route.pop()
-
-        # Complete the route with the path from the last delivery point to the first
-        if not shortest_path_graph.has_edge(shortest_cycle[-1], shortest_cycle[0]):
+        legs = list(zip(shortest_cycle, shortest_cycle[1:] + shortest_cycle[:1]))
+        if not all(
+            shortest_path_graph.has_edge(source, target) for source, target in legs
+        ):
             return []
 
-        dijkstra_path = shortest_path_graph[shortest_cycle[-1]][shortest_cycle[0]][
-            "path"
-        ]
+        cycle_length, start_times = self.__evaluate_cycle(
+            shortest_path_graph, shortest_cycle
+        )
+        if cycle_length == float("inf"):
+            return None
 
-        route = route + dijkstra_path
+        route = []
+        for source, target in legs:
+            route = route[:-1] + shortest_path_graph[source][target]["path"]
 
         return TourComputingResult(
             route=route,
-            deliveries=deliveries,
+            deliveries=list(zip(shortest_cycle[1:], start_times)),
         )
 
     # Check arrival time constraint
     def check_arrival_time_constraint(
         self, tsp_result: TourComputingResult, shortest_path_graph: nx.Graph
-    ):
-        current_time = 8 * 60  # Starting time at the warehouse (8 a.m.)
-        cycle_length = 0
-
-        for i in range(len(tsp_result.route) - 1):
-            source = tsp_result[i]
-            target = tsp_result[i + 1]
-            travel_distance = shortest_path_graph[source][target]["length"]
-            cycle_length += travel_distance
-
-            # Check if the delivery time is within the time window
-            time_window = shortest_path_graph.nodes[target]["timewindow"] * 60
-            travel_time = (
-                travel_distance / 15000
-            ) * 60  # Convert meters to minutes based on speed (15 km/h)
-            arrival_time = current_time + travel_time
-
-            if arrival_time < time_window:
-                # Courier arrives before the time window, wait until it starts
-                current_time = time_window + 5  # Add 5 minutes for delivery
-            elif arrival_time <= time_window + 60:
-                # Courier arrives within the time window
-                current_time = arrival_time + 5  # Add 5 minutes for delivery
-            else:
-                return False
-        return True
+    ) -> bool:
+        """Check that the deliveries of a computed tour all start in their time window.
+
+        Args:
+            tsp_result (TourComputingResult): The result of the computed Tour.
+            shortest_path_graph (nx.Graph): A graph representing the shortest path between delivery points.
+
+        Returns:
+            bool: True if every delivery is made in its time window
+        """
+        cycle_length, _ = self.__evaluate_cycle(
+            shortest_path_graph,
+            [next(iter(shortest_path_graph.nodes()))]
+            + [delivery for delivery, _ in tsp_result.deliveries],
+        )
+
+        return cycle_length != float("inf")
 
     def compute_shortest_path_graph(
-        self, graph: nx.Graph, deliveries: List[DeliveryRequest]
+        self, graph: RoadGraph, deliveries: List[DeliveryRequest]
     ) -> nx.DiGraph:
-        """Compute the shortest path graph between delivery locations.
+        """Compute the shortest path graph between delivery locations. Paths already in the distance cache are not
+        computed again.
 
         Args:
-            graph (nx.Graph): The graph to compute the shortest path distances and paths between delivery locations.
+            graph (RoadGraph): The road graph to compute the shortest path distances and paths between delivery locations.
             deliveries (List[DeliveryRequest]): The list of delivery requests.
 
         Returns:
             nx.DiGraph: The directed graph with the shortest path distances and paths between delivery locations.
         """
-        G = nx.DiGraph()
-        # Add delivery locations as nodes
-        for delivery in deliveries:
-            G.add_node(
-                delivery.location.segment.origin.id, timewindow=delivery.time_window
-            )
-
         # Compute the shortest path distances and paths between delivery locations
-        for source in deliveries:
-            for target in deliveries:
-                if source != target:
-                    # add time windows constraints
-                    if (
-                        target.time_window + 1 <= source.time_window
-                        and target != deliveries[0]
-                    ):
-                        continue
-                    try:
-                        shortest_path_length, shortest_path = nx.single_source_dijkstra(
-                            graph,
-                            source.location.segment.origin.id,
-                            target.location.segment.origin.id,
-                            weight="length",
-                        )
-                    except nx.NetworkXNoPath:
-                        continue
-                    G.add_edge(
-                        source.location.segment.origin.id,
-                        target.location.segment.origin.id,
-                        length=shortest_path_length,
-                        path=shortest_path,
-                    )
+        self.compute_delivery_distances(graph, deliveries)
 
-        return G
+        return self.create_shortest_path_graph(graph, deliveries)
 
     def solve_tsp(self, shortest_path_graph: nx.Graph) -> TourComputingResult:
         """Solves the Traveling Salesman Problem (TSP) for a given graph of delivery points and returns the shortest route.
@@ -486,89 +834,801 @@ class TourComputingService(Singleton):
         Returns:
             TourComputingResult: The result of the computed Tour.
         """
-        shortest_cycle_length = float("inf")
-        shortest_cycle: List[DeliveriesComputingResult] = []
-        route = []
+        points, time_windows, lengths = self.__get_distance_matrix(shortest_path_graph)
 
         # Generate all permutations of delivery points to find the shortest cycle
-        delivery_points = list(shortest_path_graph.nodes())
-        warehouse_id = delivery_points.pop(0)
-        for permuted_points in itertools.permutations(delivery_points):
-            is_valid_tuple = True
-            permuted_points = list(permuted_points)
-            permuted_points = [warehouse_id] + permuted_points
-            cycle_length = 0
-            current_time = Config.INITIAL_DEPART_TIME
-
-            times = []
-
-            for i in range(len(permuted_points) - 1):
-                source = permuted_points[i]
-                target = permuted_points[i + 1]
-                if not shortest_path_graph.has_edge(source, target):
-                    is_valid_tuple = False
-                    break
-                travel_distance = shortest_path_graph[source][target]["length"]
-                cycle_length += travel_distance
-
-                # Check if the delivery time is within the time window
-                time_window = shortest_path_graph.nodes[target]["timewindow"] * 60
-                travel_time = (
-                    travel_distance / 15000
-                ) * 60  # Convert meters to minutes based on speed (15 km/h)
-                arrival_time = current_time + travel_time
-
-                if arrival_time < time_window:
-                    # Courier arrives before the time window, wait until it starts
-                    current_time = (
-                        time_window + Config.DELIVERY_TIME
-                    )  # Add 5 minutes for delivery
-                elif arrival_time <= time_window + Config.TIME_WINDOW_SIZE:
-                    # Courier arrives within the time window
-                    current_time = (
-                        arrival_time + Config.DELIVERY_TIME
-                    )  # Add 5 minutes for delivery
-                else:
-                    # Courier arrives after the time window, this tuple is invalid
-                    is_valid_tuple = False
-                    break
-
-                times.append(current_time - Config.DELIVERY_TIME)
-
-            if not is_valid_tuple:
-                continue
-            # Add the length of the last edge back to the starting point to complete the cycle
-            if not shortest_path_graph.has_edge(
-                permuted_points[-1], permuted_points[0]
-            ):
-                continue
-            cycle_length += shortest_path_graph[permuted_points[-1]][
-                permuted_points[0]
-            ]["length"]
+        _, shortest_cycle = self.__find_shortest_permutation(
+            np.array(lengths), np.array(time_windows), [0], list(range(1, len(points)))
+        )
 
-            if cycle_length < shortest_cycle_length:
-                shortest_cycle_length = cycle_length
-                shortest_cycle = list(zip(permuted_points, [0] + times))
+        if shortest_cycle is None:
+            return []
+
+        return self.return_route_from_shortest_cycle(
+            shortest_path_graph, [points[point] for point in shortest_cycle]
+        )
+
+    def solve_tsp_dynamic_programming(
+        self,
+        shortest_path_graph: nx.DiGraph,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        deadline: Optional[float] = None,
+    ) -> TourComputingResult:
+        """Solves the Traveling Salesman Problem (TSP) with time windows exactly using a Held-Karp dynamic programming.
 
-        # Compute the actual route from the shortest cycle
-        if shortest_cycle == []:
+        Partial tours are grouped by state (set of visited deliveries, last delivery). For each state, only the labels
+        (length, departure time) that are not dominated by another label of the same state are kept: a partial tour that
+        is both longer and later than another one can never lead to a better tour. A label is also dropped as soon as one
+        of the remaining deliveries can no longer be reached before the end of its time window.
+
+        Args:
+            shortest_path_graph (nx.DiGraph): A graph representing the shortest path between delivery points.
+            is_cancelled (Optional[Callable[[], bool]]): Checked regularly, the solver raises a
+            TourComputingCancelledError when it returns True. Defaults to never cancelled.
+            deadline (Optional[float]): Time (as returned by time.time()) after which the solver raises a TimeoutError.
+            Defaults to no limit.
+
+        Returns:
+            TourComputingResult: The result of the computed Tour.
+        """
+        return self.__solve_blocks_dynamic_programming(
+            shortest_path_graph,
+            [list(range(1, shortest_path_graph.number_of_nodes()))],
+            is_cancelled,
+            deadline,
+        )
+
+    def solve_tsp_time_window_blocks(
+        self,
+        shortest_path_graph: nx.DiGraph,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        deadline: Optional[float] = None,
+    ) -> TourComputingResult:
+        """Solves the Traveling Salesman Problem (TSP) with time windows exactly by splitting the tour into one block of
+        deliveries per time window.
+
+        A delivery starts at the earliest at the beginning of its time window and takes some time, so the courier can
+        never go back to a delivery of an earlier time window: the blocks are visited in the order of their time windows.
+        Each block is sequenced by the dynamic programming of solve_tsp_dynamic_programming, starting from the labels of
+        the last delivery of the previous block. Only the number of deliveries of the largest block limits the size of
+        the tours that can be solved.
+
+        Args:
+            shortest_path_graph (nx.DiGraph): A graph representing the shortest path between delivery points.
+            is_cancelled (Optional[Callable[[], bool]]): Checked regularly, the solver raises a
+            TourComputingCancelledError when it returns True. Defaults to never cancelled.
+            deadline (Optional[float]): Time (as returned by time.time()) after which the solver raises a TimeoutError.
+            Defaults to no limit.
+
+        Returns:
+            TourComputingResult: The result of the computed Tour.
+        """
+        return self.__solve_blocks_dynamic_programming(
+            shortest_path_graph,
+            self.__get_time_window_blocks(shortest_path_graph),
+            is_cancelled,
+            deadline,
+        )
+
+    def solve_tsp_branch_and_bound(
+        self,
+        shortest_path_graph: nx.DiGraph,
+        max_explored_nodes: Optional[int] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        deadline: Optional[float] = None,
+        on_improvement: Optional[Callable[[TourComputingResult], None]] = None,
+        greedy_result: Optional[TourComputingResult] = None,
+    ) -> TourComputingResult:
+        """Solves the Traveling Salesman Problem (TSP) with time windows using a depth-first branch and bound.
+
+        Partial tours are extended one delivery at a time. A branch is cut as soon as its last delivery misses its time
+        window, one of the remaining deliveries can no longer be reached in time, or its length plus a lower bound of the
+        remaining length (cheapest edge entering each remaining point) is not shorter than the best tour found so far.
+        The best tour is initialized with the greedy solution. When the search is stopped before its end, the best tour
+        found so far is returned and marked as not optimal.
+
+        Args:
+            shortest_path_graph (nx.DiGraph): A graph representing the shortest path between delivery points.
+            max_explored_nodes (Optional[int]): Maximum number of partial tours to explore. When reached, the best tour
+            found so far is returned. Defaults to no limit.
+            is_cancelled (Optional[Callable[[], bool]]): Checked regularly, the solver raises a
+            TourComputingCancelledError when it returns True. Defaults to never cancelled.
+            deadline (Optional[float]): Time (as returned by time.time()) at which the search stops. Defaults to no
+            limit.
+            on_improvement (Optional[Callable[[TourComputingResult], None]]): Called with each better tour found by the
+            search. Defaults to None.
+            greedy_result (Optional[TourComputingResult]): The greedy solution, already reported as progress. Defaults
+            to solving and reporting it.
+
+        Returns:
+            TourComputingResult: The result of the computed Tour.
+        """
+        evaluation_service = TourEvaluationService.instance()
+        points, time_windows, lengths = self.__get_distance_matrix(shortest_path_graph)
+        reach_lengths = self.__get_reach_lengths(lengths)
+        cheapest_incoming = [
+            min(
+                (lengths[source][target] for source in range(len(points))),
+                default=float("inf"),
+            )
+            for target in range(len(points))
+        ]
+
+        best_cycle: Optional[List[int]] = None
+        best_length = float("inf")
+
+        if greedy_result is None:
+            greedy_result = self.solve_greedy_tsp(
+                shortest_path_graph, is_cancelled, deadline
+            )
+            if greedy_result and on_improvement:
+                greedy_result.is_optimal = False
+                on_improvement(greedy_result)
+
+        if greedy_result:
+            best_cycle = [0] + [
+                points.index(delivery) for delivery, _ in greedy_result.deliveries
+            ]
+            best_length = sum(
+                lengths[source][target]
+                for source, target in zip(best_cycle, best_cycle[1:] + [0])
+            )
+
+        explored_nodes = 0
+        is_stopped = deadline is not None and time.time() >= deadline
+        cycle = [0]
+        remaining = list(range(1, len(points)))
+
+        def explore(length: float, departure_time: float, lower_bound: float):
+            nonlocal best_cycle, best_length, explored_nodes, is_stopped
+
+            explored_nodes += 1
+            last = cycle[-1]
+
+            if explored_nodes % self.CANCELLATION_CHECK_INTERVAL == 0:
+                self.__check_cancelled(is_cancelled)
+                if deadline is not None and time.time() >= deadline:
+                    is_stopped = True
+
+            if not remaining:
+                if length + lengths[last][0] < best_length:
+                    best_length = length + lengths[last][0]
+                    best_cycle = list(cycle)
+
+                    if on_improvement:
+                        result = self.return_route_from_shortest_cycle(
+                            shortest_path_graph, [points[point] for point in cycle]
+                        )
+                        result.is_optimal = False
+                        on_improvement(result)
+                return
+
+            if length + lower_bound >= best_length:
+                return
+
+            children: List[Tuple[int, float, float, int]] = []
+            for target in remaining:
+                delivery_time = evaluation_service.get_delivery_start_time(
+                    departure_time, lengths[last][target], time_windows[target]
+                )
+                if delivery_time is not None:
+                    children.append(
+                        (
+                            time_windows[target],
+                            lengths[last][target],
+                            delivery_time,
+                            target,
+                        )
+                    )
+
+            for _, leg_length, delivery_time, target in sorted(children):
+                if max_explored_nodes and explored_nodes >= max_explored_nodes:
+                    is_stopped = True
+                if is_stopped:
+                    return
+
+                remaining.remove(target)
+                if self.__can_reach_in_time(
+                    delivery_time + Config.DELIVERY_TIME,
+                    target,
+                    remaining,
+                    reach_lengths,
+                    time_windows,
+                ):
+                    cycle.append(target)
+                    explore(
+                        length + leg_length,
+                        delivery_time + Config.DELIVERY_TIME,
+                        lower_bound - cheapest_incoming[target],
+                    )
+                    cycle.pop()
+                remaining.append(target)
+
+        if not is_stopped:
+            explore(0, Config.INITIAL_DEPART_TIME, sum(cheapest_incoming))
+
+        if best_cycle is None:
             return []
 
-        for i in range(len(shortest_cycle) - 1):
-            source, source_time = shortest_cycle[i]
-            target, target_time = shortest_cycle[i + 1]
-            dijkstra_path = shortest_path_graph[source][target]["path"]
-            route = route + dijkstra_path
-            route.pop()
+        result = self.return_route_from_shortest_cycle(
+            shortest_path_graph, [points[point] for point in best_cycle]
+        )
+        result.is_optimal = not is_stopped
 
-        # Complete the route with the path from the last delivery point to the first
-        dijkstra_path = shortest_path_graph[shortest_cycle[-1][0]][
-            shortest_cycle[0][0]
-        ]["path"]
+        return result
 
-        route = route + dijkstra_path
+    def solve_tsp_large_neighbourhood_search(
+        self,
+        shortest_path_graph: nx.DiGraph,
+        max_iterations: Optional[int] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        deadline: Optional[float] = None,
+        on_improvement: Optional[Callable[[TourComputingResult], None]] = None,
+        seed: Optional[int] = None,
+        greedy_result: Optional[TourComputingResult] = None,
+    ) -> TourComputingResult:
+        """Solves the Traveling Salesman Problem (TSP) with time windows using the large neighbourhood search of the
+        TourLocalSearchService, starting from the greedy solution. Suited to tours too large for the exact solvers, the
+        tour found is not known to be the shortest one.
 
-        return TourComputingResult(
-            route=route,
-            deliveries=shortest_cycle[1:],
+        Args:
+            shortest_path_graph (nx.DiGraph): A graph representing the shortest path between delivery points.
+            max_iterations (Optional[int]): Number of iterations of the search. Defaults to no limit, a deadline is
+            then needed.
+            is_cancelled (Optional[Callable[[], bool]]): Checked regularly, the solver raises a
+            TourComputingCancelledError when it returns True. Defaults to never cancelled.
+            deadline (Optional[float]): Time (as returned by time.time()) at which the search stops. Defaults to no
+            limit, a number of iterations is then needed.
+            on_improvement (Optional[Callable[[TourComputingResult], None]]): Called with each better tour found by the
+            search. Defaults to None.
+            seed (Optional[int]): Seed of the random choices of the search. Defaults to a random seed.
+            greedy_result (Optional[TourComputingResult]): The greedy solution, already reported as progress. Defaults
+            to solving and reporting it.
+
+        Returns:
+            TourComputingResult: The result of the computed Tour, an empty list if no tour was found.
+        """
+        points, time_windows, lengths = self.__get_distance_matrix(shortest_path_graph)
+
+        def create_result(cycle: List[int]) -> TourComputingResult:
+            result = self.return_route_from_shortest_cycle(
+                shortest_path_graph, [points[point] for point in cycle]
+            )
+            result.is_optimal = False
+            return result
+
+        if greedy_result is None:
+            greedy_result = self.solve_greedy_tsp(
+                shortest_path_graph, is_cancelled, deadline
+            )
+            if greedy_result and on_improvement:
+                greedy_result.is_optimal = False
+                on_improvement(greedy_result)
+
+        if not greedy_result:
+            return []
+
+        cycle = TourLocalSearchService.instance().search_large_neighbourhood(
+            [0] + [points.index(delivery) for delivery, _ in greedy_result.deliveries],
+            lengths,
+            time_windows,
+            is_cancelled,
+            deadline,
+            max_iterations,
+            seed,
+            (lambda cycle: on_improvement(create_result(cycle)))
+            if on_improvement
+            else None,
+        )
+
+        return create_result(cycle)
+
+    def __get_solver_settings(self) -> Tuple[float, ...]:
+        """Get the settings of the solvers that change the computed tours, which are part of the key of the cached
+        results.
+
+        Returns:
+            Tuple[float, ...]: Settings of the solvers
+        """
+        return (
+            self.MAX_DELIVERIES_DYNAMIC_PROGRAMMING,
+            self.MAX_DELIVERIES_TIME_WINDOW_BLOCK,
+            self.MAX_DELIVERIES_BRANCH_AND_BOUND,
+            self.MAX_LARGE_NEIGHBOURHOOD_SEARCH_ITERATIONS,
+            self.LARGE_NEIGHBOURHOOD_SEARCH_SEED,
+            self.MAX_BRANCH_AND_BOUND_EXPLORED_NODES,
+            Config.TOUR_COMPUTING_TIME_BUDGET,
+        )
+
+    def __cache_result(
+        self,
+        map: Map,
+        fingerprint: TourFingerprint,
+        future: concurrent.futures.Future,
+    ) -> None:
+        """Keep the result of a computation once it is done. Cancelled and failed computations are not kept, nor the
+        tours of searches stopped by the deadline, which a later computation may improve.
+
+        Args:
+            map (Map): Map of the computation
+            fingerprint (TourFingerprint): Key of the computation
+            future (concurrent.futures.Future): Future of the TourComputingResult of the computation
+
+        Returns:
+            None
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        if future.result() and future.result().is_optimal:
+            TourResultCacheService.instance().add_result(
+                map, fingerprint, future.result()
+            )
+
+    def __check_cancelled(self, is_cancelled: Optional[Callable[[], bool]]) -> None:
+        """Stop a solver if its computation was cancelled.
+
+        Args:
+            is_cancelled (Optional[Callable[[], bool]]): Cancellation check of the solver
+
+        Raises:
+            TourComputingCancelledError: If the computation was cancelled
+        """
+        if is_cancelled and is_cancelled():
+            raise TourComputingCancelledError()
+
+    def __get_tour_deliveries(
+        self, tour_request: TourRequest, map: Map
+    ) -> List[DeliveryRequest]:
+        """Get the deliveries of a tour, starting with the warehouse of the map.
+
+        Args:
+            tour_request (TourRequest): The tour request to get the deliveries of.
+            map (Map): The map of the tour.
+
+        Returns:
+            List[DeliveryRequest]: The warehouse followed by the delivery requests of the tour
+        """
+        warehouse = DeliveryRequest(
+            DeliveryLocation(Segment(-1, "", map.warehouse, map.warehouse, 0), 0), 8
         )
+
+        return [warehouse] + list(tour_request.deliveries.values())
+
+    def __get_delivery_pairs(
+        self, deliveries: List[DeliveryRequest]
+    ) -> Dict[int, List[int]]:
+        """Get the intersection IDs of all the other deliveries for each delivery, regardless of the time windows.
+
+        Args:
+            deliveries (List[DeliveryRequest]): The list of delivery requests.
+
+        Returns:
+            Dict[int, List[int]]: Intersection IDs of the other deliveries for each delivery intersection ID
+        """
+        ids = [delivery.location.segment.origin.id for delivery in deliveries]
+
+        return {
+            source: [target for target in ids if target != source] for source in ids
+        }
+
+    def __compute_missing_shortest_paths_parallel(
+        self, map: Map, targets_by_source: Dict[int, List[int]]
+    ) -> None:
+        """Compute the shortest paths that are not cached yet between many sources and targets into the distance cache,
+        sending the searches from the sources to the processes of the tour computing pool.
+
+        Args:
+            map (Map): The map to compute the shortest path distances and paths on.
+            targets_by_source (Dict[int, List[int]]): IDs of the target intersections for each source intersection ID
+
+        Returns:
+            None
+        """
+        graph = RoadGraphService.instance().get_road_graph(map)
+        distance_cache_service = DistanceCacheService.instance()
+        (
+            forward_searches,
+            backward_searches,
+        ) = distance_cache_service.get_missing_searches(graph, targets_by_source)
+
+        # Only the searches for paths that are not cached yet are sent to the pool
+        futures = {
+            source: TourComputingPoolService.instance().compute_shortest_paths(
+                map, source, targets
+            )
+            for source, targets in forward_searches.items()
+        }
+
+        for target, sources in backward_searches.items():
+            distance_cache_service.compute_backward_shortest_paths(
+                graph, target, sources
+            )
+
+        for source, future in futures.items():
+            lengths, paths = future.result()
+            distance_cache_service.add_shortest_paths(
+                graph, source, forward_searches[source], lengths, paths
+            )
+
+    def __create_done_future(
+        self,
+        result: Optional[TourComputingResult] = None,
+        exception: Optional[Exception] = None,
+    ) -> concurrent.futures.Future:
+        """Create the future of a tour whose computation is already done.
+
+        Args:
+            result (Optional[TourComputingResult]): Result of the computation. Defaults to None.
+            exception (Optional[Exception]): Error raised by the computation. Defaults to no error.
+
+        Returns:
+            concurrent.futures.Future: Done future of the result or of the error
+        """
+        future = concurrent.futures.Future()
+        if exception:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+        return future
+
+    def __check_service_times(
+        self,
+        deliveries: List[DeliveryRequest],
+        lengths: List[List[float]],
+        service_times: ServiceTimes,
+    ) -> None:
+        """Check that every delivery of a tour can be made in its time window, and that no time window holds more
+        deliveries than can be made in it.
+
+        Args:
+            deliveries (List[DeliveryRequest]): Delivery requests of the points of the service times
+            lengths (List[List[float]]): Lower bounds of the distances between the points
+            service_times (ServiceTimes): Service times of the points, as returned by the TourConstraintService
+
+        Raises:
+            TourInfeasibleError: If a delivery cannot be made in its time window whatever the order of the deliveries
+        """
+        constraint_service = TourConstraintService.instance()
+
+        for point in constraint_service.get_infeasible_points(service_times):
+            delivery = deliveries[point]
+            raise TourInfeasibleError(
+                f"Impossible de livrer {delivery.location.segment.name} entre "
+                f"{delivery.time_window}h et {delivery.time_window + 1}h."
+            )
+
+        for first, last in constraint_service.get_overloaded_time_windows(
+            lengths, [delivery.time_window for delivery in deliveries], service_times
+        ):
+            count = sum(
+                first <= delivery.time_window <= last for delivery in deliveries[1:]
+            )
+            raise TourInfeasibleError(
+                f"Impossible de faire les {count} livraisons entre {first}h et "
+                f"{last + 1}h."
+            )
+
+    def __get_distance_matrix(
+        self, shortest_path_graph: nx.DiGraph
+    ) -> Tuple[List[int], List[int], List[List[float]]]:
+        """Extract the points, their time windows and the matrix of distances between them from a shortest path graph.
+
+        Args:
+            shortest_path_graph (nx.DiGraph): A graph representing the shortest path between delivery points.
+
+        Returns:
+            Tuple[List[int], List[int], List[List[float]]]: Intersection IDs of the points (warehouse first), time windows
+            of the points and distances between the points (infinite when there is no edge)
+        """
+        points = list(shortest_path_graph.nodes())
+        time_windows = [
+            shortest_path_graph.nodes[point]["timewindow"] for point in points
+        ]
+        lengths = [
+            [
+                shortest_path_graph[source][target]["length"]
+                if shortest_path_graph.has_edge(source, target)
+                else float("inf")
+                for target in points
+            ]
+            for source in points
+        ]
+
+        return points, time_windows, lengths
+
+    def __get_time_window_blocks(
+        self, shortest_path_graph: nx.DiGraph
+    ) -> List[List[int]]:
+        """Group the deliveries of a shortest path graph by time window, in the order the time windows start.
+
+        Args:
+            shortest_path_graph (nx.DiGraph): A graph representing the shortest path between delivery points.
+
+        Returns:
+            List[List[int]]: Indexes of the deliveries of each time window, as in the distance matrix
+        """
+        blocks: Dict[int, List[int]] = {}
+        for delivery, point in enumerate(shortest_path_graph.nodes()):
+            if delivery:
+                blocks.setdefault(
+                    shortest_path_graph.nodes[point]["timewindow"], []
+                ).append(delivery)
+
+        return [blocks[time_window] for time_window in sorted(blocks)]
+
+    def __solve_blocks_dynamic_programming(
+        self,
+        shortest_path_graph: nx.DiGraph,
+        blocks: List[List[int]],
+        is_cancelled: Optional[Callable[[], bool]],
+        deadline: Optional[float],
+    ) -> TourComputingResult:
+        """Find the shortest tour visiting blocks of deliveries one after the other with a Held-Karp dynamic
+        programming.
+
+        Partial tours are grouped by state (set of visited deliveries of the current block, last delivery). For each
+        state, only the labels (length, departure time) that are not dominated by another label of the same state are
+        kept: a partial tour that is both longer and later than another one can never lead to a better tour. A label is
+        also dropped as soon as one of the remaining deliveries can no longer be reached before the end of its time
+        window. Once a block is visited, only the labels of its last delivery are carried over to the next block.
+
+        Args:
+            shortest_path_graph (nx.DiGraph): A graph representing the shortest path between delivery points.
+            blocks (List[List[int]]): Indexes of the deliveries of each block, in the order the blocks are visited
+            is_cancelled (Optional[Callable[[], bool]]): Cancellation check of the solver
+            deadline (Optional[float]): Time (as returned by time.time()) after which the solver raises a TimeoutError
+
+        Returns:
+            TourComputingResult: The result of the computed Tour, an empty list if no tour was found.
+        """
+        evaluation_service = TourEvaluationService.instance()
+        points, time_windows, lengths = self.__get_distance_matrix(shortest_path_graph)
+        reach_lengths = self.__get_reach_lengths(lengths)
+
+        # The warehouse is the index 0, the delivery at index i of a block is visited when the bit i of the mask is set
+        block_labels: Dict[int, List[DynamicProgrammingLabel]] = {
+            0: [(0, Config.INITIAL_DEPART_TIME, None, 0)]
+        }
+
+        for block_index, block in enumerate(blocks):
+            later_deliveries = [
+                delivery
+                for later_block in blocks[block_index + 1 :]
+                for delivery in later_block
+            ]
+            states: Dict[Tuple[int, int], List[DynamicProgrammingLabel]] = {
+                (0, last): labels for last, labels in block_labels.items()
+            }
+
+            for _ in block:
+                next_states: Dict[Tuple[int, int], List[DynamicProgrammingLabel]] = {}
+
+                for (visited, last), labels in states.items():
+                    self.__check_cancelled(is_cancelled)
+                    if deadline is not None and time.time() >= deadline:
+                        raise TimeoutError()
+
+                    for target_index, target in enumerate(block):
+                        if visited & (1 << target_index):
+                            continue
+                        if lengths[last][target] == float("inf"):
+                            continue
+
+                        target_visited = visited | (1 << target_index)
+                        remaining = [
+                            delivery
+                            for delivery_index, delivery in enumerate(block)
+                            if not target_visited & (1 << delivery_index)
+                        ] + later_deliveries
+                        target_labels = next_states.setdefault(
+                            (target_visited, target), []
+                        )
+
+                        for label in labels:
+                            delivery_time = evaluation_service.get_delivery_start_time(
+                                label[1], lengths[last][target], time_windows[target]
+                            )
+                            if delivery_time is None:
+                                continue
+
+                            departure_time = delivery_time + Config.DELIVERY_TIME
+                            if not self.__can_reach_in_time(
+                                departure_time,
+                                target,
+                                remaining,
+                                reach_lengths,
+                                time_windows,
+                            ):
+                                continue
+
+                            self.__insert_non_dominated_label(
+                                target_labels,
+                                (
+                                    label[0] + lengths[last][target],
+                                    departure_time,
+                                    label,
+                                    target,
+                                ),
+                            )
+
+                states = {
+                    state: labels for state, labels in next_states.items() if labels
+                }
+
+            block_labels = {last: labels for (_, last), labels in states.items()}
+
+        best_label: Optional[DynamicProgrammingLabel] = None
+        best_length = float("inf")
+
+        for last, labels in block_labels.items():
+            for label in labels:
+                if label[0] + lengths[last][0] < best_length:
+                    best_length = label[0] + lengths[last][0]
+                    best_label = label
+
+        if best_label is None:
+            return []
+
+        shortest_cycle: List[int] = []
+        while best_label is not None:
+            shortest_cycle.append(points[best_label[3]])
+            best_label = best_label[2]
+
+        return self.return_route_from_shortest_cycle(
+            shortest_path_graph, shortest_cycle[::-1]
+        )
+
+    def __evaluate_cycle(
+        self, shortest_path_graph: nx.Graph, cycle: List[int]
+    ) -> Tuple[float, List[float]]:
+        """Evaluate a single tour of a shortest path graph with the TourEvaluationService.
+
+        Only the legs of the tour are put in the distance matrix, so that evaluating a tour does not depend on the size
+        of the graph.
+
+        Args:
+            shortest_path_graph (nx.Graph): A graph representing the shortest path between delivery points.
+            cycle (List[int]): Intersection IDs of the points of the tour, starting with the warehouse
+
+        Returns:
+            Tuple[float, List[float]]: Length of the tour, infinite if it misses a time window or uses a leg that is
+            not in the graph, and start time in minutes of each delivery
+        """
+        lengths = np.full((len(cycle), len(cycle)), float("inf"))
+        for index, (source, target) in enumerate(zip(cycle, cycle[1:] + cycle[:1])):
+            if shortest_path_graph.has_edge(source, target):
+                lengths[index, (index + 1) % len(cycle)] = shortest_path_graph[source][
+                    target
+                ]["length"]
+
+        time_windows = [
+            shortest_path_graph.nodes[point]["timewindow"] for point in cycle
+        ]
+
+        evaluation_service = TourEvaluationService.instance()
+        cycle_lengths, start_times = evaluation_service.evaluate_sequences(
+            np.arange(len(cycle))[None, :], lengths, np.array(time_windows)
+        )
+
+        return float(cycle_lengths[0]), start_times[0].tolist()
+
+    def __find_shortest_permutation(
+        self,
+        lengths: np.ndarray,
+        time_windows: np.ndarray,
+        first_points: List[int],
+        other_points: List[int],
+    ) -> Tuple[float, Optional[List[int]]]:
+        """Find the shortest tour meeting the time windows among the tours starting with given points, by evaluating
+        every order of the other points in batches.
+
+        Args:
+            lengths (np.ndarray): Distances between the points, the warehouse first
+            time_windows (np.ndarray): Time windows of the points
+            first_points (List[int]): Indexes of the first points of the tours, starting with the warehouse
+            other_points (List[int]): Indexes of the points to visit after them
+
+        Returns:
+            Tuple[float, Optional[List[int]]]: Length and indexes of the points of the shortest tour, None if no tour
+            meets the time windows
+        """
+        shortest_cycle_length = float("inf")
+        shortest_cycle: Optional[List[int]] = None
+        permutations = itertools.permutations(other_points)
+
+        while True:
+            batch = np.array(
+                list(itertools.islice(permutations, self.PERMUTATION_BATCH_SIZE)),
+                dtype=int,
+            )
+            if len(batch) == 0:
+                break
+
+            sequences = np.hstack(
+                [
+                    np.tile(first_points, (len(batch), 1)),
+                    batch.reshape(len(batch), len(other_points)),
+                ]
+            )
+            cycle_lengths, _ = TourEvaluationService.instance().evaluate_sequences(
+                sequences, lengths, time_windows
+            )
+
+            best = int(np.argmin(cycle_lengths))
+            if cycle_lengths[best] < shortest_cycle_length:
+                shortest_cycle_length = float(cycle_lengths[best])
+                shortest_cycle = sequences[best].tolist()
+
+        return shortest_cycle_length, shortest_cycle
+
+    def __get_reach_lengths(self, lengths: List[List[float]]) -> List[List[float]]:
+        """Compute the shortest distances between the points when going through the legs of the shortest path graph
+        only (Floyd-Warshall). The legs that no feasible tour can use are not in the graph, the courier then reaches a
+        point through other deliveries. The warehouse is never used as an intermediate point.
+
+        Args:
+            lengths (List[List[float]]): Distances between the points (infinite when there is no edge)
+
+        Returns:
+            List[List[float]]: Shortest distances between the points through the deliveries
+        """
+        reach_lengths = np.array(lengths, dtype=float)
+
+        for delivery in range(1, len(lengths)):
+            reach_lengths = np.minimum(
+                reach_lengths,
+                reach_lengths[:, delivery, None] + reach_lengths[None, delivery, :],
+            )
+
+        return reach_lengths.tolist()
+
+    def __can_reach_in_time(
+        self,
+        departure_time: float,
+        source: int,
+        targets: List[int],
+        lengths: List[List[float]],
+        time_windows: List[int],
+    ) -> bool:
+        """Check that every target can still be reached before the end of its time window when leaving the source.
+
+        Since distances are shortest paths through the legs of the graph, going through other points first can only make
+        the courier arrive later.
+
+        Args:
+            departure_time (float): Time in minutes at which the courier leaves the source
+            source (int): Index of the source point
+            targets (List[int]): Indexes of the points that are still to be visited
+            lengths (List[List[float]]): Shortest distances between the points, as returned by __get_reach_lengths
+            time_windows (List[int]): Time windows of the points
+
+        Returns:
+            bool: True if every target can still be reached in time
+        """
+        evaluation_service = TourEvaluationService.instance()
+
+        return all(
+            evaluation_service.get_arrival_time(departure_time, lengths[source][target])
+            <= evaluation_service.get_time_window_end(time_windows[target])
+            for target in targets
+        )
+
+    def __insert_non_dominated_label(
+        self, labels: List[DynamicProgrammingLabel], label: DynamicProgrammingLabel
+    ) -> None:
+        """Insert a label in a list of labels if it is not dominated, and remove the labels it dominates.
+
+        Args:
+            labels (List[DynamicProgrammingLabel]): Labels of a state
+            label (DynamicProgrammingLabel): Label to insert
+        """
+        for other in labels:
+            if other[0] <= label[0] and other[1] <= label[1]:
+                return
+
+        labels[:] = [
+            other for other in labels if other[0] < label[0] or other[1] < label[1]
+        ]
+        labels.append(label)
@@ -1,7 +1,11 @@
-from typing import Dict
+import concurrent.futures
+import time
+from typing import Dict, Set
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from src.config import Config
+from src.models.errors.computing_errors import TourInfeasibleError
 from src.models.tour import (
     NonComputedTour,
     Tour,
@@ -10,54 +14,175 @@ from src.models.tour import (
     TourRequest,
 )
 from src.services.map.map_service import MapService
+from src.services.tour.tour_computing_pool_service import TourComputingPoolService
 from src.services.tour.tour_computing_service import TourComputingService
 from src.services.tour.tour_time_computing_service import TourTimeComputingService
 
 
 class TourComputingWorker(QObject):
+    PROGRESS_INTERVAL = 0.1
+    """Maximum time in seconds between two checks of the better tours found by the searches
+    """
+
     finished = pyqtSignal(object)
+    progress = pyqtSignal(object)
     __tour_requests: Dict[TourID, TourRequest]
+    computation_id: int
     result: Dict[TourID, Tour]
 
-    def __init__(self, tour_request: Dict[TourID, TourRequest]) -> None:
+    def __init__(
+        self, tour_request: Dict[TourID, TourRequest], computation_id: int
+    ) -> None:
         super().__init__()
         self.__tour_requests = tour_request
+        self.computation_id = computation_id
+        self.result = {}
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Whether a newer computation replaced this one. The result of a cancelled computation is incomplete.
+
+        Returns:
+            bool: True if the computation was cancelled
+        """
+        return TourComputingPoolService.is_computation_cancelled(self.computation_id)
 
     def run(self):
         """Long-running task."""
         map = MapService.instance().get_map()
-
-        tours_intersection_ids: Dict[TourID, TourComputingResult] = {}
-
-        for id, tour_request in self.__tour_requests.value.items():
-            try:
-                if len(tour_request.deliveries) > 0:
-                    tours_intersection_ids[
-                        id
-                    ] = TourComputingService.instance().compute_tour(tour_request, map)
-            except Exception as e:
-                tours_intersection_ids[id] = []
+        deadline = time.time() + Config.TOUR_COMPUTING_TIME_BUDGET
 
         computed_tours: Dict[TourID, Tour] = {}
+        tour_requests = [
+            tour_request
+            for tour_request in self.__tour_requests.values()
+            if len(tour_request.deliveries) > 0
+        ]
 
-        for id, tour_intersection_ids in tours_intersection_ids.items():
-            if tour_intersection_ids:
+        # The worker always finishes, so that the computation does not stay busy after an error
+        try:
+            # All the tours are dispatched before waiting for any of them
+            futures: Dict[concurrent.futures.Future, TourID] = {}
+            if not self.is_cancelled:
                 try:
-                    computed_tours[
-                        id
-                    ] = TourTimeComputingService.instance().get_computed_tour_from_route_ids(
-                        self.__tour_requests.value[id], tour_intersection_ids
+                    tour_futures = TourComputingService.instance().submit_tours(
+                        tour_requests, map, self.computation_id, deadline
                     )
+                    futures = {future: id for id, future in tour_futures.items()}
                 except Exception as e:
-                    computed_tours[id] = NonComputedTour.create_from_request(
-                        self.__tour_requests.value[id],
-                        [f"Erreur lors du calcul du temps de parcours : {str(e)}"],
-                    )
-            else:
-                computed_tours[id] = NonComputedTour.create_from_request(
-                    self.__tour_requests.value[id], ["Impossible de trouver un chemin."]
+                    for tour_request in tour_requests:
+                        computed_tours[tour_request.id] = self.__create_computed_tour(
+                            tour_request.id, []
+                        )
+
+            completed_tour_ids: Set[TourID] = set(computed_tours)
+            pending_futures = set(futures)
+
+            while pending_futures:
+                done_futures, pending_futures = concurrent.futures.wait(
+                    pending_futures,
+                    timeout=self.PROGRESS_INTERVAL,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
                 )
 
-        self.result = computed_tours
+                if self.is_cancelled:
+                    # The tasks that did not start yet are dropped, the running ones stop on their own
+                    for pending_future in pending_futures:
+                        pending_future.cancel()
+                    break
+
+                has_progress = self.__read_progress(computed_tours, completed_tour_ids)
+
+                for future in done_futures:
+                    id = futures[future]
+                    try:
+                        computed_tours[id] = self.__create_computed_tour(
+                            id, future.result()
+                        )
+                    except TourInfeasibleError as e:
+                        computed_tours[id] = NonComputedTour.create_from_request(
+                            self.__tour_requests[id], [str(e)]
+                        )
+                    except Exception as e:
+                        computed_tours[id] = self.__create_computed_tour(id, [])
+                    completed_tour_ids.add(id)
+
+                if pending_futures and (has_progress or done_futures):
+                    self.progress.emit(self.__sort_tours(computed_tours))
+        finally:
+            self.result = self.__sort_tours(computed_tours)
+
+            self.finished.emit(2)
+
+    def __read_progress(
+        self, computed_tours: Dict[TourID, Tour], completed_tour_ids: Set[TourID]
+    ) -> bool:
+        """Replace the tours that are still being computed by the better tours reported by their search.
+
+        Args:
+            computed_tours (Dict[TourID, Tour]): Tours computed so far, updated in place
+            completed_tour_ids (Set[TourID]): IDs of the tours with a final result, which are not replaced
+
+        Returns:
+            bool: True if a tour was replaced
+        """
+        has_progress = False
+
+        for (
+            computation_id,
+            id,
+            result,
+        ) in TourComputingPoolService.instance().get_progress():
+            if (
+                computation_id != self.computation_id
+                or id in completed_tour_ids
+                or id not in self.__tour_requests
+            ):
+                continue
+
+            computed_tours[id] = self.__create_computed_tour(id, result)
+            has_progress = True
+
+        return has_progress
+
+    def __sort_tours(self, computed_tours: Dict[TourID, Tour]) -> Dict[TourID, Tour]:
+        """Sort tours in the order of the tour requests.
+
+        Args:
+            computed_tours (Dict[TourID, Tour]): Tours to sort
+
+        Returns:
+            Dict[TourID, Tour]: Sorted tours
+        """
+        return {
+            id: computed_tours[id]
+            for id in self.__tour_requests
+            if id in computed_tours
+        }
+
+    def __create_computed_tour(
+        self, id: TourID, tour_intersection_ids: TourComputingResult
+    ) -> Tour:
+        """Create the tour of a request from the result of its computation.
+
+        Args:
+            id (TourID): ID of the tour request
+            tour_intersection_ids (TourComputingResult): Result of the computation, empty if no tour was found
+
+        Returns:
+            Tour: Computed tour, or non computed tour with the reason of the failure
+        """
+        if not tour_intersection_ids:
+            return NonComputedTour.create_from_request(
+                self.__tour_requests[id], ["Impossible de trouver un chemin."]
+            )
 
-        self.finished.emit(2)
+        try:
+            return TourTimeComputingService.instance().get_computed_tour_from_route_ids(
+                self.__tour_requests[id], tour_intersection_ids
+            )
+        except Exception as e:
+            return NonComputedTour.create_from_request(
+                self.__tour_requests[id],
+                [f"Erreur lors du calcul du temps de parcours : {str(e)}"],
+            )
@@ -0,0 +1,261 @@
+from typing import List, Tuple
+
+from src.config import Config
+from src.services.singleton import Singleton
+from src.services.tour.tour_evaluation_service import TourEvaluationService
+
+ServiceTimes = Tuple[List[float], List[float]]
+"""Earliest and latest time in minutes at which the service of each point of a tour can start
+"""
+
+
+class TourConstraintService(Singleton):
+    """Propagate the time windows of a tour before it is solved, to find the legs that no feasible tour can use and the
+    deliveries that cannot be made in time whatever the order.
+
+    The propagation works on lower bounds of the distances between the points, so it can run before the shortest paths
+    are computed (from the distances to the warehouse only) as well as after (with the exact distances). A point that
+    has to be visited before another one in every feasible tour is called a predecessor of this point.
+    """
+
+    EPSILON = 1e-6
+    """Tolerance in minutes of the comparisons of times, so that rounding errors never remove a feasible leg
+    """
+
+    def compute_service_times(
+        self, lengths: List[List[float]], time_windows: List[int]
+    ) -> ServiceTimes:
+        """Compute the earliest and latest time at which the service of each point can start in a feasible tour.
+
+        The times start from the time windows and from the time needed to come from the warehouse. They are then
+        tightened until nothing changes: a point cannot start before one of its predecessors is done and the courier
+        travelled from it, and a predecessor must start early enough for the courier to reach the point in time.
+
+        Args:
+            lengths (List[List[float]]): Lower bounds of the distances between the points, the warehouse first
+            time_windows (List[int]): Time windows of the points
+
+        Returns:
+            ServiceTimes: Earliest and latest service times of the points. A point whose earliest time is after its
+            latest time cannot be delivered in time, there is then no feasible tour.
+        """
+        deliveries = range(1, len(lengths))
+        earliest_times = [float(Config.INITIAL_DEPART_TIME)] + [
+            max(
+                time_windows[delivery] * 60,
+                Config.INITIAL_DEPART_TIME
+                + TourEvaluationService.instance().get_travel_time(
+                    lengths[0][delivery]
+                ),
+            )
+            for delivery in deliveries
+        ]
+        latest_times = [float(Config.INITIAL_DEPART_TIME)] + [
+            float(
+                TourEvaluationService.instance().get_time_window_end(
+                    time_windows[delivery]
+                )
+            )
+            for delivery in deliveries
+        ]
+
+        is_changed = True
+        while is_changed and not self.get_infeasible_points(
+            (earliest_times, latest_times)
+        ):
+            is_changed = False
+
+            for source in deliveries:
+                for target in deliveries:
+                    if not self.__is_predecessor(
+                        source, target, lengths, earliest_times, latest_times
+                    ):
+                        continue
+
+                    leg_time = (
+                        Config.DELIVERY_TIME
+                        + TourEvaluationService.instance().get_travel_time(
+                            lengths[source][target]
+                        )
+                    )
+
+                    if (
+                        earliest_times[source] + leg_time
+                        > earliest_times[target] + self.EPSILON
+                    ):
+                        earliest_times[target] = earliest_times[source] + leg_time
+                        is_changed = True
+
+                    if (
+                        latest_times[target] - leg_time
+                        < latest_times[source] - self.EPSILON
+                    ):
+                        latest_times[source] = latest_times[target] - leg_time
+                        is_changed = True
+
+        return earliest_times, latest_times
+
+    def get_possible_legs(
+        self, lengths: List[List[float]], service_times: ServiceTimes
+    ) -> List[List[bool]]:
+        """Find the legs between two points that a feasible tour can use.
+
+        A leg is impossible when the courier cannot reach its target in time even when leaving its source as early as
+        possible, or when another point has to be visited between its source and its target. The courier can only
+        leave the warehouse to a point without predecessors, and come back to it from a point that is the predecessor
+        of no other point.
+
+        Args:
+            lengths (List[List[float]]): Lower bounds of the distances between the points, the warehouse first
+            service_times (ServiceTimes): Service times of the points, as returned by compute_service_times
+
+        Returns:
+            List[List[bool]]: Whether the leg from a point to another one can be part of a feasible tour
+        """
+        earliest_times, latest_times = service_times
+        points = range(len(lengths))
+        deliveries = range(1, len(lengths))
+
+        predecessors = [set()] + [
+            {
+                source
+                for source in deliveries
+                if self.__is_predecessor(
+                    source, target, lengths, earliest_times, latest_times
+                )
+            }
+            for target in deliveries
+        ]
+        successors = [
+            {target for target in deliveries if source in predecessors[target]}
+            for source in points
+        ]
+
+        return [
+            [
+                source != target
+                and (source != 0 or not predecessors[target])
+                and (target != 0 or not successors[source])
+                and (
+                    source == 0
+                    or target == 0
+                    or earliest_times[source]
+                    + Config.DELIVERY_TIME
+                    + TourEvaluationService.instance().get_travel_time(
+                        lengths[source][target]
+                    )
+                    <= latest_times[target] + self.EPSILON
+                )
+                and not successors[source] & predecessors[target]
+                for target in points
+            ]
+            for source in points
+        ]
+
+    def get_infeasible_points(self, service_times: ServiceTimes) -> List[int]:
+        """Get the points that cannot be delivered in time whatever the order of the deliveries.
+
+        Args:
+            service_times (ServiceTimes): Service times of the points, as returned by compute_service_times
+
+        Returns:
+            List[int]: Indexes of the points whose earliest service time is after their latest service time
+        """
+        earliest_times, latest_times = service_times
+
+        return [
+            point
+            for point in range(len(earliest_times))
+            if earliest_times[point] > latest_times[point] + self.EPSILON
+        ]
+
+    def get_overloaded_time_windows(
+        self,
+        lengths: List[List[float]],
+        time_windows: List[int],
+        service_times: ServiceTimes,
+    ) -> List[Tuple[int, int]]:
+        """Find the consecutive time windows holding more deliveries than can be made in them whatever the order.
+
+        The deliveries of a range of time windows all start between the earliest service time of one of them and the
+        latest service time of one of them. From one to the next, the courier spends Config.DELIVERY_TIME at a delivery
+        and travels at least the shortest leg entering the next one, so they need a minimum time however they are
+        ordered. This catches the time windows with too many deliveries, which the propagation of the service times
+        of pairs of points does not.
+
+        Args:
+            lengths (List[List[float]]): Lower bounds of the distances between the points, the warehouse first
+            time_windows (List[int]): Time windows of the points
+            service_times (ServiceTimes): Service times of the points, as returned by compute_service_times
+
+        Returns:
+            List[Tuple[int, int]]: First and last time window of each range whose deliveries cannot all be made in time
+        """
+        earliest_times, latest_times = service_times
+        evaluation_service = TourEvaluationService.instance()
+        windows = sorted(set(time_windows[1:]))
+        overloaded_time_windows = []
+
+        for first_index, first in enumerate(windows):
+            for last in windows[first_index:]:
+                deliveries = [
+                    delivery
+                    for delivery in range(1, len(time_windows))
+                    if first <= time_windows[delivery] <= last
+                ]
+                shortest_incoming = [
+                    min(
+                        (
+                            lengths[source][target]
+                            for source in deliveries
+                            if source != target
+                        ),
+                        default=0.0,
+                    )
+                    for target in deliveries
+                ]
+                # The first delivery of the range needs no leg from another one
+                travel_time = evaluation_service.get_travel_time(
+                    sum(shortest_incoming) - max(shortest_incoming)
+                )
+                duration = (len(deliveries) - 1) * Config.DELIVERY_TIME + travel_time
+
+                if (
+                    min(earliest_times[delivery] for delivery in deliveries) + duration
+                    > max(latest_times[delivery] for delivery in deliveries)
+                    + self.EPSILON
+                ):
+                    overloaded_time_windows.append((first, last))
+
+        return overloaded_time_windows
+
+    def __is_predecessor(
+        self,
+        source: int,
+        target: int,
+        lengths: List[List[float]],
+        earliest_times: List[float],
+        latest_times: List[float],
+    ) -> bool:
+        """Check whether a delivery has to be visited before another one in every feasible tour, because the courier
+        cannot reach it in time after the other one.
+
+        Distances are shortest paths, so going through other points first can only make the courier arrive later.
+
+        Args:
+            source (int): Index of the delivery that may have to be visited first
+            target (int): Index of the other delivery
+            lengths (List[List[float]]): Lower bounds of the distances between the points
+            earliest_times (List[float]): Earliest service times of the points
+            latest_times (List[float]): Latest service times of the points
+
+        Returns:
+            bool: True if the source has to be visited before the target
+        """
+        return (
+            source != target
+            and earliest_times[target]
+            + Config.DELIVERY_TIME
+            + TourEvaluationService.instance().get_travel_time(lengths[target][source])
+            > latest_times[source] + self.EPSILON
+        )
@@ -0,0 +1,328 @@
+from typing import Dict, List, Optional, Tuple
+
+from src.config import Config
+from src.models.map import Map, RoadGraph
+from src.models.tour import (
+    ComputedTour,
+    DeliveriesComputingResult,
+    DeliveryID,
+    DeliveryRequest,
+    TourComputingResult,
+    TourRequest,
+)
+from src.services.routing.distance_cache_service import DistanceCacheService
+from src.services.routing.road_graph_service import RoadGraphService
+from src.services.singleton import Singleton
+from src.services.tour.tour_evaluation_service import TourEvaluationService
+
+
+class TourEditingService(Singleton):
+    """Update an already computed tour after a small edit of its request, without solving the tour again.
+
+    The tours returned are feasible but not necessarily the shortest ones: they are marked as not optimal so that a
+    full computation can improve them later.
+    """
+
+    def insert_delivery(
+        self,
+        tour_request: TourRequest,
+        computed_tour: Optional[ComputedTour],
+        delivery_request: DeliveryRequest,
+        map: Map,
+    ) -> Optional[TourComputingResult]:
+        """Insert a delivery in a computed tour at the position that makes the tour the shortest (cheapest insertion).
+
+        Every position of the current sequence of deliveries is tried. The forward time slack of each delivery, which
+        is how much it can be delayed without any following delivery missing its time window, makes checking a
+        position take constant time.
+
+        Args:
+            tour_request (TourRequest): Request of the tour, including the delivery to insert
+            computed_tour (Optional[ComputedTour]): Computed tour of the other deliveries of the request, None if there
+            are none
+            delivery_request (DeliveryRequest): Delivery to insert
+            map (Map): The map of the tour
+
+        Returns:
+            Optional[TourComputingResult]: Tour with the inserted delivery, or None if it cannot be inserted anywhere
+            without missing a time window
+        """
+        graph = RoadGraphService.instance().get_road_graph(map)
+        points, time_windows = self.__get_tour_points(tour_request, computed_tour, map)
+        new_point = delivery_request.location.segment.origin.id
+
+        targets_by_source: Dict[int, List[int]] = {new_point: list(points)}
+        for index, point in enumerate(points):
+            targets_by_source.setdefault(point, []).extend(
+                [new_point, points[(index + 1) % len(points)]]
+            )
+        DistanceCacheService.instance().compute_missing_shortest_paths(
+            graph, targets_by_source
+        )
+
+        start_times = self.__compute_start_times(graph, points, time_windows)
+
+        if start_times is None:
+            return None
+
+        time_slacks = self.__compute_time_slacks(
+            graph, points, time_windows, start_times
+        )
+
+        best_position, best_cost = None, float("inf")
+
+        for position in range(len(points)):
+            point = points[position]
+            next_position = (position + 1) % len(points)
+            next_point = points[next_position]
+            cost = (
+                self.__get_length(graph, point, new_point)
+                + self.__get_length(graph, new_point, next_point)
+                - self.__get_length(graph, point, next_point)
+            )
+
+            if cost >= best_cost:
+                continue
+
+            new_start_time = TourEvaluationService.instance().get_delivery_start_time(
+                self.__get_departure_time(position, start_times[position]),
+                self.__get_length(graph, point, new_point),
+                delivery_request.time_window,
+            )
+
+            if new_start_time is None:
+                continue
+
+            if next_position != 0:
+                next_arrival_time = TourEvaluationService.instance().get_arrival_time(
+                    new_start_time + Config.DELIVERY_TIME,
+                    self.__get_length(graph, new_point, next_point),
+                )
+                delay = (
+                    max(next_arrival_time, time_windows[next_position] * 60)
+                    - start_times[next_position]
+                )
+
+                if delay > time_slacks[next_position]:
+                    continue
+
+            best_position, best_cost = position, cost
+
+        if best_position is None:
+            return None
+
+        return self.__create_result(
+            graph,
+            points[: best_position + 1] + [new_point] + points[best_position + 1 :],
+            time_windows[: best_position + 1]
+            + [delivery_request.time_window]
+            + time_windows[best_position + 1 :],
+        )
+
+    def remove_delivery(
+        self,
+        tour_request: TourRequest,
+        computed_tour: ComputedTour,
+        delivery_id: DeliveryID,
+        map: Map,
+    ) -> Optional[TourComputingResult]:
+        """Remove a delivery from a computed tour, keeping the order of the other deliveries.
+
+        The following deliveries can only start earlier, so the tour stays feasible: only the path between the
+        neighbours of the removed delivery and the delivery times have to be updated.
+
+        Args:
+            tour_request (TourRequest): Request of the tour, without the removed delivery
+            computed_tour (ComputedTour): Computed tour, including the removed delivery
+            delivery_id (DeliveryID): ID of the delivery to remove
+            map (Map): The map of the tour
+
+        Returns:
+            Optional[TourComputingResult]: Tour without the removed delivery, or None if the neighbours of the removed
+            delivery are not connected
+        """
+        graph = RoadGraphService.instance().get_road_graph(map)
+        points, time_windows = self.__get_tour_points(
+            tour_request, computed_tour, map, delivery_id
+        )
+
+        DistanceCacheService.instance().compute_missing_shortest_paths(
+            graph,
+            {
+                point: [points[(index + 1) % len(points)]]
+                for index, point in enumerate(points)
+            },
+        )
+
+        return self.__create_result(graph, points, time_windows)
+
+    def __get_tour_points(
+        self,
+        tour_request: TourRequest,
+        computed_tour: Optional[ComputedTour],
+        map: Map,
+        excluded_delivery_id: Optional[DeliveryID] = None,
+    ) -> Tuple[List[int], List[int]]:
+        """Get the intersection IDs and time windows of the points of a computed tour, in the order they are visited.
+
+        Args:
+            tour_request (TourRequest): Request of the tour, giving the time windows of the deliveries
+            computed_tour (Optional[ComputedTour]): Computed tour, giving the order of the deliveries, None for a tour
+            without deliveries
+            map (Map): The map of the tour
+            excluded_delivery_id (Optional[DeliveryID]): ID of a delivery of the computed tour to leave out
+
+        Returns:
+            Tuple[List[int], List[int]]: Intersection IDs of the points, starting with the warehouse, and their time
+            windows
+        """
+        deliveries = [
+            delivery
+            for delivery_id, delivery in (
+                computed_tour.deliveries.items() if computed_tour else []
+            )
+            if delivery_id != excluded_delivery_id
+        ]
+
+        points = [map.warehouse.id] + [
+            delivery.location.segment.origin.id for delivery in deliveries
+        ]
+        time_windows = [Config.INITIAL_DEPART_TIME // 60] + [
+            tour_request.deliveries[delivery.id].time_window for delivery in deliveries
+        ]
+
+        return points, time_windows
+
+    def __create_result(
+        self, graph: RoadGraph, points: List[int], time_windows: List[int]
+    ) -> Optional[TourComputingResult]:
+        """Create the result of a tour visiting points in a given order and coming back to the warehouse.
+
+        Args:
+            graph (RoadGraph): Graph of the map
+            points (List[int]): Intersection IDs of the points, starting with the warehouse
+            time_windows (List[int]): Time windows of the points
+
+        Returns:
+            Optional[TourComputingResult]: Result of the tour, or None if a time window is missed
+        """
+        start_times = self.__compute_start_times(graph, points, time_windows)
+
+        if start_times is None:
+            return None
+
+        route: List[int] = []
+        for point, next_point in zip(points, points[1:] + points[:1]):
+            _, paths = DistanceCacheService.instance().get_cached_shortest_paths(
+                graph, point, [next_point]
+            )
+            route = route[:-1] + paths[next_point]
+
+        deliveries: List[DeliveriesComputingResult] = list(
+            zip(points[1:], start_times[1:])
+        )
+
+        return TourComputingResult(route=route, deliveries=deliveries, is_optimal=False)
+
+    def __compute_start_times(
+        self, graph: RoadGraph, points: List[int], time_windows: List[int]
+    ) -> Optional[List[float]]:
+        """Compute the time at which each delivery starts when the points are visited in order.
+
+        Args:
+            graph (RoadGraph): Graph of the map
+            points (List[int]): Intersection IDs of the points, starting with the warehouse
+            time_windows (List[int]): Time windows of the points
+
+        Returns:
+            Optional[List[float]]: Start time in minutes of each point (departure time for the warehouse), or None if a
+            time window is missed
+        """
+        start_times = [Config.INITIAL_DEPART_TIME]
+
+        for position in range(1, len(points)):
+            start_time = TourEvaluationService.instance().get_delivery_start_time(
+                self.__get_departure_time(position - 1, start_times[-1]),
+                self.__get_length(graph, points[position - 1], points[position]),
+                time_windows[position],
+            )
+
+            if start_time is None:
+                return None
+
+            start_times.append(start_time)
+
+        return start_times
+
+    def __compute_time_slacks(
+        self,
+        graph: RoadGraph,
+        points: List[int],
+        time_windows: List[int],
+        start_times: List[float],
+    ) -> List[float]:
+        """Compute the forward time slack of each point: how much its delivery can start later without any delivery
+        from this point to the end of the tour missing its time window.
+
+        A delay is absorbed by the time the courier waits for the following time windows to start.
+
+        Args:
+            graph (RoadGraph): Graph of the map
+            points (List[int]): Intersection IDs of the points, starting with the warehouse
+            time_windows (List[int]): Time windows of the points
+            start_times (List[float]): Start time in minutes of each point
+
+        Returns:
+            List[float]: Forward time slack in minutes of each point
+        """
+        time_slacks = [float("inf")] * len(points)
+
+        for position in reversed(range(1, len(points))):
+            time_slack = (
+                TourEvaluationService.instance().get_time_window_end(
+                    time_windows[position]
+                )
+                - start_times[position]
+            )
+
+            if position + 1 < len(points):
+                waiting_time = start_times[
+                    position + 1
+                ] - TourEvaluationService.instance().get_arrival_time(
+                    start_times[position] + Config.DELIVERY_TIME,
+                    self.__get_length(graph, points[position], points[position + 1]),
+                )
+                time_slack = min(time_slack, waiting_time + time_slacks[position + 1])
+
+            time_slacks[position] = time_slack
+
+        return time_slacks
+
+    def __get_departure_time(self, position: int, start_time: float) -> float:
+        """Get the time at which the courier leaves a point of the tour.
+
+        Args:
+            position (int): Position of the point in the tour, 0 being the warehouse
+            start_time (float): Start time in minutes of the point
+
+        Returns:
+            float: Departure time in minutes
+        """
+        return start_time + Config.DELIVERY_TIME if position else start_time
+
+    def __get_length(self, graph: RoadGraph, source: int, target: int) -> float:
+        """Get the cached length of the shortest path between two intersections.
+
+        Args:
+            graph (RoadGraph): Graph of the map
+            source (int): ID of the source intersection
+            target (int): ID of the target intersection
+
+        Returns:
+            float: Length of the shortest path, infinite if the target cannot be reached
+        """
+        lengths, _ = DistanceCacheService.instance().get_cached_shortest_paths(
+            graph, source, [target]
+        )
+
+        return lengths.get(target, float("inf"))
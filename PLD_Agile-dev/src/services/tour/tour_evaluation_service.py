@@ -0,0 +1,122 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.config import Config
+from src.services.singleton import Singleton
+
+
+class TourEvaluationService(Singleton):
+    """Evaluate many complete tours at once with NumPy.
+
+    A tour is a sequence of indexes of points, starting with the warehouse at index 0, and the courier comes back to the
+    warehouse after the last point. Sequences of the same length are evaluated together as the rows of an array: the
+    timing of every sequence goes forward one position at a time, so the work done in Python only depends on the number
+    of points, not on the number of sequences.
+
+    The timing rules of a tour are defined here once and used by every solver: the courier leaves the warehouse at
+    Config.INITIAL_DEPART_TIME, travels at Config.TRAVELING_SPEED, waits for a time window to start and spends
+    Config.DELIVERY_TIME at each delivery, which must start before the end of its time window.
+    """
+
+    def evaluate_sequences(
+        self, sequences: np.ndarray, lengths: np.ndarray, time_windows: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute the length of each tour and the time at which each of its deliveries starts.
+
+        Args:
+            sequences (np.ndarray): Indexes of the points of each tour, one tour per row, each starting with the
+            warehouse
+            lengths (np.ndarray): Distances between the points, infinite when there is no path
+            time_windows (np.ndarray): Time windows of the points
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Length of each tour, infinite if it misses a time window or uses a missing
+            path, and start time in minutes of each delivery of each tour
+        """
+        sequences = np.asarray(sequences, dtype=int).reshape(len(sequences), -1)
+        lengths = np.asarray(lengths, dtype=float)
+        travel_times = self.get_travel_time(lengths)
+        time_window_starts = np.asarray(time_windows, dtype=float) * 60
+        time_window_ends = self.get_time_window_end(np.asarray(time_windows))
+
+        tour_lengths = np.zeros(len(sequences))
+        start_times = np.empty((len(sequences), sequences.shape[1] - 1))
+        departure_times = np.full(len(sequences), float(Config.INITIAL_DEPART_TIME))
+
+        for position in range(1, sequences.shape[1]):
+            sources = sequences[:, position - 1]
+            targets = sequences[:, position]
+
+            tour_lengths += lengths[sources, targets]
+            # Courier arriving before the time window waits until it starts
+            start_times[:, position - 1] = np.maximum(
+                departure_times + travel_times[sources, targets],
+                time_window_starts[targets],
+            )
+            tour_lengths[
+                start_times[:, position - 1] > time_window_ends[targets]
+            ] = float("inf")
+
+            departure_times = start_times[:, position - 1] + Config.DELIVERY_TIME
+
+        tour_lengths += lengths[sequences[:, -1], sequences[:, 0]]
+
+        return tour_lengths, start_times
+
+    def get_travel_time(self, length: float) -> float:
+        """Get the time it takes to travel a distance.
+
+        Args:
+            length (float): Distance in meters, or an array of distances
+
+        Returns:
+            float: Travel time in minutes
+        """
+        return length / (Config.TRAVELING_SPEED * 1000 / 60)
+
+    def get_arrival_time(self, departure_time: float, length: float) -> float:
+        """Get the time at which the courier arrives at a point.
+
+        Args:
+            departure_time (float): Time in minutes at which the courier leaves the previous point
+            length (float): Distance in meters to the point
+
+        Returns:
+            float: Arrival time in minutes
+        """
+        return departure_time + self.get_travel_time(length)
+
+    def get_time_window_end(self, time_window: int) -> float:
+        """Get the latest time at which a delivery can start.
+
+        Args:
+            time_window (int): Time window of the delivery, or an array of time windows
+
+        Returns:
+            float: End of the time window in minutes
+        """
+        return time_window * 60 + Config.TIME_WINDOW_SIZE
+
+    def get_delivery_start_time(
+        self, departure_time: float, length: float, time_window: int
+    ) -> Optional[float]:
+        """Get the time at which a delivery starts when leaving the previous point at a given time.
+
+        Args:
+            departure_time (float): Time in minutes at which the courier leaves the previous point
+            length (float): Distance in meters to the delivery
+            time_window (int): Time window of the delivery
+
+        Returns:
+            Optional[float]: Time in minutes at which the delivery starts, or None if the time window is missed
+        """
+        # Courier arriving before the time window waits until it starts
+        start_time = max(
+            self.get_arrival_time(departure_time, length), time_window * 60
+        )
+
+        if start_time > self.get_time_window_end(time_window):
+            return None
+
+        return start_time
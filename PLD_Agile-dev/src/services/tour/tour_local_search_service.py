@@ -0,0 +1,959 @@
+import math
+import time
+from random import Random
+from typing import Callable, List, Optional, Set, Tuple
+
+from src.config import Config
+from src.models.errors.computing_errors import TourComputingCancelledError
+from src.services.singleton import Singleton
+from src.services.tour.tour_evaluation_service import TourEvaluationService
+
+SegmentSummary = Tuple[float, float, float, float]
+"""Summary of a sequence of consecutive points of a tour: (duration, time warp, earliest start, latest start).
+
+The duration goes from the start of the first delivery to the end of the last one, including waiting times. The time
+warp is the total time by which the time windows are missed. The earliest and latest start are the bounds of the time
+at which the first delivery can start to get this duration and time warp.
+"""
+
+
+class TourLocalSearchService(Singleton):
+    """Improve a tour by applying small changes to the order of its deliveries as long as they make it shorter.
+
+    Three kinds of moves are tried: 2-opt (reverse a part of the tour), Or-opt (move one to MAX_SEGMENT_LENGTH
+    consecutive deliveries elsewhere) and swap (exchange two deliveries). A tour missing time windows is first repaired:
+    moves reducing the total time by which the time windows are missed are accepted before shorter ones.
+
+    Checking the time windows of a move takes constant time. The summaries of the beginnings and ends of the tour are
+    computed once for each tour, and the new tour is checked by concatenating the summaries of its parts.
+
+    For large tours, the large neighbourhood search explores much bigger changes by removing and inserting back many
+    deliveries at once, and runs until a deadline or a number of iterations.
+    """
+
+    MAX_SEGMENT_LENGTH = 3
+    """Maximum number of consecutive deliveries moved by the Or-opt move
+    """
+    EPSILON = 1e-6
+    """Smallest change of length or time considered an improvement, to ignore floating point errors
+    """
+    DESTROY_RATIO = 0.3
+    """Maximum share of the deliveries removed from the tour at each iteration of the large neighbourhood search
+    """
+    WORST_REMOVAL_RANDOMNESS = 3
+    """Exponent of the random choice of the deliveries removed for being the worst placed, the higher the more likely
+    the worst placed deliveries are removed
+    """
+    INITIAL_TEMPERATURE_RATIO = 0.05
+    """Temperature at the start of the large neighbourhood search, as a share of the length of the initial tour. A tour
+    longer by the temperature is accepted with a probability of 1/e
+    """
+    FINAL_TEMPERATURE_RATIO = 0.0005
+    """Temperature at the end of the large neighbourhood search, as a share of the length of the initial tour
+    """
+
+    def improve_cycle(
+        self,
+        cycle: List[int],
+        lengths: List[List[float]],
+        time_windows: List[int],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        deadline: Optional[float] = None,
+    ) -> Optional[List[int]]:
+        """Improve the order of the points of a tour until no move makes it shorter.
+
+        Args:
+            cycle (List[int]): Indexes of the points in the order they are visited, starting with the warehouse (0)
+            lengths (List[List[float]]): Distances between the points (infinite when there is no path)
+            time_windows (List[int]): Time windows of the points
+            is_cancelled (Optional[Callable[[], bool]]): Checked regularly, the search raises a
+            TourComputingCancelledError when it returns True. Defaults to never cancelled.
+            deadline (Optional[float]): Time (as returned by time.time()) at which the search stops and returns the
+            best tour found so far. Defaults to no limit.
+
+        Returns:
+            Optional[List[int]]: Improved order of the points, starting with the warehouse, or None if no order
+            meeting every time window was found
+        """
+        route = list(cycle) + [cycle[0]]
+
+        while True:
+            if is_cancelled and is_cancelled():
+                raise TourComputingCancelledError()
+
+            prefixes, suffixes, prefix_lengths = self.__summarize_route(
+                route, lengths, time_windows
+            )
+            cost = (prefixes[-1][1], prefix_lengths[-1])
+
+            if deadline is not None and time.time() >= deadline:
+                break
+
+            for find_move in [
+                self.__find_two_opt_move,
+                self.__find_or_opt_move,
+                self.__find_swap_move,
+            ]:
+                new_route = find_move(
+                    route,
+                    lengths,
+                    time_windows,
+                    prefixes,
+                    suffixes,
+                    prefix_lengths,
+                    cost,
+                )
+                if new_route:
+                    route = new_route
+                    break
+            else:
+                break
+
+        if cost[0] > self.EPSILON:
+            return None
+
+        return route[:-1]
+
+    def search_large_neighbourhood(
+        self,
+        cycle: List[int],
+        lengths: List[List[float]],
+        time_windows: List[int],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        deadline: Optional[float] = None,
+        max_iterations: Optional[int] = None,
+        seed: Optional[int] = None,
+        on_improvement: Optional[Callable[[List[int]], None]] = None,
+    ) -> Optional[List[int]]:
+        """Improve a tour with a large neighbourhood search.
+
+        At each iteration, some deliveries are removed from the tour (chosen at random, close to each other, or among
+        the worst placed ones) and inserted back one by one at the place that makes the tour the shortest while meeting
+        the time windows. A longer tour is accepted with a probability decreasing with the time (simulated annealing),
+        so that the search does not stay stuck around the first local optimum.
+
+        Args:
+            cycle (List[int]): Indexes of the points in the order they are visited, starting with the warehouse (0)
+            lengths (List[List[float]]): Distances between the points (infinite when there is no path)
+            time_windows (List[int]): Time windows of the points
+            is_cancelled (Optional[Callable[[], bool]]): Checked at each iteration, the search raises a
+            TourComputingCancelledError when it returns True. Defaults to never cancelled.
+            deadline (Optional[float]): Time (as returned by time.time()) at which the search stops. Defaults to no
+            limit.
+            max_iterations (Optional[int]): Number of iterations after which the search stops. Defaults to no limit.
+            seed (Optional[int]): Seed of the random choices. Without deadline, the same seed always gives the same
+            tour. Defaults to a random seed.
+            on_improvement (Optional[Callable[[List[int]], None]]): Called with each better tour found by the search.
+            Defaults to None.
+
+        Raises:
+            ValueError: If neither a deadline nor a maximum number of iterations is given
+
+        Returns:
+            Optional[List[int]]: Shortest order of the points found, starting with the warehouse, or None if no order
+            meeting every time window was found
+        """
+        if deadline is None and max_iterations is None:
+            raise ValueError("The search needs a deadline or a number of iterations")
+
+        current_cycle = self.improve_cycle(
+            cycle, lengths, time_windows, is_cancelled, deadline
+        )
+
+        if current_cycle is None or len(current_cycle) < 3:
+            return current_cycle
+
+        random = Random(seed)
+        current_length = self.__get_cycle_length(current_cycle, lengths)
+        best_cycle, best_length = current_cycle, current_length
+        initial_temperature = self.INITIAL_TEMPERATURE_RATIO * current_length
+        start_time = time.time()
+        iteration = 0
+
+        while True:
+            if is_cancelled and is_cancelled():
+                raise TourComputingCancelledError()
+
+            progress = self.__get_progress(
+                iteration, max_iterations, start_time, deadline
+            )
+            if progress >= 1:
+                break
+            iteration += 1
+
+            remove_points = random.choice(
+                [
+                    self.__remove_random_points,
+                    self.__remove_related_points,
+                    self.__remove_worst_points,
+                ]
+            )
+            removed_points = remove_points(
+                current_cycle,
+                random.randint(
+                    1, max(1, int((len(current_cycle) - 1) * self.DESTROY_RATIO))
+                ),
+                lengths,
+                time_windows,
+                random,
+            )
+            new_cycle = self.__insert_points(
+                [point for point in current_cycle if point not in removed_points],
+                removed_points,
+                lengths,
+                time_windows,
+                random,
+            )
+
+            if new_cycle is None:
+                continue
+
+            new_length = self.__get_cycle_length(new_cycle, lengths)
+            temperature = (
+                initial_temperature
+                * (self.FINAL_TEMPERATURE_RATIO / self.INITIAL_TEMPERATURE_RATIO)
+                ** progress
+            )
+
+            if new_length < current_length - self.EPSILON or (
+                temperature > 0
+                and random.random()
+                < math.exp((current_length - new_length) / temperature)
+            ):
+                current_cycle, current_length = new_cycle, new_length
+
+                if current_length < best_length - self.EPSILON:
+                    best_cycle, best_length = current_cycle, current_length
+
+                    if on_improvement:
+                        on_improvement(best_cycle)
+
+        return best_cycle
+
+    def __remove_random_points(
+        self,
+        cycle: List[int],
+        count: int,
+        lengths: List[List[float]],
+        time_windows: List[int],
+        random: Random,
+    ) -> Set[int]:
+        """Choose deliveries of a tour at random.
+
+        Args:
+            cycle (List[int]): Indexes of the points, starting with the warehouse
+            count (int): Number of deliveries to choose
+            lengths (List[List[float]]): Distances between the points
+            time_windows (List[int]): Time windows of the points
+            random (Random): Random generator of the search
+
+        Returns:
+            Set[int]: Indexes of the chosen deliveries
+        """
+        return set(random.sample(cycle[1:], count))
+
+    def __remove_related_points(
+        self,
+        cycle: List[int],
+        count: int,
+        lengths: List[List[float]],
+        time_windows: List[int],
+        random: Random,
+    ) -> Set[int]:
+        """Choose a delivery of a tour at random and the deliveries closest to it, preferably in the same time window.
+
+        Args:
+            cycle (List[int]): Indexes of the points, starting with the warehouse
+            count (int): Number of deliveries to choose
+            lengths (List[List[float]]): Distances between the points
+            time_windows (List[int]): Time windows of the points
+            random (Random): Random generator of the search
+
+        Returns:
+            Set[int]: Indexes of the chosen deliveries
+        """
+        origin = random.choice(cycle[1:])
+
+        return {origin} | set(
+            sorted(
+                (point for point in cycle[1:] if point != origin),
+                key=lambda point: min(lengths[origin][point], lengths[point][origin])
+                * (1 + abs(time_windows[origin] - time_windows[point])),
+            )[: count - 1]
+        )
+
+    def __remove_worst_points(
+        self,
+        cycle: List[int],
+        count: int,
+        lengths: List[List[float]],
+        time_windows: List[int],
+        random: Random,
+    ) -> Set[int]:
+        """Choose deliveries of a tour among the ones whose removal shortens the tour the most.
+
+        Args:
+            cycle (List[int]): Indexes of the points, starting with the warehouse
+            count (int): Number of deliveries to choose
+            lengths (List[List[float]]): Distances between the points
+            time_windows (List[int]): Time windows of the points
+            random (Random): Random generator of the search
+
+        Returns:
+            Set[int]: Indexes of the chosen deliveries
+        """
+        route = cycle + [cycle[0]]
+        candidates = sorted(
+            range(1, len(cycle)),
+            key=lambda position: lengths[route[position - 1]][route[position + 1]]
+            - lengths[route[position - 1]][route[position]]
+            - lengths[route[position]][route[position + 1]],
+        )
+        removed_points = set()
+
+        while len(removed_points) < count:
+            position = candidates.pop(
+                int(random.random() ** self.WORST_REMOVAL_RANDOMNESS * len(candidates))
+            )
+            removed_points.add(route[position])
+
+        return removed_points
+
+    def __insert_points(
+        self,
+        cycle: List[int],
+        points: Set[int],
+        lengths: List[List[float]],
+        time_windows: List[int],
+        random: Random,
+    ) -> Optional[List[int]]:
+        """Insert deliveries in a tour one by one, in a random order, each at the place that makes the tour the
+        shortest while meeting the time windows.
+
+        Args:
+            cycle (List[int]): Indexes of the points, starting with the warehouse
+            points (Set[int]): Indexes of the deliveries to insert
+            lengths (List[List[float]]): Distances between the points
+            time_windows (List[int]): Time windows of the points
+            random (Random): Random generator of the search
+
+        Returns:
+            Optional[List[int]]: Tour with the inserted deliveries, or None if one of them cannot be inserted
+        """
+        route = cycle + [cycle[0]]
+        points = sorted(points)
+        random.shuffle(points)
+
+        for point in points:
+            prefixes, suffixes, _ = self.__summarize_route(route, lengths, time_windows)
+            point_summary = self.__summarize_point(point, time_windows)
+            best_position, best_cost = None, float("inf")
+
+            for position in range(len(route) - 1):
+                previous_point, next_point = route[position], route[position + 1]
+                cost = (
+                    lengths[previous_point][point]
+                    + lengths[point][next_point]
+                    - lengths[previous_point][next_point]
+                )
+
+                if cost >= best_cost:
+                    continue
+
+                time_warp, _ = self.__evaluate(
+                    [
+                        (prefixes[position], previous_point, previous_point),
+                        (point_summary, point, point),
+                        (suffixes[position + 1], next_point, next_point),
+                    ],
+                    lengths,
+                    cost,
+                )
+
+                if time_warp <= self.EPSILON:
+                    best_position, best_cost = position, cost
+
+            if best_position is None:
+                return None
+
+            route.insert(best_position + 1, point)
+
+        return route[:-1]
+
+    def __get_progress(
+        self,
+        iteration: int,
+        max_iterations: Optional[int],
+        start_time: float,
+        deadline: Optional[float],
+    ) -> float:
+        """Get the progress of the large neighbourhood search, from 0 at its start to 1 when it has to stop.
+
+        Args:
+            iteration (int): Number of iterations done
+            max_iterations (Optional[int]): Number of iterations after which the search stops
+            start_time (float): Time (as returned by time.time()) at which the search started
+            deadline (Optional[float]): Time at which the search stops
+
+        Returns:
+            float: Progress of the search
+        """
+        progress = 0.0
+
+        if max_iterations is not None:
+            progress = iteration / max_iterations if max_iterations > 0 else 1.0
+
+        if deadline is not None:
+            progress = max(
+                progress,
+                (time.time() - start_time) / (deadline - start_time)
+                if deadline > start_time
+                else 1.0,
+            )
+
+        return min(progress, 1.0)
+
+    def __get_cycle_length(self, cycle: List[int], lengths: List[List[float]]) -> float:
+        """Get the length of a tour.
+
+        Args:
+            cycle (List[int]): Indexes of the points, starting with the warehouse
+            lengths (List[List[float]]): Distances between the points
+
+        Returns:
+            float: Length of the tour, coming back to the warehouse
+        """
+        return sum(
+            lengths[source][target]
+            for source, target in zip(cycle, cycle[1:] + cycle[:1])
+        )
+
+    def __find_two_opt_move(
+        self,
+        route: List[int],
+        lengths: List[List[float]],
+        time_windows: List[int],
+        prefixes: List[SegmentSummary],
+        suffixes: List[SegmentSummary],
+        prefix_lengths: List[float],
+        cost: Tuple[float, float],
+    ) -> Optional[List[int]]:
+        """Find a part of the route whose reversal improves it.
+
+        Args:
+            route (List[int]): Indexes of the points, starting and ending with the warehouse
+            lengths (List[List[float]]): Distances between the points
+            time_windows (List[int]): Time windows of the points
+            prefixes (List[SegmentSummary]): Summaries of the beginnings of the route
+            suffixes (List[SegmentSummary]): Summaries of the ends of the route
+            prefix_lengths (List[float]): Lengths of the beginnings of the route
+            cost (Tuple[float, float]): Time warp and length of the route
+
+        Returns:
+            Optional[List[int]]: Improved route, or None if no reversal improves it
+        """
+        last = len(route) - 1
+
+        for start in range(1, last - 1):
+            before = route[start - 1]
+            reversed_summary = self.__summarize_point(route[start], time_windows)
+            reversed_length = 0.0
+
+            for end in range(start + 1, last):
+                reversed_length += lengths[route[end]][route[end - 1]]
+                if reversed_length == float("inf"):
+                    break
+
+                reversed_summary = self.__concatenate(
+                    self.__summarize_point(route[end], time_windows),
+                    reversed_summary,
+                    TourEvaluationService.instance().get_travel_time(
+                        lengths[route[end]][route[end - 1]]
+                    ),
+                )
+                if reversed_summary[1] > cost[0] + self.EPSILON:
+                    # Reversing a longer part only adds time warp
+                    break
+
+                after = route[end + 1]
+                new_cost = self.__evaluate(
+                    [
+                        (prefixes[start - 1], before, before),
+                        (reversed_summary, route[end], route[start]),
+                        (suffixes[end + 1], after, after),
+                    ],
+                    lengths,
+                    prefix_lengths[start - 1]
+                    + lengths[before][route[end]]
+                    + reversed_length
+                    + lengths[route[start]][after]
+                    + prefix_lengths[-1]
+                    - prefix_lengths[end + 1],
+                )
+
+                if self.__is_better(new_cost, cost):
+                    return (
+                        route[:start] + route[start : end + 1][::-1] + route[end + 1 :]
+                    )
+
+        return None
+
+    def __find_or_opt_move(
+        self,
+        route: List[int],
+        lengths: List[List[float]],
+        time_windows: List[int],
+        prefixes: List[SegmentSummary],
+        suffixes: List[SegmentSummary],
+        prefix_lengths: List[float],
+        cost: Tuple[float, float],
+    ) -> Optional[List[int]]:
+        """Find consecutive deliveries whose move to another place of the route improves it.
+
+        Args:
+            route (List[int]): Indexes of the points, starting and ending with the warehouse
+            lengths (List[List[float]]): Distances between the points
+            time_windows (List[int]): Time windows of the points
+            prefixes (List[SegmentSummary]): Summaries of the beginnings of the route
+            suffixes (List[SegmentSummary]): Summaries of the ends of the route
+            prefix_lengths (List[float]): Lengths of the beginnings of the route
+            cost (Tuple[float, float]): Time warp and length of the route
+
+        Returns:
+            Optional[List[int]]: Improved route, or None if no move improves it
+        """
+        last = len(route) - 1
+
+        for segment_length in range(1, self.MAX_SEGMENT_LENGTH + 1):
+            for start in range(1, last - segment_length + 1):
+                end = start + segment_length - 1
+                first, final = route[start], route[end]
+                segment = route[start : end + 1]
+                segment_summary = self.__summarize_points(
+                    segment, lengths, time_windows
+                )
+                # Length of the route without the links to the segment, its neighbours being linked together
+                remaining_length = (
+                    prefix_lengths[-1]
+                    - (prefix_lengths[end + 1] - prefix_lengths[start - 1])
+                    + (prefix_lengths[end] - prefix_lengths[start])
+                    + lengths[route[start - 1]][route[end + 1]]
+                )
+
+                if segment_summary is None or remaining_length == float("inf"):
+                    continue
+
+                # Segment moved before its current place, between route[position] and route[position + 1]
+                middle_summary = None
+                for position in range(start - 2, -1, -1):
+                    middle_summary = self.__prepend(
+                        route[position + 1],
+                        middle_summary,
+                        route[position + 2],
+                        lengths,
+                        time_windows,
+                    )
+                    if middle_summary is None or middle_summary[1] > cost[0] + (
+                        self.EPSILON
+                    ):
+                        break
+
+                    point, next_point = route[position], route[position + 1]
+                    new_cost = self.__evaluate(
+                        [
+                            (prefixes[position], point, point),
+                            (segment_summary, first, final),
+                            (middle_summary, next_point, route[start - 1]),
+                            (suffixes[end + 1], route[end + 1], route[end + 1]),
+                        ],
+                        lengths,
+                        remaining_length
+                        - lengths[point][next_point]
+                        + lengths[point][first]
+                        + lengths[final][next_point],
+                    )
+
+                    if self.__is_better(new_cost, cost):
+                        return (
+                            route[: position + 1]
+                            + segment
+                            + route[position + 1 : start]
+                            + route[end + 1 :]
+                        )
+
+                # Segment moved after its current place, between route[position] and route[position + 1]
+                middle_summary = None
+                for position in range(end + 1, last):
+                    middle_summary = self.__append(
+                        middle_summary,
+                        route[position - 1],
+                        route[position],
+                        lengths,
+                        time_windows,
+                    )
+                    if middle_summary is None or middle_summary[1] > cost[0] + (
+                        self.EPSILON
+                    ):
+                        break
+
+                    point, next_point = route[position], route[position + 1]
+                    new_cost = self.__evaluate(
+                        [
+                            (prefixes[start - 1], route[start - 1], route[start - 1]),
+                            (middle_summary, route[end + 1], point),
+                            (segment_summary, first, final),
+                            (suffixes[position + 1], next_point, next_point),
+                        ],
+                        lengths,
+                        remaining_length
+                        - lengths[point][next_point]
+                        + lengths[point][first]
+                        + lengths[final][next_point],
+                    )
+
+                    if self.__is_better(new_cost, cost):
+                        return (
+                            route[:start]
+                            + route[end + 1 : position + 1]
+                            + segment
+                            + route[position + 1 :]
+                        )
+
+        return None
+
+    def __find_swap_move(
+        self,
+        route: List[int],
+        lengths: List[List[float]],
+        time_windows: List[int],
+        prefixes: List[SegmentSummary],
+        suffixes: List[SegmentSummary],
+        prefix_lengths: List[float],
+        cost: Tuple[float, float],
+    ) -> Optional[List[int]]:
+        """Find two deliveries that are not next to each other whose exchange improves the route.
+
+        Two deliveries next to each other are exchanged by the Or-opt move.
+
+        Args:
+            route (List[int]): Indexes of the points, starting and ending with the warehouse
+            lengths (List[List[float]]): Distances between the points
+            time_windows (List[int]): Time windows of the points
+            prefixes (List[SegmentSummary]): Summaries of the beginnings of the route
+            suffixes (List[SegmentSummary]): Summaries of the ends of the route
+            prefix_lengths (List[float]): Lengths of the beginnings of the route
+            cost (Tuple[float, float]): Time warp and length of the route
+
+        Returns:
+            Optional[List[int]]: Improved route, or None if no exchange improves it
+        """
+        last = len(route) - 1
+
+        for first_position in range(1, last - 2):
+            before, first, after = route[first_position - 1 : first_position + 2]
+            middle_summary = None
+
+            for second_position in range(first_position + 2, last):
+                middle_summary = self.__append(
+                    middle_summary,
+                    route[second_position - 2],
+                    route[second_position - 1],
+                    lengths,
+                    time_windows,
+                )
+                if middle_summary is None or middle_summary[1] > cost[0] + (
+                    self.EPSILON
+                ):
+                    break
+
+                second_before, second, second_after = route[
+                    second_position - 1 : second_position + 2
+                ]
+                new_cost = self.__evaluate(
+                    [
+                        (prefixes[first_position - 1], before, before),
+                        (self.__summarize_point(second, time_windows), second, second),
+                        (middle_summary, after, second_before),
+                        (self.__summarize_point(first, time_windows), first, first),
+                        (suffixes[second_position + 1], second_after, second_after),
+                    ],
+                    lengths,
+                    prefix_lengths[-1]
+                    - lengths[before][first]
+                    - lengths[first][after]
+                    - lengths[second_before][second]
+                    - lengths[second][second_after]
+                    + lengths[before][second]
+                    + lengths[second][after]
+                    + lengths[second_before][first]
+                    + lengths[first][second_after],
+                )
+
+                if self.__is_better(new_cost, cost):
+                    new_route = list(route)
+                    new_route[first_position] = second
+                    new_route[second_position] = first
+                    return new_route
+
+        return None
+
+    def __summarize_route(
+        self, route: List[int], lengths: List[List[float]], time_windows: List[int]
+    ) -> Tuple[List[SegmentSummary], List[SegmentSummary], List[float]]:
+        """Summarize every beginning and every end of a route.
+
+        Args:
+            route (List[int]): Indexes of the points, starting and ending with the warehouse
+            lengths (List[List[float]]): Distances between the points
+            time_windows (List[int]): Time windows of the points
+
+        Returns:
+            Tuple[List[SegmentSummary], List[SegmentSummary], List[float]]: Summaries of the route up to each position,
+            summaries of the route from each position and lengths of the route up to each position
+        """
+        last = len(route) - 1
+        prefixes = [self.__summarize_warehouse_departure()]
+        prefix_lengths = [0.0]
+
+        for position in range(1, last + 1):
+            length = lengths[route[position - 1]][route[position]]
+            prefixes.append(
+                self.__concatenate(
+                    prefixes[-1],
+                    self.__summarize_warehouse_arrival()
+                    if position == last
+                    else self.__summarize_point(route[position], time_windows),
+                    TourEvaluationService.instance().get_travel_time(length),
+                )
+            )
+            prefix_lengths.append(prefix_lengths[-1] + length)
+
+        suffixes = [self.__summarize_warehouse_arrival()]
+
+        for position in range(last - 1, -1, -1):
+            suffixes.append(
+                self.__concatenate(
+                    self.__summarize_warehouse_departure()
+                    if position == 0
+                    else self.__summarize_point(route[position], time_windows),
+                    suffixes[-1],
+                    TourEvaluationService.instance().get_travel_time(
+                        lengths[route[position]][route[position + 1]]
+                    ),
+                )
+            )
+
+        return prefixes, suffixes[::-1], prefix_lengths
+
+    def __summarize_points(
+        self, points: List[int], lengths: List[List[float]], time_windows: List[int]
+    ) -> Optional[SegmentSummary]:
+        """Summarize consecutive deliveries.
+
+        Args:
+            points (List[int]): Indexes of the deliveries
+            lengths (List[List[float]]): Distances between the points
+            time_windows (List[int]): Time windows of the points
+
+        Returns:
+            Optional[SegmentSummary]: Summary of the deliveries, or None if two of them are not connected
+        """
+        summary = None
+
+        for previous, point in zip([None] + points, points):
+            summary = self.__append(summary, previous, point, lengths, time_windows)
+
+            if summary is None:
+                return None
+
+        return summary
+
+    def __prepend(
+        self,
+        point: int,
+        summary: Optional[SegmentSummary],
+        next_point: int,
+        lengths: List[List[float]],
+        time_windows: List[int],
+    ) -> Optional[SegmentSummary]:
+        """Summarize a delivery followed by summarized deliveries.
+
+        Args:
+            point (int): Index of the delivery
+            summary (Optional[SegmentSummary]): Summary of the following deliveries, None if there are none
+            next_point (int): Index of the first following delivery
+            lengths (List[List[float]]): Distances between the points
+            time_windows (List[int]): Time windows of the points
+
+        Returns:
+            Optional[SegmentSummary]: Summary of all the deliveries, or None if they are not connected
+        """
+        point_summary = self.__summarize_point(point, time_windows)
+
+        if summary is None:
+            return point_summary
+
+        if lengths[point][next_point] == float("inf"):
+            return None
+
+        return self.__concatenate(
+            point_summary,
+            summary,
+            TourEvaluationService.instance().get_travel_time(
+                lengths[point][next_point]
+            ),
+        )
+
+    def __append(
+        self,
+        summary: Optional[SegmentSummary],
+        previous_point: Optional[int],
+        point: int,
+        lengths: List[List[float]],
+        time_windows: List[int],
+    ) -> Optional[SegmentSummary]:
+        """Summarize summarized deliveries followed by a delivery.
+
+        Args:
+            summary (Optional[SegmentSummary]): Summary of the previous deliveries, None if there are none
+            previous_point (Optional[int]): Index of the last previous delivery
+            point (int): Index of the delivery
+            lengths (List[List[float]]): Distances between the points
+            time_windows (List[int]): Time windows of the points
+
+        Returns:
+            Optional[SegmentSummary]: Summary of all the deliveries, or None if they are not connected
+        """
+        point_summary = self.__summarize_point(point, time_windows)
+
+        if summary is None:
+            return point_summary
+
+        if lengths[previous_point][point] == float("inf"):
+            return None
+
+        return self.__concatenate(
+            summary,
+            point_summary,
+            TourEvaluationService.instance().get_travel_time(
+                lengths[previous_point][point]
+            ),
+        )
+
+    def __evaluate(
+        self,
+        parts: List[Tuple[SegmentSummary, int, int]],
+        lengths: List[List[float]],
+        length: float,
+    ) -> Tuple[float, float]:
+        """Compute the cost of a route made of summarized parts.
+
+        Args:
+            parts (List[Tuple[SegmentSummary, int, int]]): Summary, first point and last point of each part
+            lengths (List[List[float]]): Distances between the points
+            length (float): Length of the route
+
+        Returns:
+            Tuple[float, float]: Time warp and length of the route, infinite if two parts are not connected
+        """
+        if length == float("inf"):
+            return float("inf"), float("inf")
+
+        summary, _, last_point = parts[0]
+
+        for part_summary, first_point, part_last_point in parts[1:]:
+            summary = self.__concatenate(
+                summary,
+                part_summary,
+                TourEvaluationService.instance().get_travel_time(
+                    lengths[last_point][first_point]
+                ),
+            )
+            last_point = part_last_point
+
+        return summary[1], length
+
+    def __is_better(
+        self, new_cost: Tuple[float, float], cost: Tuple[float, float]
+    ) -> bool:
+        """Check that a route is better than another one: it misses the time windows by less time, or it is shorter.
+
+        Args:
+            new_cost (Tuple[float, float]): Time warp and length of the new route
+            cost (Tuple[float, float]): Time warp and length of the current route
+
+        Returns:
+            bool: True if the new route is better
+        """
+        if new_cost[0] < cost[0] - self.EPSILON:
+            return True
+
+        return (
+            new_cost[0] <= cost[0] + self.EPSILON
+            and new_cost[1] < cost[1] - self.EPSILON
+        )
+
+    def __concatenate(
+        self, first: SegmentSummary, second: SegmentSummary, travel_time: float
+    ) -> SegmentSummary:
+        """Summarize two sequences of points visited one after the other.
+
+        Args:
+            first (SegmentSummary): Summary of the first sequence
+            second (SegmentSummary): Summary of the second sequence
+            travel_time (float): Travel time in minutes from the last point of the first sequence to the first point of
+            the second one
+
+        Returns:
+            SegmentSummary: Summary of the concatenated sequence
+        """
+        first_duration, first_time_warp, first_earliest, first_latest = first
+        second_duration, second_time_warp, second_earliest, second_latest = second
+
+        if travel_time == float("inf"):
+            return float("inf"), float("inf"), first_earliest, first_latest
+
+        # Time between the start of the first sequence and the arrival at the second one
+        delay = first_duration - first_time_warp + travel_time
+        waiting_time = max(second_earliest - delay - first_latest, 0)
+        time_warp = max(first_earliest + delay - second_latest, 0)
+
+        return (
+            first_duration + second_duration + travel_time + waiting_time,
+            first_time_warp + second_time_warp + time_warp,
+            max(second_earliest - delay, first_earliest) - waiting_time,
+            min(second_latest - delay, first_latest) + time_warp,
+        )
+
+    def __summarize_point(self, point: int, time_windows: List[int]) -> SegmentSummary:
+        """Summarize a single delivery.
+
+        Args:
+            point (int): Index of the delivery
+            time_windows (List[int]): Time windows of the points
+
+        Returns:
+            SegmentSummary: Summary of the delivery
+        """
+        return (
+            Config.DELIVERY_TIME,
+            0,
+            time_windows[point] * 60,
+            TourEvaluationService.instance().get_time_window_end(time_windows[point]),
+        )
+
+    def __summarize_warehouse_departure(self) -> SegmentSummary:
+        """Summarize the departure from the warehouse at the start of the tour.
+
+        Returns:
+            SegmentSummary: Summary of the departure
+        """
+        return 0, 0, Config.INITIAL_DEPART_TIME, Config.INITIAL_DEPART_TIME
+
+    def __summarize_warehouse_arrival(self) -> SegmentSummary:
+        """Summarize the arrival at the warehouse at the end of the tour, which has no time window.
+
+        Returns:
+            SegmentSummary: Summary of the arrival
+        """
+        return 0, 0, float("-inf"), float("inf")
@@ -0,0 +1,167 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple
+
+from src.config import Config
+from src.models.map import Map
+from src.models.tour import DeliveryRequest, TourComputingResult
+from src.services.map.map_service import MapService
+from src.services.singleton import Singleton
+
+TourFingerprint = Tuple[int, Tuple[Tuple[int, int], ...], Hashable]
+"""Canonical key of a tour computation: (warehouse intersection ID, sorted (intersection ID, time window) of the
+deliveries, solver settings)
+"""
+
+
+class TourResultCacheService(Singleton):
+    """Keep the results of the last tour computations of the current map, so that computing a tour request that was
+    already solved (after an undo or a redo, or when an edit is reverted) returns at once.
+
+    Results are keyed by a fingerprint that does not depend on the order of the deliveries or on the tour they belong
+    to. The least recently used results are dropped when there are more than Config.TOUR_RESULT_CACHE_SIZE results or
+    when their estimated size is over Config.TOUR_RESULT_CACHE_MEMORY. The cache is emptied when the map changes.
+
+    Results are added from the threads that wait for the computations, so the cache is protected by a lock.
+    """
+
+    RESULT_ITEM_SIZE = 64
+    """Estimated size in bytes of an intersection ID or a delivery of a cached result
+    """
+
+    __map: Optional[Map]
+    __results: "OrderedDict[TourFingerprint, TourComputingResult]"
+    __memory: int
+    __lock: threading.Lock
+
+    def __init__(self) -> None:
+        self.__map = None
+        self.__results = OrderedDict()
+        self.__memory = 0
+        self.__lock = threading.Lock()
+
+        MapService.instance().map.subscribe(self.__on_map_change)
+
+    def get_fingerprint(
+        self, deliveries: List[DeliveryRequest], solver_settings: Hashable
+    ) -> TourFingerprint:
+        """Get the canonical key of the computation of a tour.
+
+        Args:
+            deliveries (List[DeliveryRequest]): The list of delivery requests, starting with the warehouse
+            solver_settings (Hashable): Settings of the solvers that change the computed tours
+
+        Returns:
+            TourFingerprint: Key of the computation
+        """
+        return (
+            deliveries[0].location.segment.origin.id,
+            tuple(
+                sorted(
+                    (delivery.location.segment.origin.id, delivery.time_window)
+                    for delivery in deliveries[1:]
+                )
+            ),
+            solver_settings,
+        )
+
+    def get_result(
+        self, map: Map, fingerprint: TourFingerprint
+    ) -> Optional[TourComputingResult]:
+        """Get the cached result of a computation and mark it as the most recently used.
+
+        Args:
+            map (Map): Map of the computation
+            fingerprint (TourFingerprint): Key of the computation
+
+        Returns:
+            Optional[TourComputingResult]: Cached result, None if the computation is not cached
+        """
+        with self.__lock:
+            if map is not self.__map or fingerprint not in self.__results:
+                return None
+
+            self.__results.move_to_end(fingerprint)
+
+            return self.__results[fingerprint]
+
+    def add_result(
+        self, map: Map, fingerprint: TourFingerprint, result: TourComputingResult
+    ) -> None:
+        """Cache the result of a computation, dropping the least recently used results if the cache is full.
+
+        Args:
+            map (Map): Map of the computation
+            fingerprint (TourFingerprint): Key of the computation
+            result (TourComputingResult): Result of the computation
+
+        Returns:
+            None
+        """
+        with self.__lock:
+            if map is not self.__map:
+                self.__clear()
+                self.__map = map
+
+            if fingerprint in self.__results:
+                self.__memory -= self.__get_memory(
+                    fingerprint, self.__results[fingerprint]
+                )
+
+            self.__results[fingerprint] = result
+            self.__results.move_to_end(fingerprint)
+            self.__memory += self.__get_memory(fingerprint, result)
+
+            while self.__results and (
+                len(self.__results) > Config.TOUR_RESULT_CACHE_SIZE
+                or self.__memory > Config.TOUR_RESULT_CACHE_MEMORY
+            ):
+                dropped_fingerprint, dropped_result = self.__results.popitem(last=False)
+                self.__memory -= self.__get_memory(dropped_fingerprint, dropped_result)
+
+    def clear(self) -> None:
+        """Remove all the cached results.
+
+        Returns:
+            None
+        """
+        with self.__lock:
+            self.__clear()
+
+    def __clear(self) -> None:
+        """Remove all the cached results, the lock being held.
+
+        Returns:
+            None
+        """
+        self.__map = None
+        self.__results = OrderedDict()
+        self.__memory = 0
+
+    def __get_memory(
+        self, fingerprint: TourFingerprint, result: TourComputingResult
+    ) -> int:
+        """Estimate the memory used by a cached result.
+
+        Args:
+            fingerprint (TourFingerprint): Key of the result
+            result (TourComputingResult): Cached result
+
+        Returns:
+            int: Estimated size in bytes
+        """
+        return self.RESULT_ITEM_SIZE * (
+            len(fingerprint[1]) + len(result.route) + len(result.deliveries)
+        )
+
+    def __on_map_change(self, map: Optional[Map]) -> None:
+        """Empty the cache when another map is published.
+
+        Args:
+            map (Optional[Map]): New map
+
+        Returns:
+            None
+        """
+        if map is not self.__map:
+            self.clear()
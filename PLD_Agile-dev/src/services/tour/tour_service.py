@@ -1,8 +1,9 @@
+from dataclasses import replace
 from time import sleep
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
-from PyQt6.QtCore import QThread
+from PyQt6.QtCore import Qt, QThread, QTimer
 from reactivex import Observable, combine_latest
 from reactivex.operators import map
 from reactivex.subject import BehaviorSubject
@@ -23,8 +24,11 @@ from src.services.delivery_man.delivery_man_service import DeliveryManService
 from src.services.map.delivery_location_service import DeliveryLocationService
 from src.services.map.map_service import MapService
 from src.services.singleton import Singleton
+from src.services.tour.tour_computing_pool_service import TourComputingPoolService
 from src.services.tour.tour_computing_worker import TourComputingWorker
+from src.services.tour.tour_editing_service import TourEditingService
 from src.services.tour.tour_saving_service import TourSavingService
+from src.services.tour.tour_time_computing_service import TourTimeComputingService
 
 COLORS = [
     "#598BB4",
@@ -49,6 +53,11 @@ class TourService(Singleton):
     __is_computing: BehaviorSubject[bool]
     __worker: Optional[TourComputingWorker]
     __thread: Optional[QThread]
+    __timer: Optional[QTimer]
+
+    COMPUTING_DELAY = 250
+    """Delay in milliseconds between the last edit of the tour requests and the start of the computation of the tours
+    """
 
     def __init__(self) -> None:
         self.__tour_requests = BehaviorSubject({})
@@ -57,6 +66,7 @@ class TourService(Singleton):
         self.__is_computing = BehaviorSubject(False)
         self.__worker = None
         self.__thread = None
+        self.__timer = None
 
     @property
     def tour_requests(self) -> Observable[Dict[TourID, TourRequest]]:
@@ -96,8 +106,12 @@ class TourService(Singleton):
         Returns:
             None
         """
+        TourComputingPoolService.instance().cancel_computations()
+        if self.__timer:
+            self.__timer.stop()
         self.__tour_requests.on_next({})
         self.__computed_tours.on_next({})
+        self.__is_computing.on_next(False)
 
     def get_tour_requests(self) -> List[TourRequest]:
         """Returns a list of all tour requests.
@@ -152,7 +166,10 @@ class TourService(Singleton):
 
         self.__tour_requests.on_next(self.__tour_requests.value)
 
-        self.compute_tours()
+        if not self.__publish_computed_tours(
+            self.__insert_delivery_request(tour_request, delivery_request)
+        ):
+            self.compute_tours()
 
         return delivery_request
 
@@ -186,7 +203,10 @@ class TourService(Singleton):
         if self.__selected_delivery.value == tour_request:
             self.__selected_delivery.on_next(None)
 
-        self.compute_tours()
+        if not self.__publish_computed_tours(
+            self.__remove_delivery_request(tour_request, delivery_request)
+        ):
+            self.compute_tours()
 
         return delivery_request
 
@@ -241,52 +261,100 @@ class TourService(Singleton):
 
         del tour_request.deliveries[delivery_request_id]
 
-        self.__get_or_create_tour_request(delivery_man_id).deliveries[
-            delivery_request_id
-        ] = delivery_request
+        new_tour_request = self.__get_or_create_tour_request(delivery_man_id)
+        new_tour_request.deliveries[delivery_request_id] = delivery_request
 
         self.__tour_requests.on_next(self.__tour_requests.value)
 
-        self.compute_tours()
+        # Only the two tours are updated, the tours are computed again if one of them cannot be
+        removed_tours = self.__remove_delivery_request(tour_request, delivery_request)
+        inserted_tours = self.__insert_delivery_request(
+            new_tour_request, delivery_request
+        )
+
+        if not self.__publish_computed_tours(
+            removed_tours and inserted_tours and {**removed_tours, **inserted_tours}
+        ):
+            self.compute_tours()
 
         return previous_delivery_man_id
 
     def compute_tours(self) -> None:
         """Compute the tours and publish the update.
 
+        The computation starts after a short delay, so that a burst of edits triggers a single computation. A
+        computation that is still running is cancelled: only the result for the latest tour requests is published.
+
         This method will start another thread and will run without blocking the UI.
 
         Returns:
             None
         """
+        # Any running computation is now outdated
+        TourComputingPoolService.instance().cancel_computations()
+
         if len(self.__tour_requests.value) == 0:
+            if self.__timer:
+                self.__timer.stop()
             self.__computed_tours.on_next({})
+            self.__is_computing.on_next(False)
             return
 
-        if self.__worker:
-            raise Exception("A tour is already being computed.")
-
         self.__is_computing.on_next(True)
 
-        self.__thread = QThread()
-        self.__worker = TourComputingWorker(self.__tour_requests)
+        if not self.__timer:
+            self.__timer = QTimer()
+            self.__timer.setSingleShot(True)
+            self.__timer.timeout.connect(self.__start_computation)
+
+        self.__timer.start(self.COMPUTING_DELAY)
 
-        self.__worker.moveToThread(self.__thread)
+    def handle_tour_progress(
+        self, worker: TourComputingWorker, computed_tours: Dict[TourID, Tour]
+    ) -> None:
+        """Publish the tours found so far by a computation that is still running.
 
-        self.__thread.started.connect(self.__worker.run)
-        self.__worker.finished.connect(lambda _: self.__thread.quit())
-        self.__worker.finished.connect(lambda _: self.__worker.deleteLater())
-        self.__thread.finished.connect(self.__thread.deleteLater)
+        Args:
+            worker (TourComputingWorker): Worker of the computation
+            computed_tours (Dict[TourID, Tour]): Tours found so far, the others keep their previous value
 
-        self.__thread.start()
+        Returns:
+            None
+        """
+        if worker is not self.__worker or worker.is_cancelled:
+            return
 
-        self.__thread.finished.connect(self.handle_tour_complete)
+        self.__computed_tours.on_next(
+            {
+                id: computed_tours.get(id, self.__computed_tours.value.get(id))
+                for id in self.__tour_requests.value
+                if id in computed_tours or id in self.__computed_tours.value
+            }
+        )
 
     def handle_tour_complete(self) -> None:
-        self.__computed_tours.on_next(self.__worker.result)
+        """Publish the result of the computation that just finished, or start the computation of the latest tour
+        requests if it was cancelled.
+
+        Returns:
+            None
+        """
+        worker = self.__worker
         self.__worker = None
         self.__thread = None
-        self.__is_computing.on_next(False)
+
+        if not worker.is_cancelled:
+            self.__computed_tours.on_next(worker.result)
+            self.__is_computing.on_next(False)
+        elif self.__timer and self.__timer.isActive():
+            # The tour requests changed during the computation, they are computed once the delay is over
+            return
+        elif self.__tour_requests.value:
+            # The tour requests changed during the computation and the delay is over
+            self.__start_computation()
+        else:
+            # The tour requests were cleared during the computation
+            self.__is_computing.on_next(False)
 
     def clear_tour_requests(self) -> None:
         """Clear the tour requests and publish the update.
@@ -360,6 +428,185 @@ class TourService(Singleton):
         )
         self.__computed_tours.on_next(loaded_tours)
 
+    def __start_computation(self) -> None:
+        """Start computing the tours in another thread, unless a cancelled computation is still stopping, in which case
+        the computation starts when it is done.
+
+        Returns:
+            None
+        """
+        if self.__worker:
+            return
+
+        if len(self.__tour_requests.value) == 0:
+            self.__is_computing.on_next(False)
+            return
+
+        # The worker gets a copy of the requests, so that edits made during the computation do not affect it
+        tour_requests = {
+            id: replace(
+                tour_request,
+                deliveries={
+                    delivery_id: replace(delivery)
+                    for delivery_id, delivery in tour_request.deliveries.items()
+                },
+            )
+            for id, tour_request in self.__tour_requests.value.items()
+        }
+
+        thread = QThread()
+        worker = TourComputingWorker(
+            tour_requests, TourComputingPoolService.instance().start_computation()
+        )
+
+        worker.moveToThread(thread)
+
+        thread.started.connect(worker.run)
+        worker.finished.connect(lambda _: thread.quit())
+        worker.finished.connect(lambda _: worker.deleteLater())
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(self.handle_tour_complete)
+        worker.progress.connect(
+            lambda computed_tours: self.handle_tour_progress(worker, computed_tours),
+            Qt.ConnectionType.QueuedConnection,
+        )
+
+        self.__thread = thread
+        self.__worker = worker
+
+        thread.start()
+
+    def __insert_delivery_request(
+        self, tour_request: TourRequest, delivery_request: DeliveryRequest
+    ) -> Optional[Dict[TourID, Optional[ComputedTour]]]:
+        """Insert a new delivery request in the computed tour of its tour request, without computing the tour again.
+
+        Args:
+            tour_request (TourRequest): Tour request the delivery request was added to
+            delivery_request (DeliveryRequest): Added delivery request
+
+        Returns:
+            Optional[Dict[TourID, Optional[ComputedTour]]]: Updated computed tour, or None if the tour has to be
+            computed
+        """
+        if not self.__is_computed(
+            tour_request.id, set(tour_request.deliveries) - {delivery_request.id}
+        ):
+            return None
+
+        result = TourEditingService.instance().insert_delivery(
+            tour_request,
+            self.__computed_tours.value.get(tour_request.id),
+            delivery_request,
+            MapService.instance().get_map(),
+        )
+
+        if not result:
+            return None
+
+        try:
+            computed_tour = (
+                TourTimeComputingService.instance().get_computed_tour_from_route_ids(
+                    tour_request, result
+                )
+            )
+        except Exception:
+            return None
+
+        return {tour_request.id: computed_tour}
+
+    def __remove_delivery_request(
+        self, tour_request: TourRequest, delivery_request: DeliveryRequest
+    ) -> Optional[Dict[TourID, Optional[ComputedTour]]]:
+        """Remove a delivery request from the computed tour of its tour request, without computing the tour again.
+
+        Args:
+            tour_request (TourRequest): Tour request the delivery request was removed from
+            delivery_request (DeliveryRequest): Removed delivery request
+
+        Returns:
+            Optional[Dict[TourID, Optional[ComputedTour]]]: Updated computed tour, None as the tour when no delivery is
+            left, or None if the tour has to be computed
+        """
+        if not self.__is_computed(
+            tour_request.id, set(tour_request.deliveries) | {delivery_request.id}
+        ):
+            return None
+
+        if not tour_request.deliveries:
+            return {tour_request.id: None}
+
+        result = TourEditingService.instance().remove_delivery(
+            tour_request,
+            self.__computed_tours.value[tour_request.id],
+            delivery_request.id,
+            MapService.instance().get_map(),
+        )
+
+        if not result:
+            return None
+
+        try:
+            computed_tour = (
+                TourTimeComputingService.instance().get_computed_tour_from_route_ids(
+                    tour_request, result
+                )
+            )
+        except Exception:
+            return None
+
+        return {tour_request.id: computed_tour}
+
+    def __is_computed(self, tour_id: TourID, delivery_ids: Set[DeliveryID]) -> bool:
+        """Check that the published tour of a tour request is the computed tour of the given deliveries.
+
+        Args:
+            tour_id (TourID): ID of the tour
+            delivery_ids (Set[DeliveryID]): IDs of the deliveries the tour should have
+
+        Returns:
+            bool: True if the published tour can be edited instead of computed again
+        """
+        if self.__is_computing.value:
+            return False
+
+        computed_tour = self.__computed_tours.value.get(tour_id)
+
+        if not delivery_ids:
+            return computed_tour is None
+
+        return (
+            isinstance(computed_tour, ComputedTour)
+            and set(computed_tour.deliveries) == delivery_ids
+        )
+
+    def __publish_computed_tours(
+        self, computed_tours: Optional[Dict[TourID, Optional[ComputedTour]]]
+    ) -> bool:
+        """Publish updated computed tours, the other tours keep their previous value.
+
+        Args:
+            computed_tours (Optional[Dict[TourID, Optional[ComputedTour]]]): Updated computed tours, None for a tour
+            without deliveries
+
+        Returns:
+            bool: True if the tours were published, False if they have to be computed
+        """
+        if computed_tours is None:
+            return False
+
+        tours = {**self.__computed_tours.value, **computed_tours}
+
+        self.__computed_tours.on_next(
+            {
+                id: tours[id]
+                for id in self.__tour_requests.value
+                if tours.get(id) is not None
+            }
+        )
+
+        return True
+
     def __get_or_create_tour_request(self, tour_id: TourID) -> Tour:
         """Get or create a tour request with the given tour ID.
 
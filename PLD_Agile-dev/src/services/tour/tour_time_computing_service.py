@@ -47,6 +47,7 @@ class TourTimeComputingService(Singleton):
             tour_request=tour_request,
             deliveries=computed_deliveries,
             route=self.__convert_route_to_segments(computation_result.route),
+            is_optimal=computation_result.is_optimal,
         )
 
     def __convert_route_to_segments(self, route: List[int]):
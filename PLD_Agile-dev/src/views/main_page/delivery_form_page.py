@@ -14,7 +14,7 @@ from PyQt6.QtWidgets import (
 
 from src.controllers.navigator.page import Page
 from src.models.delivery_man.delivery_man import DeliveryMan
-from src.models.tour import NonComputedTour, Tour, TourID
+from src.models.tour import ComputedTour, NonComputedTour, Tour, TourID
 from src.services.delivery_man.delivery_man_service import DeliveryManService
 from src.services.tour.tour_service import TourService
 from src.views.main_page.form.tours_table import ToursTable
@@ -139,14 +139,14 @@ class DeliveryFormPage(Page):
         buttons_layout = QHBoxLayout()
         buttons_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        """ compute_tour_button = Button("Compute Tour")
-        compute_tour_button.clicked.connect(self.compute_tour) """
+        compute_tour_button = Button("Compute Tour")
+        compute_tour_button.clicked.connect(self.compute_tour)
 
         save_tour_button = Button("Save Tour")
         save_tour_button.clicked.connect(self.__save_tour)
 
         # Add components in the screen
-        # buttons_layout.addWidget(compute_tour_button)
+        buttons_layout.addWidget(compute_tour_button)
         buttons_layout.addWidget(save_tour_button)
 
         layout.addWidget(table)
@@ -214,10 +214,16 @@ class DeliveryFormPage(Page):
             self.__errors_container.itemAt(i).widget().setParent(None)
 
         for tour in tours.values():
-            if not isinstance(tour, NonComputedTour):
+            if isinstance(tour, NonComputedTour):
+                messages = tour.errors
+            elif isinstance(tour, ComputedTour) and not tour.is_optimal:
+                messages = [
+                    "Tournée provisoire : une tournée plus courte peut exister."
+                ]
+            else:
                 continue
 
-            for error in tour.errors:
+            for error in messages:
                 error_widget = QWidget()
                 error_widget.setStyleSheet(
                     "background-color: #211211; color: white; border-radius: 5px;"
@@ -10,7 +10,6 @@ from src.services.command.commands.update_delivery_request_delivery_man_command
     UpdateDeliveryRequestDeliveryMan,
 )
 from src.services.delivery_man.delivery_man_service import DeliveryManService
-from src.services.tour.tour_service import TourService
 
 
 class ToursTableColumnItemDeliveryMan(QWidget):
@@ -32,12 +31,7 @@ class ToursTableColumnItemDeliveryMan(QWidget):
             )
         )
 
-        is_computing_subscription = TourService.instance().is_computing.subscribe(
-            self.__handle_is_computing
-        )
-
         self.destroyed.connect(delivery_man_subscription.dispose)
-        self.destroyed.connect(is_computing_subscription.dispose)
 
     def __build(self):
         self.__build_delivery_men_control()
@@ -87,9 +81,3 @@ class ToursTableColumnItemDeliveryMan(QWidget):
                 delivery_man_id=delivery_man_id,
             )
         )
-
-    def __handle_is_computing(self, is_computing: bool):
-        try:
-            self.setEnabled(not is_computing)
-        except:
-            pass
@@ -221,8 +221,6 @@ class MapView(QGraphicsView):
         """
         if not self.__scene:
             return
-        if self.__is_computing:
-            return
 
         position = self.mapToScene(event.pos())
         position = Position(position.x(), position.y())
@@ -515,12 +513,12 @@ class MapView(QGraphicsView):
 
     def __update_cursor(self) -> None:
         self.setCursor(
-            Qt.CursorShape.WaitCursor
+            Qt.CursorShape.BusyCursor
             if self.__is_computing
             else Qt.CursorShape.CrossCursor
         )
         self.viewport().setCursor(
-            Qt.CursorShape.WaitCursor
+            Qt.CursorShape.BusyCursor
             if self.__is_computing
             else Qt.CursorShape.CrossCursor
         )
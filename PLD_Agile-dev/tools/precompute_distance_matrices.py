@@ -0,0 +1,42 @@
+"""Precompute the shortest paths between all the intersections of maps, so that the tours on these maps are computed
+without searching the road graph.
+
+The matrices are written to Config.DISTANCE_MATRIX_DIRECTORY and are found again when the same map is loaded.
+
+Run from the project root: python -m tools.precompute_distance_matrices src/assets/largeMap.xml
+"""
+import argparse
+import time
+
+from src.services.map.map_loader_service import MapLoaderService
+from src.services.routing.distance_matrix_service import DistanceMatrixService
+from src.services.tour.tour_computing_pool_service import TourComputingPoolService
+from src.services.tour.tour_computing_service import TourComputingService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="XML files of the maps")
+    parser.add_argument(
+        "--force", action="store_true", help="compute the matrices again if they exist"
+    )
+    arguments = parser.parse_args()
+
+    for path in arguments.paths:
+        map = MapLoaderService.instance().load_map_from_xml(path)
+
+        if DistanceMatrixService.instance().has_matrices(map) and not arguments.force:
+            print(f"{path}: already precomputed")
+            continue
+
+        start = time.perf_counter()
+        TourComputingService.instance().precompute_distance_matrices(map)
+        print(
+            f"{path}: {len(map.intersections)} intersections in {time.perf_counter() - start:.1f}s"
+        )
+
+    TourComputingPoolService.instance().shutdown()
+
+
+if __name__ == "__main__":
+    main()